@@ -10,6 +10,7 @@ from src.api.dependencies import get_case_repository, get_prediction_repository
 from src.core.logging_config import get_logger
 from src.db.repositories.case_repository import CaseRepository
 from src.db.repositories.prediction_repository import PredictionRepository
+from src.inference.service import InferenceService
 from src.monitoring.health_checks import run_all_health_checks
 
 logger = get_logger(__name__)
@@ -107,10 +108,12 @@ async def create_system_prompt(
                 },
                 {"$set": prompt}
             )
+            InferenceService.invalidate_prompts()
             return {"message": "Prompt updated successfully"}
         else:
             # Create new prompt
             prompts_collection.insert_one(prompt)
+            InferenceService.invalidate_prompts()
             return {"message": "Prompt created successfully"}
     except HTTPException as e:
         raise e
@@ -147,6 +150,7 @@ async def delete_system_prompt(
                 detail=f"Prompt not found for section '{section}'"
             )
         
+        InferenceService.invalidate_prompts()
         return {"message": "Prompt deleted successfully"}
     except HTTPException as e:
         raise e
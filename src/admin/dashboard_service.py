@@ -1,6 +1,8 @@
 """
 Dashboard service for the admin panel.
 """
+import heapq
+import itertools
 import os
 import time
 from datetime import datetime, timedelta
@@ -10,7 +12,7 @@ import psutil
 
 from src.core.logging_config import get_logger
 from src.db.repositories.case_repository import CaseRepository
-from src.db.repositories.prediction_repository import PredictionRepository
+from src.db.repositories.prediction_repository import PredictionRepository, PREDICTION_SUMMARY_PROJECTION
 
 logger = get_logger(__name__)
 
@@ -154,19 +156,19 @@ async def get_prediction_stats(prediction_repo: PredictionRepository) -> Dict[st
         A dictionary with prediction statistics.
     """
     try:
-        # Get all predictions
-        successful_predictions = prediction_repo.get_successful_predictions()
-        failed_predictions = prediction_repo.get_failed_predictions()
-        
-        # Count predictions
-        total_predictions = len(successful_predictions) + len(failed_predictions)
-        success_rate = 0
-        if total_predictions > 0:
-            success_rate = (len(successful_predictions) / total_predictions) * 100
-        
-        # Count predictions by section
+        # Stream the predictions once, tallying as they arrive
+        successful_count = 0
+        failed_count = 0
+        total_processing_time = 0
         predictions_by_section = {}
-        for prediction in successful_predictions + failed_predictions:
+        recent_predictions = []
+
+        streams = (
+            prediction_repo.iter_successful_predictions(projection=PREDICTION_SUMMARY_PROJECTION),
+            prediction_repo.iter_failed_predictions(projection=PREDICTION_SUMMARY_PROJECTION)
+        )
+        for order, prediction in enumerate(itertools.chain.from_iterable(streams)):
+            # Count predictions by section
             section = prediction.get("section", "Unknown")
             if section not in predictions_by_section:
                 predictions_by_section[section] = {
@@ -174,34 +176,39 @@ async def get_prediction_stats(prediction_repo: PredictionRepository) -> Dict[st
                     "success": 0,
                     "failure": 0
                 }
-            
+
             predictions_by_section[section]["total"] += 1
-            
+
             if prediction.get("status", "") == "success":
                 predictions_by_section[section]["success"] += 1
+                successful_count += 1
+                total_processing_time += prediction.get("processing_time", 0)
             else:
                 predictions_by_section[section]["failure"] += 1
-        
+                failed_count += 1
+
+            # Keep only the five most recent predictions in a bounded min-heap;
+            # -order keeps the earlier prediction on ties, as nlargest would
+            entry = (prediction.get("created_at", ""), -order, prediction)
+            if len(recent_predictions) < 5:
+                heapq.heappush(recent_predictions, entry)
+            else:
+                heapq.heappushpop(recent_predictions, entry)
+
+        # Count predictions
+        total_predictions = successful_count + failed_count
+        success_rate = 0
+        if total_predictions > 0:
+            success_rate = (successful_count / total_predictions) * 100
+
         # Calculate average processing time
-        total_processing_time = 0
-        for prediction in successful_predictions:
-            total_processing_time += prediction.get("processing_time", 0)
-        
         average_processing_time = 0
-        if successful_predictions:
-            average_processing_time = total_processing_time / len(successful_predictions)
-        
-        # Get recent predictions
-        all_predictions = successful_predictions + failed_predictions
-        recent_predictions = sorted(
-            all_predictions,
-            key=lambda x: x.get("created_at", ""),
-            reverse=True
-        )[:5]
-        
+        if successful_count:
+            average_processing_time = total_processing_time / successful_count
+
         # Format recent predictions
         recent_predictions_formatted = []
-        for prediction in recent_predictions:
+        for _, _, prediction in sorted(recent_predictions, reverse=True):
             recent_predictions_formatted.append({
                 "case_id": prediction.get("case_id", ""),
                 "section": prediction.get("section", ""),
@@ -212,8 +219,8 @@ async def get_prediction_stats(prediction_repo: PredictionRepository) -> Dict[st
         
         return {
             "total_predictions": total_predictions,
-            "successful_predictions": len(successful_predictions),
-            "failed_predictions": len(failed_predictions),
+            "successful_predictions": successful_count,
+            "failed_predictions": failed_count,
             "success_rate": success_rate,
             "predictions_by_section": predictions_by_section,
             "average_processing_time": average_processing_time,
@@ -9,6 +9,7 @@ from pymongo.database import Database
 from src.core.config import MONGO_URI, DATABASE_NAME
 from src.core.logging_config import get_logger
 from src.core.security import validate_api_key
+from src.db.repositories import case_repository
 from src.db.repositories.case_repository import CaseRepository
 from src.db.repositories.prediction_repository import PredictionRepository
 from src.db.repositories.user_repository import UserRepository
@@ -21,9 +22,9 @@ def get_case_repository() -> CaseRepository:
     Get the case repository.
     
     Returns:
-        The case repository.
+        The shared case repository instance.
     """
-    return CaseRepository()
+    return case_repository.get_case_repository()
 
 def get_prediction_repository() -> PredictionRepository:
     """
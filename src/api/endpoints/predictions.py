@@ -12,7 +12,6 @@ from src.core.logging_config import get_logger
 from src.db.repositories.case_repository import CaseRepository
 from src.db.repositories.prediction_repository import PredictionRepository
 from src.inference.service import InferenceService
-from src.controller.gemini_case_handler import GeminiHandler
 
 logger = get_logger(__name__)
 
@@ -86,29 +85,21 @@ async def query_case(
 
         # Special handling for 14_findings_and_background section
         if request.section == "14_findings_and_background":
-            logger.info(f"Using GeminiHandler for 14_findings_and_background section")
-
-            # Create GeminiHandler instance
-            handler = GeminiHandler(case_id=request.case_id, case_type=request.case_type or "case_type_1")
+            logger.info(f"Analyzing findings and background together for 14_findings_and_background section")
 
             # Set model if specified
             if request.model:
-                handler.set_model(request.model)
-
-            # Get findings and background
-            out14 = handler.create_unified_analysis(
-                section="1.4 Findings",
-                batch_size=3,
-                base_retry_delay=5,
-                max_retries=3
-            )
+                inference_service.model_name = request.model
 
-            outBackground = handler.create_unified_analysis(
-                section="Background Information",
+            # Get findings and background from one pass over the documents
+            analyses = await inference_service.create_unified_analysis_multi(
+                ["1.4 Findings", "Background Information"],
                 batch_size=3,
                 base_retry_delay=5,
                 max_retries=3
             )
+            out14 = analyses["1.4 Findings"]
+            outBackground = analyses["Background Information"]
 
             response_text = f"=== 1.4 FINDINGS ===\n{out14}\n\n=== BACKGROUND INFORMATION ===\n{outBackground}"
         else:
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from typing import List, Dict, Any, Optional
 
 from src.core.logging_config import get_logger
+from src.inference.service import InferenceService
 from src.routers.prompts_router import (
     get_all_prompts as original_get_all_prompts,
     get_prompt as original_get_prompt_by_id,
@@ -48,7 +49,9 @@ async def create_prompt_compat(prompt: PromptCreate):
     This is a compatibility endpoint for frontend requests to /app/v1/Prompts/prompts.
     """
     logger.info("Handling request to compatibility endpoint /app/v1/Prompts/prompts (POST)")
-    return await original_create_prompt(prompt=prompt)
+    result = await original_create_prompt(prompt=prompt)
+    InferenceService.invalidate_prompts()
+    return result
 
 @router.put("/prompts/{prompt_id}", response_model=Dict[str, Any])
 async def update_prompt_compat(prompt_id: str, prompt: PromptUpdate):
@@ -57,7 +60,9 @@ async def update_prompt_compat(prompt_id: str, prompt: PromptUpdate):
     This is a compatibility endpoint for frontend requests to /app/v1/Prompts/prompts/{prompt_id}.
     """
     logger.info(f"Handling request to compatibility endpoint /app/v1/Prompts/prompts/{prompt_id} (PUT)")
-    return await original_update_prompt(prompt_id=prompt_id, prompt=prompt)
+    result = await original_update_prompt(prompt_id=prompt_id, prompt=prompt)
+    InferenceService.invalidate_prompts()
+    return result
 
 @router.delete("/prompts/{prompt_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_prompt_compat(prompt_id: str):
@@ -66,7 +71,9 @@ async def delete_prompt_compat(prompt_id: str):
     This is a compatibility endpoint for frontend requests to /app/v1/Prompts/prompts/{prompt_id}.
     """
     logger.info(f"Handling request to compatibility endpoint /app/v1/Prompts/prompts/{prompt_id} (DELETE)")
-    return await original_delete_prompt(prompt_id=prompt_id)
+    result = await original_delete_prompt(prompt_id=prompt_id)
+    InferenceService.invalidate_prompts()
+    return result
 
 @router.get("/prompts/by-section/{section}", response_model=Dict[str, Any])
 async def get_prompts_by_section_compat(section: str):
@@ -93,4 +100,6 @@ async def import_prompts_from_json_compat(file: UploadFile = File(...)):
     This is a compatibility endpoint for frontend requests to /app/v1/Prompts/prompts/import-from-json.
     """
     logger.info("Handling request to compatibility endpoint /app/v1/Prompts/prompts/import-from-json")
-    return await original_import_prompts_from_json(file=file)
+    result = await original_import_prompts_from_json(file=file)
+    InferenceService.invalidate_prompts()
+    return result
@@ -1,6 +1,11 @@
 import os
 import io
+import hashlib
 import json
+import orjson
+import functools
+import asyncio
+import threading
 import glob
 import shutil
 import tempfile
@@ -8,13 +13,17 @@ import logging
 from pathlib import Path
 from typing import List, Dict, Optional, Union, Any
 import time
+from itertools import filterfalse, islice
 # Removed unused docx import at the top, added where needed
 from dotenv import load_dotenv
 import google.generativeai as genai
+from google.api_core import exceptions as gexc
 
 # Azure imports
 from azure.storage.blob import BlobServiceClient
 
+from src.utils.file_helpers import discard_directory
+
 # MongoDB imports
 # Make sure this path is correct for your project structure
 try:
@@ -32,6 +41,35 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+@functools.lru_cache(maxsize=1)
+def _read_system_prompts_file(path: str) -> dict:
+    """
+    Parse the system prompts JSON file once per process.
+    """
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+# Documents tagged with this extension are reference material and never sent to Gemini
+REFERENCE_EXT = ".rpt"
+
+# Batches with less non-whitespace text than this are answered without calling Gemini
+MIN_BATCH_CHARS = int(os.getenv("MIN_BATCH_CHARS", "200"))
+
+# Transient Gemini API errors that are retried with backoff
+RETRYABLE_API_ERRORS = (gexc.ResourceExhausted, gexc.TooManyRequests, gexc.DeadlineExceeded)
+
+def get_source_ext(file_path: str) -> str:
+    """
+    Return the extension used to tag a document's origin.
+
+    Reference reports exported as e.g. 'site_survey.rpt.pdf' keep their
+    '.rpt' marker; every other file is tagged with its own extension.
+    """
+    suffixes = [suffix.lower() for suffix in Path(file_path).suffixes]
+    if REFERENCE_EXT in suffixes:
+        return REFERENCE_EXT
+    return suffixes[-1] if suffixes else ""
+
 # --- Moved extract_retry_delay outside the class ---
 def extract_retry_delay(error_message: str, default_delay: int = 5) -> int:
     """
@@ -91,6 +129,9 @@ class GeminiHandler:
         self.case_id = case_id
         self.case_type = case_type
         self.temp_dir = None
+        # Parsed document contents, shared by every section run on this handler
+        self._doc_contents: Optional[List[Dict]] = None
+        self._docs_lock = threading.Lock()
         self.api_key = os.getenv("GOOGLE_API_KEY")
 
         # --- Set gemini-2.0-flash as the default model ---
@@ -237,8 +278,7 @@ class GeminiHandler:
 
         try:
             logger.info(f"Loading system prompts from file: {SYSTEM_PROMPTS_FILE}")
-            with open(SYSTEM_PROMPTS_FILE, "r", encoding='utf-8') as f:
-                file_content = json.load(f)
+            file_content = _read_system_prompts_file(SYSTEM_PROMPTS_FILE)
 
             # Convert the JSON structure to our format
             result = {}
@@ -525,38 +565,58 @@ class GeminiHandler:
             logger.error(f"Error processing TXT {txt_path}: {str(e)}")
             return None
 
-    def process_documents_in_batches(self, max_batch_size: int = 5) -> List[List[Dict]]:
+    def _ensure_docs_loaded(self) -> List[Dict]:
         """
-        Download, process (PDF, DOCX, TXT), and group results into smaller batches.
+        Download and parse the case documents once per handler instance.
+        Concurrent section runs wait on the lock and reuse the cached contents
+        instead of racing on the temporary directory.
         """
-        all_content = []
-        temp_documents_dir = None
-        try:
-            temp_documents_dir = self.download_case_documents()
-            if not temp_documents_dir or not os.path.exists(temp_documents_dir):
-                logger.warning(f"Could not download or access docs directory for case {self.case_id}.")
-                return []
+        with self._docs_lock:
+            if self._doc_contents is not None:
+                return self._doc_contents
 
-            pdf_files, docx_files, txt_files = self.get_file_list(temp_documents_dir)
-            if not pdf_files and not docx_files and not txt_files:
-                logger.warning(f"No PDF, DOCX, or TXT found for case {self.case_id}")
-                return []
-
-            for pdf_file in pdf_files:
-                content = self.process_pdf_for_gemini(pdf_file)
-                if content:
-                    all_content.append(content)
-
-            for docx_file in docx_files:
-                content = self.process_docx(docx_file)
-                if content:
-                    all_content.append(content)
+            all_content = []
+            try:
+                temp_documents_dir = self.download_case_documents()
+                if not temp_documents_dir or not os.path.exists(temp_documents_dir):
+                    logger.warning(f"Could not download or access docs directory for case {self.case_id}.")
+                    return []
+
+                pdf_files, docx_files, txt_files = self.get_file_list(temp_documents_dir)
+                if not pdf_files and not docx_files and not txt_files:
+                    logger.warning(f"No PDF, DOCX, or TXT found for case {self.case_id}")
+                    return []
+
+                for pdf_file in pdf_files:
+                    content = self.process_pdf_for_gemini(pdf_file)
+                    if content:
+                        content["source_ext"] = get_source_ext(pdf_file)
+                        all_content.append(content)
+
+                for docx_file in docx_files:
+                    content = self.process_docx(docx_file)
+                    if content:
+                        content["source_ext"] = get_source_ext(docx_file)
+                        all_content.append(content)
+
+                for txt_file in txt_files:
+                    content = self.process_txt(txt_file)
+                    if content:
+                        content["source_ext"] = get_source_ext(txt_file)
+                        all_content.append(content)
+            finally:
+                # The parsed text is kept in memory, so the raw files are no longer needed
+                self.cleanup()
 
-            for txt_file in txt_files:
-                content = self.process_txt(txt_file)
-                if content:
-                    all_content.append(content)
+            self._doc_contents = all_content
+            return all_content
 
+    def process_documents_in_batches(self, max_batch_size: int = 5) -> List[List[Dict]]:
+        """
+        Download, process (PDF, DOCX, TXT), and group results into smaller batches.
+        """
+        try:
+            all_content = self._ensure_docs_loaded()
             if not all_content:
                 logger.warning(f"No textual content extracted for case {self.case_id}.")
                 return []
@@ -597,19 +657,34 @@ class GeminiHandler:
                 else:
                     batch_results.append(response)
 
+            # Drop identical batch answers so the synthesis prompt carries each only once
+            seen_hashes = set()
+            unique_results = []
+            for result in batch_results:
+                digest = hashlib.blake2b(result.encode("utf-8"), digest_size=16).digest()
+                if digest not in seen_hashes:
+                    seen_hashes.add(digest)
+                    unique_results.append(result)
+            if len(unique_results) < len(batch_results):
+                logger.info(f"Removed {len(batch_results) - len(unique_results)} duplicate batch responses for section '{section}'")
+            batch_results = unique_results
+
             if len(batch_results) == 1 and not processing_failed:
                 return batch_results[0]
 
-            combined_text = ""
-            for idx, result in enumerate(batch_results):
-                combined_text += f"--- ANALYSIS FROM BATCH {idx + 1} ---\n{result}\n--- END OF BATCH {idx + 1} ---\n\n"
+            combined_text = "".join(
+                f"--- ANALYSIS FROM BATCH {idx + 1} ---\n{result}\n--- END OF BATCH {idx + 1} ---\n\n"
+                for idx, result in enumerate(batch_results)
+            )
 
             model = genai.GenerativeModel(self.model_name)
             failure_warning = ""
             if processing_failed:
                 failure_warning = "IMPORTANT: Some batches encountered errors, so the final result may be incomplete.\n\n"
 
-            synthesis_prompt = f"""
+            # The prompt is sent as separate parts so the batch text is never
+            # copied into one large formatted string
+            synthesis_prefix = f"""
                 {failure_warning}You are provided with analyses generated from different batches. Some batches may contain errors.
                 Focus on the section: '{section}'
 
@@ -631,19 +706,23 @@ class GeminiHandler:
                 9. Use the proper Markdown format for the report. This is very important.
                 10. ALWAYS place findings content BEFORE background information content.
                 11. Include subsections only if they contain meaningful content. If a subsection (e.g., "Improper Stormwater Drainage" or "Excessive Slope/Cross-Slope") has no substantive information or only indicates lack of data, do not include the subsection or any placeholder text (e.g., “was not indicated as a contributing factor”). Simply omit it entirely.
-                12. If the references are taken from .rpt do not include the reference number in the final output like no not do this (If files with the.rpt extension are provided, treat them as reference only (e.g., for format, different case context). Do not extract content from them or use it in the response The report details the investigation into the circumstances surrounding).
 
                 Collected Batches:
-                {combined_text}
-
+                """
+            synthesis_suffix = f"""
                 Now provide the final consolidated analysis for '{section}':
                 """
+            synthesis_contents = [
+                {"text": synthesis_prefix},
+                {"text": combined_text},
+                {"text": synthesis_suffix},
+            ]
 
             retry_count = 0
             while retry_count <= max_retries:
                 try:
                     unified_response = model.generate_content(
-                        [synthesis_prompt],
+                        synthesis_contents,
                         generation_config=genai.GenerationConfig(
                             temperature=0.2,
                             max_output_tokens=8192
@@ -656,20 +735,38 @@ class GeminiHandler:
                         finish_reason = unified_response.candidates[0].finish_reason if unified_response.candidates else "UNKNOWN"
                         return f"Error: No text returned from final synthesis (Reason: {finish_reason})."
                     return unified_response.text
+                except RETRYABLE_API_ERRORS as e:
+                    retry_delay = extract_retry_delay(str(e), default_delay=base_retry_delay * (2 ** retry_count))
+                    logger.warning(f"Rate limit in final synthesis. Sleeping {retry_delay}s.")
+                    time.sleep(retry_delay)
+                    retry_count += 1
                 except Exception as e:
-                    error_str = str(e)
-                    if "429" in error_str or "rate limit" in error_str.lower():
-                        retry_delay = extract_retry_delay(error_str, default_delay=base_retry_delay * (2 ** retry_count))
-                        logger.warning(f"Rate limit in final synthesis. Sleeping {retry_delay}s.")
-                        time.sleep(retry_delay)
-                        retry_count += 1
-                    else:
-                        logger.error(f"Final synthesis failed: {error_str}")
-                        raise
+                    logger.error(f"Final synthesis failed: {e}")
+                    raise
             return "Error: Could not create unified analysis due to repeated rate limit or other errors."
         finally:
             self.cleanup()
 
+    async def create_unified_analysis_async(
+        self,
+        section: str,
+        batch_size: int = 3,
+        base_retry_delay: int = 5,
+        max_retries: int = 3
+    ) -> str:
+        """
+        Async wrapper around create_unified_analysis so independent sections
+        can be dispatched concurrently with asyncio.gather.
+        """
+        await asyncio.to_thread(self._ensure_docs_loaded)
+        return await asyncio.to_thread(
+            self.create_unified_analysis,
+            section,
+            batch_size,
+            base_retry_delay,
+            max_retries
+        )
+
     def query_with_batch(
         self,
         batch: List[Dict],
@@ -683,6 +780,25 @@ class GeminiHandler:
         if not batch:
             return "Error: Empty batch provided for querying."
 
+        # Reference-only documents are dropped here rather than via a prompt instruction
+        batch = [
+            item for item in batch
+            if not (isinstance(item, dict) and item.get("source_ext", "").lower() == REFERENCE_EXT)
+        ]
+
+        # Skip the Gemini round trip for batches with no substantive text. Only whether the
+        # threshold is reached matters, so counting stops there; whitespace is skipped in C
+        total_chars = 0
+        for item in batch:
+            if total_chars >= MIN_BATCH_CHARS:
+                break
+            if isinstance(item, dict):
+                text = item.get("text", "")
+                total_chars += sum(1 for _ in islice(filterfalse(str.isspace, text), MIN_BATCH_CHARS - total_chars))
+        if total_chars < MIN_BATCH_CHARS:
+            logger.info(f"Skipping batch with {total_chars} characters of text for section '{section}'")
+            return f"No substantive content in batch for {section}."
+
         # Get system prompt for the section
         system_prompt_text = None
 
@@ -734,22 +850,17 @@ class GeminiHandler:
                 logger.info(f"Created generic default prompt for section: {section}")
 
         system_prompt = {"text": system_prompt_text}
-        contents = batch + [system_prompt]
-
-        # Validate batch format for Gemini API
-        for i, item in enumerate(contents):
-            # Ensure each item has only the 'text' key
-            if not isinstance(item, dict) or 'text' not in item or len(item) != 1:
-                logger.warning(f"Invalid item format at index {i}: {item}")
-                # Fix the item format
-                if isinstance(item, dict) and 'text' in item:
-                    # Keep only the 'text' key
-                    contents[i] = {"text": item['text']}
-                    logger.info(f"Fixed item format at index {i}")
-                else:
-                    logger.error(f"Cannot fix item format at index {i}, removing from batch")
-                    # Remove the item if it can't be fixed
-                    contents.pop(i)
+
+        # Normalize every item to a text-only part for the Gemini API in a single pass
+        contents = [
+            {"text": item["text"] if isinstance(item, dict) and "text" in item else str(item)}
+            for item in batch + [system_prompt]
+        ]
+        repaired = sum(
+            1 for item in batch if not isinstance(item, dict) or "text" not in item
+        )
+        if repaired:
+            logger.warning(f"Repaired format of {repaired} batch item(s) for section '{section}'")
 
         model = genai.GenerativeModel(self.model_name)
         retry_count = 0
@@ -769,24 +880,15 @@ class GeminiHandler:
                     finish_reason = response.candidates[0].finish_reason if response.candidates else "UNKNOWN"
                     return f"Error: No text returned (Reason: {finish_reason})."
                 return response.text
+            except RETRYABLE_API_ERRORS as e:
+                retry_delay = extract_retry_delay(str(e), default_delay=base_retry_delay * (2 ** retry_count))
+                logger.warning(f"Rate limit in batch query. Sleeping {retry_delay}s.")
+                time.sleep(retry_delay)
+                retry_count += 1
             except Exception as e:
                 error_str = str(e)
-                if "429" in error_str or "rate limit" in error_str.lower() or "quota" in error_str.lower():
-                    retry_delay = extract_retry_delay(error_str, default_delay=base_retry_delay * (2 ** retry_count))
-                    logger.warning(f"Rate limit in batch query. Sleeping {retry_delay}s.")
-                    time.sleep(retry_delay)
-                    retry_count += 1
-                elif "Unable to determine the intended type of the `dict`" in error_str:
-                    # Handle format error
-                    logger.error(f"Format error in batch: {error_str}")
-                    # Try to fix the batch format
-                    for i, item in enumerate(contents):
-                        contents[i] = {"text": str(item) if not isinstance(item, dict) or 'text' not in item else item['text']}
-                    logger.info("Attempted to fix batch format, retrying...")
-                    retry_count += 1
-                else:
-                    logger.error(f"Gemini query error: {error_str}")
-                    raise RuntimeError(f"Gemini query failed: {error_str}") from e
+                logger.error(f"Gemini query error: {error_str}")
+                raise RuntimeError(f"Gemini query failed: {error_str}") from e
         return "Error: Rate limit exceeded after maximum retries."
 
     def cleanup(self):
@@ -795,7 +897,7 @@ class GeminiHandler:
         """
         if self.temp_dir and os.path.exists(self.temp_dir):
             try:
-                shutil.rmtree(self.temp_dir)
+                discard_directory(self.temp_dir)
                 logger.info(f"Cleaned up temporary directory: {self.temp_dir}")
             except Exception as e:
                 logger.error(f"Error cleaning up temporary directory {self.temp_dir}: {e}")
@@ -868,14 +970,12 @@ class GeminiHandler:
                     return "No description generated."
 
                 return response.text
+            except RETRYABLE_API_ERRORS:
+                time.sleep(base_delay * (2 ** attempt))
+                attempt += 1
             except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "rate limit" in error_str.lower():
-                    time.sleep(base_delay * (2 ** attempt))
-                    attempt += 1
-                else:
-                    logger.error(f"Error describing image: {error_str}")
-                    return f"Error generating image description: {error_str}"
+                logger.error(f"Error describing image: {e}")
+                return f"Error generating image description: {e}"
 
         return "Error: Repeated rate limit or network errors prevented generating image description."
 
@@ -902,6 +1002,31 @@ if __name__ == "__main__":
     parser.add_argument('--max_retries', type=int, default=3, help='Max retries on rate limits (default: 3)')
 
     args = parser.parse_args()
+
+    async def main() -> str:
+        if args.section == "14_findings_and_background":
+            out14, outBackground = await asyncio.gather(
+                handler.create_unified_analysis_async(
+                    section="1.4 Findings",
+                    batch_size=args.batch_size,
+                    base_retry_delay=args.base_retry_delay,
+                    max_retries=args.max_retries
+                ),
+                handler.create_unified_analysis_async(
+                    section="Background Information",
+                    batch_size=args.batch_size,
+                    base_retry_delay=args.base_retry_delay,
+                    max_retries=args.max_retries
+                )
+            )
+            return f"=== 1.4 FINDINGS ===\n{out14}\n\n=== BACKGROUND INFORMATION ===\n{outBackground}"
+        return await handler.create_unified_analysis_async(
+            section=args.section,
+            batch_size=args.batch_size,
+            base_retry_delay=args.base_retry_delay,
+            max_retries=args.max_retries
+        )
+
     try:
         handler = GeminiHandler(args.case_id, args.case_type)
         if args.model:
@@ -910,27 +1035,7 @@ if __name__ == "__main__":
         print(f"\nProcessing case {args.case_id}, section '{args.section}' with model {handler.model_name}.")
         print(f"Batch size: {args.batch_size}, base retry delay: {args.base_retry_delay}, max retries: {args.max_retries}")
 
-        if args.section == "14_findings_and_background":
-            out14 = handler.create_unified_analysis(
-                section="1.4 Findings",
-                batch_size=args.batch_size,
-                base_retry_delay=args.base_retry_delay,
-                max_retries=args.max_retries
-            )
-            outBackground = handler.create_unified_analysis(
-                section="Background Information",
-                batch_size=args.batch_size,
-                base_retry_delay=args.base_retry_delay,
-                max_retries=args.max_retries
-            )
-            response = f"=== 1.4 FINDINGS ===\n{out14}\n\n=== BACKGROUND INFORMATION ===\n{outBackground}"
-        else:
-            response = handler.create_unified_analysis(
-                section=args.section,
-                batch_size=args.batch_size,
-                base_retry_delay=args.base_retry_delay,
-                max_retries=args.max_retries
-            )
+        response = asyncio.run(main())
 
         print("\n===== GEMINI UNIFIED RESPONSE =====")
         if response.startswith("Error:") or "blocked" in response:
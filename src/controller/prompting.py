@@ -1,13 +1,17 @@
 import os
 import json
-import shutil
+import time
+import orjson
+import functools
 from dotenv import load_dotenv
 from utils.Mongodbcnnection import MongoDBConnection  # Import your MongoDB connection class
 from azure.storage.blob import BlobServiceClient
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
 from src.core.config import GOOGLE_API_KEY, GEMINI_MODEL
 from src.core.logging_config import get_logger
+from src.utils.file_helpers import discard_directory
 
 # Load environment variables
 load_dotenv()
@@ -18,14 +22,56 @@ logger = get_logger(__name__)
 # Load system prompts from JSON file
 SYSTEM_PROMPTS_FILE = "src/controller/system_prompts.json"  # Assumes file is in the same directory
 
+# Upper bound on concurrent blob downloads per case
+MAX_DOWNLOAD_WORKERS = 8
+
+# Token budget for case documents included in a single prompt
+DOCUMENT_TOKEN_BUDGET = 28000
+
+# Parsed document text is cached on disk under the project's cache directory, keyed by blob ETag and size
+PARSED_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "cache", "parsed"
+)
+
+# Cached entries unused for this many seconds are removed
+PARSED_CACHE_MAX_AGE = 30 * 24 * 3600
+
+# Once the cache exceeds this many bytes, the least recently used entries are removed
+PARSED_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+def _prune_parsed_cache() -> None:
+    """
+    Remove parsed cache entries that are too old, then the least recently
+    used ones until the cache fits PARSED_CACHE_MAX_BYTES.
+    """
+    now = time.time()
+    entries = []
+    with os.scandir(PARSED_CACHE_DIR) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = 0
+    for mtime, size, path in sorted(entries, reverse=True):
+        if now - mtime > PARSED_CACHE_MAX_AGE or total + size > PARSED_CACHE_MAX_BYTES:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        else:
+            total += size
+
+@functools.lru_cache(maxsize=1)
 def load_system_prompts() -> dict:
     """
     Load system prompts from a JSON file.
     Returns a dictionary mapping sections to their prompts.
+    The file is parsed once per process; callers must not mutate the result.
     """
     try:
-        with open(SYSTEM_PROMPTS_FILE, "r") as f:
-            return json.load(f)
+        with open(SYSTEM_PROMPTS_FILE, "rb") as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         raise FileNotFoundError(f"System prompts file '{SYSTEM_PROMPTS_FILE}' not found.")
     except json.JSONDecodeError:
@@ -46,6 +92,9 @@ class CaseQueryProcessor:
         self.collection = self.db["case_add"]  # Hardcoded to match COLLECTION_NAME from case_router.py
         self.system_prompts = load_system_prompts()
         self.temp_dir = None  # Temporary directory for downloaded documents
+        self._all_content = None  # Parsed document texts, reused across query() calls
+        self._content_cache_paths = []  # On-disk cache path of each parsed text, if any
+        self._token_counts = None  # Token count of each parsed text
 
         # Configure Gemini API
         self.api_key = GOOGLE_API_KEY
@@ -63,9 +112,9 @@ class CaseQueryProcessor:
         self.blob_service_client = BlobServiceClient.from_connection_string(self.connection_string)
         self.container_name = "original-data"  # Matches case_router.py and CRUD_utils.py
 
-    def download_case_documents(self) -> str:
+    def _prepare_temp_dir(self) -> str:
         """
-        Download all document files related to the case from Azure Blob Storage.
+        Create the case-specific temporary directory for downloaded documents.
         """
         # Get the absolute path of the project root
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -75,73 +124,188 @@ class CaseQueryProcessor:
 
         # Ensure the directory exists
         os.makedirs(self.temp_dir, exist_ok=True)
+        return self.temp_dir
 
+    def _list_case_blobs(self) -> list:
+        """
+        List the document blobs stored for the case in Azure Storage.
+        """
         # Case-specific document folder in Azure Storage
         case_id_folder = f"{self.case_id}/reports/"
 
-        # List blobs in the case-specific documents folder
         container_client = self.blob_service_client.get_container_client(self.container_name)
         blobs = list(container_client.list_blobs(name_starts_with=case_id_folder))
 
         if not blobs:
             logger.warning(f"No documents found for case ID: {self.case_id} in {case_id_folder}")
-            return self.temp_dir
+        return blobs
+
+    def _download_blob(self, blob) -> str:
+        """
+        Download a single blob into the temporary directory and return its local path.
+        """
+        blob_client = self.blob_service_client.get_blob_client(container=self.container_name, blob=blob.name)
+        file_path = os.path.join(self.temp_dir, os.path.basename(blob.name))
 
-        logger.info(f"Downloading {len(blobs)} files for case {self.case_id} from {case_id_folder}")
+        with open(file_path, "wb") as f:
+            blob_data = blob_client.download_blob()
+            f.write(blob_data.readall())
 
-        # Download each document file
-        for blob in blobs:
-            blob_client = self.blob_service_client.get_blob_client(container=self.container_name, blob=blob.name)
-            file_path = os.path.join(self.temp_dir, os.path.basename(blob.name))
+        logger.info(f"Downloaded: {blob.name} -> {file_path}")
+        return file_path
 
-            with open(file_path, "wb") as f:
-                blob_data = blob_client.download_blob()
-                f.write(blob_data.readall())
+    def download_case_documents(self) -> str:
+        """
+        Download all document files related to the case from Azure Blob Storage.
+        """
+        self._prepare_temp_dir()
+
+        blobs = self._list_case_blobs()
+        if not blobs:
+            return self.temp_dir
 
-            logger.info(f"Downloaded: {blob.name} -> {file_path}")
+        logger.info(f"Downloading {len(blobs)} files for case {self.case_id}")
 
+        self._download_blobs(blobs)
         return self.temp_dir
 
-    def query(self, user_query: str = "Provide me whatever information you can provide me in the format for which I have provided") -> str:
+    def _download_blobs(self, blobs: list) -> list:
         """
-        Process the user's query using Gemini model.
+        Download blobs concurrently, overlapping network latency across files.
+        Returns the local file paths in the same order as the blobs.
         """
-        try:
-            # Download case documents
-            docs_dir = self.download_case_documents()
+        if not blobs:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(MAX_DOWNLOAD_WORKERS, len(blobs))) as executor:
+            return list(executor.map(self._download_blob, blobs))
+
+    def _load_document_contents(self) -> list:
+        """
+        Return the parsed text of every case document.
+
+        Parsed text is memoized on the instance and cached on disk under
+        PARSED_CACHE_DIR, keyed by the blob ETag and size, so unchanged
+        documents are neither downloaded nor re-parsed.
+        """
+        if self._all_content is not None:
+            return self._all_content
+
+        from src.inference.preprocessing import process_pdf_for_gemini, process_docx, process_txt
+
+        parsers = {
+            ".pdf": process_pdf_for_gemini,
+            ".docx": process_docx,
+            ".txt": process_txt,
+        }
+
+        self._prepare_temp_dir()
+        os.makedirs(PARSED_CACHE_DIR, exist_ok=True)
+
+        texts = {}
+        cache_paths = {}
+        pending = []
+        for blob in self._list_case_blobs():
+            parser = parsers.get(os.path.splitext(blob.name)[1].lower())
+            if parser is None:
+                continue
+
+            etag = (blob.etag or "").strip('"')
+            cache_path = os.path.join(PARSED_CACHE_DIR, f"{etag}-{blob.size}.txt") if etag else None
+            cache_paths[blob.name] = cache_path
+
+            if cache_path and os.path.exists(cache_path):
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    texts[blob.name] = f.read()
+                os.utime(cache_path)  # Mark the entry as recently used for pruning
+                logger.info(f"Using cached parsed text for: {blob.name}")
+            else:
+                texts[blob.name] = None
+                pending.append((blob, parser, cache_path))
+
+        # Fetch every uncached document in parallel before parsing
+        file_paths = self._download_blobs([blob for blob, _, _ in pending])
+        for (blob, parser, cache_path), file_path in zip(pending, file_paths):
+            content = parser(file_path)
+            text = content["text"] if content else ""
+            # Empty results are not cached, so a failed parse is retried on the next query
+            if cache_path and text:
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            texts[blob.name] = text
+
+        if pending:
+            _prune_parsed_cache()
+
+        names = [name for name, text in texts.items() if text]
+        all_content = [texts[name] for name in names]
+
+        self._all_content = all_content
+        self._content_cache_paths = [cache_paths[name] for name in names]
+        return all_content
+
+    def _document_token_counts(self) -> list:
+        """
+        Return the token count of each parsed document.
+
+        count_tokens is a remote call, so counts are memoized on the instance
+        and stored beside the parsed text cache as a .tokens file.
+        """
+        if self._token_counts is not None:
+            return self._token_counts
 
-            # Process documents to extract text
-            from src.inference.preprocessing import process_pdf_for_gemini, process_docx, process_txt
+        counts = []
+        for text, cache_path in zip(self._all_content, self._content_cache_paths):
+            count_path = os.path.splitext(cache_path)[0] + ".tokens" if cache_path else None
 
-            # Get list of files
-            import glob
-            pdf_files = glob.glob(os.path.join(docs_dir, "*.pdf"))
-            docx_files = glob.glob(os.path.join(docs_dir, "*.docx"))
-            txt_files = glob.glob(os.path.join(docs_dir, "*.txt"))
+            if count_path and os.path.exists(count_path):
+                with open(count_path, "r", encoding="utf-8") as f:
+                    counts.append(int(f.read()))
+                continue
 
-            all_content = []
+            tokens = self.model.count_tokens(text).total_tokens
+            if count_path:
+                with open(count_path, "w", encoding="utf-8") as f:
+                    f.write(str(tokens))
+            counts.append(tokens)
 
-            # Process each file type
-            for pdf_file in pdf_files:
-                content = process_pdf_for_gemini(pdf_file)
-                if content:
-                    all_content.append(content)
+        self._token_counts = counts
+        return counts
 
-            for docx_file in docx_files:
-                content = process_docx(docx_file)
-                if content:
-                    all_content.append(content)
+    def _build_document_text(self, all_content: list, budget: int = DOCUMENT_TOKEN_BUDGET) -> str:
+        """
+        Concatenate document texts up to the token budget.
+
+        The document that would exceed the budget is truncated to the
+        remaining tokens, so at least part of the first document is always sent.
+        """
+        parts = []
+        used = 0
+        for text, tokens in zip(all_content, self._document_token_counts()):
+            if used + tokens > budget:
+                remaining = budget - used
+                if remaining > 0:
+                    # Approximate the cut point from the document's chars-per-token ratio
+                    parts.append(text[:len(text) * remaining // tokens])
+                logger.info(f"Token budget of {budget} reached; truncated at document {len(parts)} of {len(all_content)}")
+                break
+            parts.append(text)
+            used += tokens
+
+        return "\n\n".join(parts)
 
-            for txt_file in txt_files:
-                content = process_txt(txt_file)
-                if content:
-                    all_content.append(content)
+    def query(self, user_query: str = "Provide me whatever information you can provide me in the format for which I have provided") -> str:
+        """
+        Process the user's query using Gemini model.
+        """
+        try:
+            all_content = self._load_document_contents()
 
             if not all_content:
                 return "No document content found for analysis."
 
-            # Combine all content
-            document_text = "\n\n".join(all_content)
+            # Combine whole documents until the token budget is reached
+            document_text = self._build_document_text(all_content)
 
             # Retrieve the appropriate system prompt for the section
             system_prompt = self.system_prompts.get(self.section, "Default system prompt: Answer based on the provided documents.")
@@ -151,7 +315,7 @@ class CaseQueryProcessor:
             {system_prompt}
 
             The following are the case documents:
-            {document_text[:30000]}  # Limit text to avoid token limits
+            {document_text}
 
             User query: {user_query}
             """
@@ -175,4 +339,4 @@ class CaseQueryProcessor:
         Clean up temporary directory.
         """
         if self.temp_dir and os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)  # Remove temporary directory
\ No newline at end of file
+            discard_directory(self.temp_dir)  # Remove temporary directory in the background
\ No newline at end of file
@@ -19,6 +19,18 @@ DATABASE_NAME: str = os.getenv("DATABASE_NAME")
 CASE_COLLECTION: str = os.getenv("CASE_COLLECTION")
 PROMPTS_COLLECTION: str = os.getenv("PROMPTS_COLLECTION")
 
+# MongoDB connection pool settings
+MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "60000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+MONGO_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+# Connections opened in parallel when the pool grows; pymongo's default of 2 queues bursts
+MONGO_MAX_CONNECTING: int = int(os.getenv("MONGO_MAX_CONNECTING", "4"))
+MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+# zlib needs no extra packages; "zstd" and "snappy" require zstandard / python-snappy
+MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "zlib")
+
 # Azure Blob Storage settings
 AZURE_CONNECTION_STRING: str = os.getenv("AZURE_CONNECTION_STRING")
 AZURE_CONTAINER_NAME: str = os.getenv("AZURE_CONTAINER_NAME")
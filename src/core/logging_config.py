@@ -9,15 +9,16 @@ from typing import Dict, Any
 LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_DATE_FORMAT: str = "%Y-%m-%d %H:%M:%S"
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format=LOG_FORMAT,
-    datefmt=LOG_DATE_FORMAT,
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Configure logging once; module loggers inherit the root level
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        datefmt=LOG_DATE_FORMAT,
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
 
 def get_logger(name: str) -> logging.Logger:
     """
@@ -27,11 +28,9 @@ def get_logger(name: str) -> logging.Logger:
         name: The name of the logger.
         
     Returns:
-        A configured logger instance.
+        A logger instance that inherits the root configuration.
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    return logger
+    return logging.getLogger(name)
 
 def configure_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
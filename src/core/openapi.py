@@ -1,7 +1,11 @@
 """
 Custom OpenAPI schema generator for the application.
 """
-from typing import Any, Dict
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, Optional
 
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
@@ -11,6 +15,78 @@ from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Generated schemas are cached on disk so other workers and reloads can reuse them
+OPENAPI_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "cache", "openapi"
+)
+
+def _route_signature(app: FastAPI) -> str:
+    """
+    Compute a hash of the app metadata, its route paths and methods, and the
+    source of the application modules.
+
+    The routes, their parameters and docstrings, and the request and response
+    models are all defined in loaded src modules, so any change to them gives
+    a new signature and the cached schema is not reused.
+
+    Args:
+        app: The FastAPI application.
+
+    Returns:
+        A hex digest identifying the current routes and their definitions.
+    """
+    routes = sorted(
+        (route.path, tuple(sorted(getattr(route, "methods", None) or ())))
+        for route in app.routes
+        if hasattr(route, "path")
+    )
+    digest = hashlib.md5(repr((app.title, app.version, app.description, routes)).encode("utf-8"))
+
+    for name in sorted(name for name in sys.modules if name == "src" or name.startswith("src.")):
+        source_path = getattr(sys.modules[name], "__file__", None)
+        if not source_path:
+            continue
+        try:
+            with open(source_path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            continue
+
+    return digest.hexdigest()
+
+def _load_cached_schema(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a previously generated schema from disk, if present.
+
+    Args:
+        path: The cache file path.
+
+    Returns:
+        The cached schema, or None if it is missing or unreadable.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _store_cached_schema(path: str, schema: Dict[str, Any]) -> None:
+    """
+    Persist a generated schema to disk, ignoring write failures.
+
+    Args:
+        path: The cache file path.
+        schema: The OpenAPI schema.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(schema, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not cache OpenAPI schema: {str(e)}")
+
 def custom_openapi(app: FastAPI) -> Dict[str, Any]:
     """
     Custom OpenAPI schema generator that handles serialization of class types
@@ -25,6 +101,12 @@ def custom_openapi(app: FastAPI) -> Dict[str, Any]:
     if app.openapi_schema:
         return app.openapi_schema
 
+    cache_path = os.path.join(OPENAPI_CACHE_DIR, f"openapi-{_route_signature(app)}.json")
+    cached_schema = _load_cached_schema(cache_path)
+    if cached_schema is not None:
+        app.openapi_schema = cached_schema
+        return app.openapi_schema
+
     # Define endpoints to hide from documentation
     hidden_paths = [
         "/openapi.json",
@@ -49,6 +131,7 @@ def custom_openapi(app: FastAPI) -> Dict[str, Any]:
             servers=app.servers,
         )
 
+        _store_cached_schema(cache_path, openapi_schema)
         app.openapi_schema = openapi_schema
         return app.openapi_schema
     except PydanticSerializationError as e:
@@ -1,14 +1,18 @@
 """
 Security utilities for the application.
 """
+import binascii
+import hmac
 import os
-import secrets
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Mapping
 
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Encoded form of each configured key, so requests only encode the presented key
+_EXPECTED_KEY_BYTES_CACHE: Dict[str, bytes] = {}
+
 def generate_secure_token(length: int = 32) -> str:
     """
     Generate a secure random token.
@@ -19,7 +23,7 @@ def generate_secure_token(length: int = 32) -> str:
     Returns:
         A secure random token.
     """
-    return secrets.token_hex(length)
+    return binascii.hexlify(os.urandom(length)).decode("ascii")
 
 def validate_api_key(api_key: str, expected_key: str) -> bool:
     """
@@ -34,12 +38,25 @@ def validate_api_key(api_key: str, expected_key: str) -> bool:
     """
     if not api_key or not expected_key:
         return False
-    return secrets.compare_digest(api_key, expected_key)
 
-def get_api_key_from_header(headers: Dict[str, Any], header_name: str = "X-API-Key") -> Optional[str]:
+    expected_bytes = _EXPECTED_KEY_BYTES_CACHE.get(expected_key)
+    if expected_bytes is None:
+        expected_bytes = _EXPECTED_KEY_BYTES_CACHE.setdefault(expected_key, expected_key.encode("utf-8"))
+
+    try:
+        api_key_bytes = api_key.encode("utf-8")
+    except AttributeError:
+        return False
+
+    return hmac.compare_digest(api_key_bytes, expected_bytes)
+
+def get_api_key_from_header(headers: Mapping[str, Any], header_name: str = "X-API-Key") -> Optional[str]:
     """
     Get the API key from the request headers.
     
+    Case-insensitive header mappings such as starlette's Headers resolve the
+    name in one lookup; plain dicts are also tried with the lowercased name.
+    
     Args:
         headers: The request headers.
         header_name: The name of the header containing the API key.
@@ -47,4 +64,11 @@ def get_api_key_from_header(headers: Dict[str, Any], header_name: str = "X-API-K
     Returns:
         The API key if found, None otherwise.
     """
-    return headers.get(header_name)
+    get = getattr(headers, "get", None)
+    if get is None:
+        return None
+
+    value = get(header_name)
+    if value is not None:
+        return value
+    return get(header_name.lower())
@@ -1,14 +1,20 @@
 """
 Base model for database models.
 """
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional
 from bson import ObjectId
 
+# Timestamp source for new documents; only called when a value is missing
+_now = datetime.now
+
 class BaseModel:
     """
     Base model for database models.
     """
+
+    __slots__ = ("_id", "created_at", "updated_at")
     
     def __init__(self, **kwargs):
         """
@@ -18,8 +24,8 @@ class BaseModel:
             **kwargs: The model attributes.
         """
         self._id: Optional[ObjectId] = kwargs.get("_id")
-        self.created_at: datetime = kwargs.get("created_at", datetime.now())
-        self.updated_at: datetime = kwargs.get("updated_at", datetime.now())
+        self.created_at: datetime = kwargs.get("created_at") or _now()
+        self.updated_at: datetime = kwargs.get("updated_at") or _now()
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -53,24 +59,29 @@ class BaseModel:
 
 def format_object_id(obj: Any) -> Any:
     """
-    Recursively formats MongoDB ObjectId to string in dictionaries and lists.
-    
+    Formats MongoDB ObjectId to string in nested dictionaries and lists, in place.
+
+    Walks the structure with an explicit stack instead of recursing.
+
     Args:
         obj: The object to format (dict, list, or other)
-        
+
     Returns:
         The formatted object with ObjectId converted to strings
     """
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            if isinstance(v, ObjectId):
-                obj[k] = str(v)
-            elif isinstance(v, (dict, list)):
-                obj[k] = format_object_id(v)
-    elif isinstance(obj, list):
-        for i, v in enumerate(obj):
-            if isinstance(v, ObjectId):
-                obj[i] = str(v)
-            elif isinstance(v, (dict, list)):
-                obj[i] = format_object_id(v)
+    stack = deque([obj])
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            items = current.items()
+        elif isinstance(current, list):
+            items = enumerate(current)
+        else:
+            continue
+
+        for key, value in items:
+            if type(value) is ObjectId:
+                current[key] = str(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
     return obj
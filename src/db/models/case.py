@@ -6,11 +6,28 @@ from typing import Dict, Any, List, Optional
 
 from src.db.models.base import BaseModel
 
+# Case fields included in to_dict only when they are set
+_OPTIONAL_FIELDS = (
+    "inspection_date", "inspector_name", "hub_file_number", "injured_party_name",
+    "property_name", "property_address", "incident_date", "incident_time",
+    "injured_party_present", "voice_record_allowed", "voice_record_link",
+    "dcof_test", "dcof_explanation", "handwritten_note", "note_text",
+    "client_location"
+)
+
+# Required case fields and their defaults, set in order by Case.__init__
+_CASE_FIELDS = (
+    ("case_id", ""), ("case_name", ""), ("location", ""), ("date", ""),
+    ("time", ""), ("description", ""), ("embedding", ""), ("case_type", "")
+)
+
 class MetaData:
     """
     Metadata for files in a case.
     """
 
+    __slots__ = ("description", "file_path", "azure_url", "section")
+
     def __init__(self, **kwargs):
         """
         Initialize the metadata with the given attributes.
@@ -56,11 +73,40 @@ class MetaData:
         """
         return cls(**data)
 
+def _coerce_metadata(items: List[Any]) -> List[MetaData]:
+    """
+    Convert a list of file metadata to MetaData objects.
+
+    Each element is converted on its own, so lists mixing dicts and MetaData
+    objects are handled.
+
+    Args:
+        items: The file metadata as dicts or MetaData objects.
+
+    Returns:
+        A list of MetaData objects.
+    """
+    return [item if isinstance(item, MetaData) else MetaData.from_dict(item) for item in items]
+
 class Case(BaseModel):
     """
     Case model for the application.
     """
 
+    __slots__ = (
+        "case_id", "case_name", "location", "date", "time", "description",
+        "images", "pdf", "embedding", "case_type", "exhibits"
+    ) + _OPTIONAL_FIELDS
+
+    case_id: str
+    case_name: str
+    location: str
+    date: str
+    time: str
+    description: str
+    embedding: str
+    case_type: str
+
     def __init__(self, **kwargs):
         """
         Initialize the case model with the given attributes.
@@ -69,59 +115,23 @@ class Case(BaseModel):
             **kwargs: The case attributes.
         """
         super().__init__(**kwargs)
-        self.case_id: str = kwargs.get("case_id", "")
-        self.case_name: str = kwargs.get("case_name", "")
-        self.location: str = kwargs.get("location", "")
-        self.date: str = kwargs.get("date", "")
-        self.time: str = kwargs.get("time", "")
-        self.description: str = kwargs.get("description", "")
+        for name, default in _CASE_FIELDS:
+            setattr(self, name, kwargs.get(name, default))
 
         # Convert images and pdf lists to MetaData objects if they are dictionaries
-        images_data = kwargs.get("images", [])
-        self.images: List[MetaData] = [
-            MetaData.from_dict(img) if isinstance(img, dict) else img
-            for img in images_data
-        ]
-
-        pdf_data = kwargs.get("pdf", [])
-        self.pdf: List[MetaData] = [
-            MetaData.from_dict(pdf) if isinstance(pdf, dict) else pdf
-            for pdf in pdf_data
-        ]
-
-        self.embedding: str = kwargs.get("embedding", "")
+        self.images: List[MetaData] = _coerce_metadata(kwargs.get("images", []))
+        self.pdf: List[MetaData] = _coerce_metadata(kwargs.get("pdf", []))
 
         # Additional case details
-        self.case_type: str = kwargs.get("case_type", "")
-        self.inspection_date: Optional[str] = kwargs.get("inspection_date")
-        self.inspector_name: Optional[str] = kwargs.get("inspector_name")
-        self.hub_file_number: Optional[str] = kwargs.get("hub_file_number")
-        self.injured_party_name: Optional[str] = kwargs.get("injured_party_name")
-        self.property_name: Optional[str] = kwargs.get("property_name")
-        self.property_address: Optional[str] = kwargs.get("property_address")
-        self.incident_date: Optional[str] = kwargs.get("incident_date")
-        self.incident_time: Optional[str] = kwargs.get("incident_time")
-        self.injured_party_present: Optional[str] = kwargs.get("injured_party_present")
-        self.voice_record_allowed: Optional[str] = kwargs.get("voice_record_allowed")
-        self.voice_record_link: Optional[str] = kwargs.get("voice_record_link")
-        self.dcof_test: Optional[str] = kwargs.get("dcof_test")
-        self.dcof_explanation: Optional[str] = kwargs.get("dcof_explanation")
-        self.handwritten_note: Optional[str] = kwargs.get("handwritten_note")
-        self.note_text: Optional[str] = kwargs.get("note_text")
-        self.client_location: Optional[str] = kwargs.get("client_location")
+        for name in _OPTIONAL_FIELDS:
+            setattr(self, name, kwargs.get(name))
 
         # Exhibits
         exhibits_data = kwargs.get("exhibits", {})
         if exhibits_data:
             self.exhibits = {
-                "images": [
-                    MetaData.from_dict(img) if isinstance(img, dict) else img
-                    for img in exhibits_data.get("images", [])
-                ],
-                "pdfs": [
-                    MetaData.from_dict(pdf) if isinstance(pdf, dict) else pdf
-                    for pdf in exhibits_data.get("pdfs", [])
-                ]
+                "images": _coerce_metadata(exhibits_data.get("images", [])),
+                "pdfs": _coerce_metadata(exhibits_data.get("pdfs", []))
             }
         else:
             self.exhibits = {"images": [], "pdfs": []}
@@ -130,38 +140,31 @@ class Case(BaseModel):
         """
         Convert the case model to a dictionary.
 
+        Optional fields are included when they are not None.
+
         Returns:
             A dictionary representation of the case model.
         """
-        result = super().to_dict()
-        result.update({
+        result = {
+            **super().to_dict(),
             "case_id": self.case_id,
             "case_name": self.case_name,
             "location": self.location,
             "date": self.date,
             "time": self.time,
             "description": self.description,
-            "images": [img.to_dict() if hasattr(img, 'to_dict') else img for img in self.images],
-            "pdf": [pdf.to_dict() if hasattr(pdf, 'to_dict') else pdf for pdf in self.pdf],
+            "images": [img.to_dict() for img in self.images],
+            "pdf": [pdf.to_dict() for pdf in self.pdf],
             "embedding": self.embedding,
             "case_type": self.case_type,
             "exhibits": {
-                "images": [img.to_dict() if hasattr(img, 'to_dict') else img for img in self.exhibits["images"]],
-                "pdfs": [pdf.to_dict() if hasattr(pdf, 'to_dict') else pdf for pdf in self.exhibits["pdfs"]]
+                "images": [img.to_dict() for img in self.exhibits["images"]],
+                "pdfs": [pdf.to_dict() for pdf in self.exhibits["pdfs"]]
             }
-        })
-
-        # Add optional fields if they exist
-        optional_fields = [
-            "inspection_date", "inspector_name", "hub_file_number", "injured_party_name",
-            "property_name", "property_address", "incident_date", "incident_time",
-            "injured_party_present", "voice_record_allowed", "voice_record_link",
-            "dcof_test", "dcof_explanation", "handwritten_note", "note_text",
-            "client_location"
-        ]
-
-        for field in optional_fields:
-            value = getattr(self, field, None)
+        }
+
+        for field in _OPTIONAL_FIELDS:
+            value = getattr(self, field)
             if value is not None:
                 result[field] = value
 
@@ -0,0 +1,58 @@
+"""
+Prediction image model for the application.
+"""
+from typing import Dict, Any, Optional
+
+from src.db.models.base import BaseModel
+
+class PredictionImage(BaseModel):
+    """
+    Metadata for one image attached to a prediction.
+    """
+
+    __slots__ = (
+        "prediction_id", "case_id", "section", "image_index", "description",
+        "file_path", "azure_url", "error"
+    )
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the prediction image model with the given attributes.
+
+        Args:
+            **kwargs: The prediction image attributes.
+        """
+        super().__init__(**kwargs)
+        self.prediction_id: str = kwargs.get("prediction_id", "")
+        self.case_id: str = kwargs.get("case_id", "")
+        self.section: str = kwargs.get("section", "")
+        self.image_index: int = kwargs.get("image_index", 0)
+        self.description: str = kwargs.get("description", "")
+        self.file_path: str = kwargs.get("file_path", "")
+        self.azure_url: Optional[str] = kwargs.get("azure_url")
+        self.error: Optional[str] = kwargs.get("error")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the prediction image model to a dictionary.
+
+        Returns:
+            A dictionary representation of the prediction image model.
+        """
+        result = super().to_dict()
+        result.update({
+            "prediction_id": self.prediction_id,
+            "case_id": self.case_id,
+            "section": self.section,
+            "image_index": self.image_index,
+            "description": self.description,
+            "file_path": self.file_path
+        })
+
+        if self.azure_url:
+            result["azure_url"] = self.azure_url
+
+        if self.error:
+            result["error"] = self.error
+
+        return result
@@ -10,6 +10,11 @@ class PredictionLog(BaseModel):
     """
     Prediction log model for the application.
     """
+
+    __slots__ = (
+        "case_id", "section", "response", "response_of_findings", "images",
+        "processing_time", "status", "error_message"
+    )
     
     def __init__(self, **kwargs):
         """
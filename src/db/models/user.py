@@ -10,6 +10,8 @@ class User(BaseModel):
     """
     User model for the application.
     """
+
+    __slots__ = ("username", "email", "hashed_password", "is_active", "is_superuser", "last_login")
     
     def __init__(self, **kwargs):
         """
@@ -1,22 +1,40 @@
 """
 Base repository for database operations.
 """
-from typing import Dict, Any, List, Optional, TypeVar, Generic, Type
+from typing import Dict, Any, Iterator, List, Optional, Tuple, TypeVar, Generic, Type
+from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
+from pymongo import InsertOne
 from pymongo.collection import Collection
-from pymongo.errors import PyMongoError
+from pymongo.errors import BulkWriteError, PyMongoError
 
 from src.core.logging_config import get_logger
 from src.db.session import get_db
-from src.db.models.base import BaseModel, format_object_id
+from src.db.models.base import BaseModel
 
 logger = get_logger(__name__)
 
 T = TypeVar('T', bound=BaseModel)
 
+class ObjectIdToStrCodec(TypeDecoder):
+    """
+    Decode BSON ObjectId values straight to their hex string.
+    """
+    bson_type = ObjectId
+
+    def transform_bson(self, value: ObjectId) -> str:
+        return str(value)
+
+# Documents read through repositories carry string ids, decoded while parsing BSON
+CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([ObjectIdToStrCodec()]))
+
 class BaseRepository(Generic[T]):
     """
     Base repository for database operations.
     """
+
+    # Collection handles shared by every repository instance, keyed by database and collection name
+    _collection_cache: Dict[Tuple[str, str], Collection] = {}
     
     def __init__(self, collection_name: str, model_class: Type[T]):
         """
@@ -27,7 +45,12 @@ class BaseRepository(Generic[T]):
             model_class: The model class.
         """
         self.db = get_db()
-        self.collection: Collection = self.db[collection_name]
+        cache_key = (self.db.name, collection_name)
+        collection = BaseRepository._collection_cache.get(cache_key)
+        if collection is None:
+            collection = self.db.get_collection(collection_name, codec_options=CODEC_OPTIONS)
+            BaseRepository._collection_cache[cache_key] = collection
+        self.collection: Collection = collection
         self.model_class = model_class
     
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -48,39 +71,124 @@ class BaseRepository(Generic[T]):
             logger.error(f"Error inserting document: {e}")
             return {"error": str(e)}
     
-    def read(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def create_many(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create several documents in a single unordered bulk write.
+
+        The server applies unordered inserts independently, so one failing
+        document does not stop the others from being written.
+        
+        Args:
+            documents: The documents to insert.
+            
+        Returns:
+            A dictionary with the inserted IDs, plus an error message if any insert failed.
+        """
+        # InsertOne assigns each document's _id client-side, before the write
+        operations = [InsertOne(document) for document in documents]
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            logger.info(f"Inserted {result.inserted_count} document(s).")
+            return {"inserted_ids": [document["_id"] for document in documents]}
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            failed = {error["index"] for error in write_errors}
+            for error in write_errors:
+                logger.error(f"Error inserting document {error['index']}: {error.get('errmsg')}")
+            logger.error(f"Inserted {e.details.get('nInserted', 0)} of {len(documents)} document(s).")
+            return {
+                "inserted_ids": [document["_id"] for i, document in enumerate(documents) if i not in failed],
+                "error": f"{len(failed)} of {len(documents)} document(s) failed to insert"
+            }
+        except PyMongoError as e:
+            logger.error(f"Error inserting documents: {e}")
+            return {"error": str(e)}
+    
+    def iter(self, query: Dict[str, Any], sort: Optional[List[Tuple[str, int]]] = None,
+             projection: Optional[Dict[str, Any]] = None,
+             batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over documents in the collection.
+
+        Documents are yielded as the cursor fetches them, so callers that do not
+        need a list never hold the whole result in memory.
+        
+        Args:
+            query: The query to filter documents.
+            sort: Optional list of (field, direction) pairs applied by the server.
+            projection: Optional projection limiting the fields returned.
+            batch_size: Optional number of documents fetched per round trip.
+            
+        Yields:
+            The matching documents.
+        """
+        cursor = self.collection.find(query, projection=projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        try:
+            yield from cursor
+        except PyMongoError as e:
+            logger.error(f"Error iterating documents: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    def read(self, query: Dict[str, Any], sort: Optional[List[Tuple[str, int]]] = None,
+             projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Read documents from the collection.
+
+        Kept for existing callers; equivalent to read_list.
+        
+        Args:
+            query: The query to filter documents.
+            sort: Optional list of (field, direction) pairs applied by the server.
+            projection: Optional projection limiting the fields returned.
+            
+        Returns:
+            A list of documents or an error message.
+        """
+        return self.read_list(query, sort=sort, projection=projection)
+
+    def read_list(self, query: Dict[str, Any], sort: Optional[List[Tuple[str, int]]] = None,
+                  projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Read documents from the collection into a list.
         
         Args:
             query: The query to filter documents.
+            sort: Optional list of (field, direction) pairs applied by the server.
+            projection: Optional projection limiting the fields returned.
             
         Returns:
             A list of documents or an error message.
         """
         try:
-            documents = list(self.collection.find(query))
+            documents = list(self.iter(query, sort=sort, projection=projection))
             logger.info(f"Found {len(documents)} documents matching query.")
-            return format_object_id(documents)
+            return documents
         except PyMongoError as e:
             logger.error(f"Error reading documents: {e}")
             return [{"error": str(e)}]
     
-    def read_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def read_one(self, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Read a single document from the collection.
         
         Args:
             query: The query to filter documents.
+            projection: Optional projection limiting the fields returned.
             
         Returns:
             The document or None if not found.
         """
         try:
-            document = self.collection.find_one(query)
+            document = self.collection.find_one(query, projection=projection)
             if document:
                 logger.info(f"Found document matching query.")
-                return format_object_id(document)
+                return document
             else:
                 logger.info(f"No document found matching query.")
                 return None
@@ -94,19 +202,54 @@ class BaseRepository(Generic[T]):
         
         Args:
             query: The query to filter documents.
-            update_data: The data to update.
+            update_data: The fields to set, or an update document whose keys are
+                operators such as "$push".
             
         Returns:
             A dictionary with the number of modified documents or an error message.
         """
         try:
-            result = self.collection.update_many(query, {"$set": update_data})
+            result = self.collection.update_many(query, self._build_update(update_data))
             logger.info(f"Updated {result.modified_count} document(s).")
             return {"modified_count": result.modified_count}
         except PyMongoError as e:
             logger.error(f"Error updating documents: {e}")
             return {"error": str(e)}
     
+    def update_one_doc(self, query: Dict[str, Any], update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update the first document matching a query on a unique key.
+        
+        Args:
+            query: The query to filter documents.
+            update_data: The fields to set, or an update operator document.
+            
+        Returns:
+            A dictionary with the number of modified documents or an error message.
+        """
+        try:
+            result = self.collection.update_one(query, self._build_update(update_data))
+            logger.info(f"Updated {result.modified_count} document(s).")
+            return {"modified_count": result.modified_count}
+        except PyMongoError as e:
+            logger.error(f"Error updating document: {e}")
+            return {"error": str(e)}
+    
+    @staticmethod
+    def _build_update(update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wrap plain field values in $set and pass operator documents through.
+        
+        Args:
+            update_data: The fields to set or an update operator document.
+            
+        Returns:
+            The update document to send to MongoDB.
+        """
+        if any(key.startswith("$") for key in update_data):
+            return update_data
+        return {"$set": update_data}
+    
     def delete(self, query: Dict[str, Any]) -> Dict[str, Any]:
         """
         Delete documents from the collection.
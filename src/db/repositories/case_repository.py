@@ -1,7 +1,11 @@
 """
 Case repository for database operations.
 """
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional
+
+from pymongo import DESCENDING
+from pymongo.errors import PyMongoError
 
 from src.core.config import CASE_COLLECTION
 from src.core.logging_config import get_logger
@@ -10,9 +14,16 @@ from src.db.repositories.base_repository import BaseRepository
 
 logger = get_logger(__name__)
 
-def get_case_repository():
+# Excludes the large embedding and file metadata fields from case reads
+CASE_LIGHT_PROJECTION = {"embedding": 0, "exhibits": 0, "images": 0, "pdf": 0}
+
+# Newest cases first; backed by a compound index on the collection
+CASE_SORT = [("created_at", DESCENDING), ("date", DESCENDING)]
+
+@lru_cache(maxsize=1)
+def get_case_repository() -> "CaseRepository":
     """
-    Get the case repository.
+    Get the process-wide case repository.
 
     Returns:
         The case repository.
@@ -24,11 +35,32 @@ class CaseRepository(BaseRepository[Case]):
     Case repository for database operations.
     """
 
+    _indexes_ensured = False
+
     def __init__(self):
         """
         Initialize the case repository.
         """
         super().__init__(CASE_COLLECTION, Case)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """
+        Create the indexes used by case queries, once per process.
+
+        Creation is attempted only once whatever the outcome: the unique case_id
+        index fails on a collection that already holds duplicate case IDs, and
+        retrying on every construction would only repeat the error.
+        """
+        if CaseRepository._indexes_ensured:
+            return
+        CaseRepository._indexes_ensured = True
+
+        for keys, options in ((CASE_SORT, {}), ("case_id", {"unique": True})):
+            try:
+                self.collection.create_index(keys, **options)
+            except PyMongoError as e:
+                logger.error(f"Error creating case index {keys}: {e}")
 
     def get_by_case_id(self, case_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -42,6 +74,18 @@ class CaseRepository(BaseRepository[Case]):
         """
         return self.read_one({"case_id": case_id})
 
+    def get_by_case_id_light(self, case_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a case by case ID without its embedding, images, PDFs or exhibits.
+
+        Args:
+            case_id: The case ID to search for.
+
+        Returns:
+            The case document or None if not found.
+        """
+        return self.read_one({"case_id": case_id}, projection=CASE_LIGHT_PROJECTION)
+
     def get_all_cases(self) -> List[Dict[str, Any]]:
         """
         Get all cases.
@@ -49,15 +93,8 @@ class CaseRepository(BaseRepository[Case]):
         Returns:
             A list of all case documents.
         """
-        cases = self.read({})
-
-        # Sort cases by created_at or date
-        cases.sort(key=lambda x: (
-            x.get("created_at", ""),
-            x.get("date", "")
-        ), reverse=True)
-
-        return cases
+        # Sorted by created_at, then date, on the server
+        return self.read({}, sort=CASE_SORT)
 
     def add_image_to_case(self, case_id: str, image_metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -70,7 +107,7 @@ class CaseRepository(BaseRepository[Case]):
         Returns:
             A dictionary with the number of modified documents or an error message.
         """
-        return self.update(
+        return self.update_one_doc(
             {"case_id": case_id},
             {"$push": {"images": image_metadata}}
         )
@@ -86,7 +123,7 @@ class CaseRepository(BaseRepository[Case]):
         Returns:
             A dictionary with the number of modified documents or an error message.
         """
-        return self.update(
+        return self.update_one_doc(
             {"case_id": case_id},
             {"$push": {"pdf": pdf_metadata}}
         )
@@ -103,11 +140,90 @@ class CaseRepository(BaseRepository[Case]):
         Returns:
             A dictionary with the number of modified documents or an error message.
         """
-        return self.update(
+        return self.update_one_doc(
             {"case_id": case_id},
             {"$push": {f"exhibits.{exhibit_type}": exhibit_metadata}}
         )
 
+    def add_image_and_exhibit(self, case_id: str, image_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add an image to both the case images and the exhibit images.
+
+        Uses a pipeline update (MongoDB 4.2+) so both arrays change atomically
+        in a single round trip.
+
+        Args:
+            case_id: The case ID.
+            image_metadata: The image metadata.
+
+        Returns:
+            A dictionary with the number of modified documents or an error message.
+        """
+        # $literal keeps metadata values starting with "$" from being read as field paths
+        new_image = {"$literal": [image_metadata]}
+        pipeline = [{
+            "$set": {
+                "images": {"$concatArrays": [{"$ifNull": ["$images", []]}, new_image]},
+                "exhibits.images": {"$concatArrays": [{"$ifNull": ["$exhibits.images", []]}, new_image]}
+            }
+        }]
+        try:
+            result = self.collection.update_one({"case_id": case_id}, pipeline)
+            logger.info(f"Updated {result.modified_count} document(s).")
+            return {"modified_count": result.modified_count}
+        except PyMongoError as e:
+            logger.error(f"Error adding image and exhibit to case {case_id}: {e}")
+            return {"error": str(e)}
+
+    def add_images_to_case(self, case_id: str, image_metadata_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Add several images to a case in a single update.
+
+        Args:
+            case_id: The case ID.
+            image_metadata_list: The metadata of each image; any iterable, including a generator.
+
+        Returns:
+            A dictionary with the number of modified documents or an error message.
+        """
+        return self.update_one_doc(
+            {"case_id": case_id},
+            {"$push": {"images": {"$each": list(image_metadata_list)}}}
+        )
+
+    def add_pdfs_to_case(self, case_id: str, pdf_metadata_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Add several PDFs to a case in a single update.
+
+        Args:
+            case_id: The case ID.
+            pdf_metadata_list: The metadata of each PDF; any iterable, including a generator.
+
+        Returns:
+            A dictionary with the number of modified documents or an error message.
+        """
+        return self.update_one_doc(
+            {"case_id": case_id},
+            {"$push": {"pdf": {"$each": list(pdf_metadata_list)}}}
+        )
+
+    def add_exhibits_to_case(self, case_id: str, exhibit_type: str, exhibit_metadata_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Add several exhibits to a case in a single update.
+
+        Args:
+            case_id: The case ID.
+            exhibit_type: The exhibit type (images or pdfs).
+            exhibit_metadata_list: The metadata of each exhibit; any iterable, including a generator.
+
+        Returns:
+            A dictionary with the number of modified documents or an error message.
+        """
+        return self.update_one_doc(
+            {"case_id": case_id},
+            {"$push": {f"exhibits.{exhibit_type}": {"$each": list(exhibit_metadata_list)}}}
+        )
+
     def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Find a single document in the collection.
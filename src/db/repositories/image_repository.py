@@ -0,0 +1,103 @@
+"""
+Image repository for database operations.
+"""
+from typing import Dict, Any, List
+
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+from src.core.logging_config import get_logger
+from src.db.models.prediction_image import PredictionImage
+from src.db.repositories.base_repository import BaseRepository
+
+logger = get_logger(__name__)
+
+# Images come back in the order they were attached to the prediction
+IMAGE_SORT = [("image_index", ASCENDING)]
+
+class ImageRepository(BaseRepository[PredictionImage]):
+    """
+    Image repository for database operations.
+
+    Each prediction image is stored as its own document referencing the
+    prediction, so predictions stay small however many images they carry.
+    """
+
+    _indexes_ensured = False
+
+    def __init__(self):
+        """
+        Initialize the image repository.
+        """
+        super().__init__("prediction_images", PredictionImage)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """
+        Create the indexes used by image queries, once per process.
+        """
+        if ImageRepository._indexes_ensured:
+            return
+        try:
+            self.collection.create_index([("prediction_id", ASCENDING)])
+            self.collection.create_index([
+                ("case_id", ASCENDING), ("section", ASCENDING), ("image_index", ASCENDING)
+            ])
+            ImageRepository._indexes_ensured = True
+        except PyMongoError as e:
+            logger.error(f"Error creating image indexes: {e}")
+
+    def create_for_prediction(self, prediction_id: Any, case_id: str, section: str,
+                              images: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store the metadata of a prediction's images in a single bulk insert.
+
+        Args:
+            prediction_id: The ID of the prediction the images belong to.
+            case_id: The case ID.
+            section: The report section.
+            images: The image metadata, in display order.
+
+        Returns:
+            A dictionary with the inserted IDs or an error message.
+        """
+        if not images:
+            return {"inserted_ids": []}
+
+        prediction_id = str(prediction_id)
+        documents = [
+            {
+                **image,
+                "prediction_id": prediction_id,
+                "case_id": case_id,
+                "section": section,
+                "image_index": i
+            }
+            for i, image in enumerate(images)
+        ]
+        return self.create_many(documents)
+
+    def get_by_prediction_id(self, prediction_id: Any) -> List[Dict[str, Any]]:
+        """
+        Get the images of a prediction.
+
+        Args:
+            prediction_id: The prediction ID to search for.
+
+        Returns:
+            A list of image documents ordered by image index.
+        """
+        return self.read({"prediction_id": str(prediction_id)}, sort=IMAGE_SORT)
+
+    def get_by_case_id_and_section(self, case_id: str, section: str) -> List[Dict[str, Any]]:
+        """
+        Get the images stored for a case section.
+
+        Args:
+            case_id: The case ID to search for.
+            section: The section to search for.
+
+        Returns:
+            A list of image documents ordered by image index.
+        """
+        return self.read({"case_id": case_id, "section": section}, sort=IMAGE_SORT)
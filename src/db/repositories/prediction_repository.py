@@ -1,16 +1,29 @@
 """
 Prediction repository for database operations.
 """
-from typing import Dict, Any, List, Optional
-import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional
 
 from src.core.logging_config import get_logger
 from src.db.models.prediction_log import PredictionLog
 from src.db.repositories.base_repository import BaseRepository
+from src.db.repositories.image_repository import ImageRepository
 from src.utils.file_helpers import upload_base64_image_to_azure
 
 logger = get_logger(__name__)
 
+# Fields needed to summarise a prediction, leaving out the response text
+PREDICTION_SUMMARY_PROJECTION = {
+    "_id": 1, "case_id": 1, "section": 1, "status": 1, "processing_time": 1, "created_at": 1
+}
+
+# Predictions fetched per cursor round trip when streaming
+STREAM_BATCH_SIZE = 100
+
+# Shared pool for Azure image uploads, which are network-bound
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="prediction-upload")
+
 class PredictionRepository(BaseRepository[PredictionLog]):
     """
     Prediction repository for database operations.
@@ -21,18 +34,54 @@ class PredictionRepository(BaseRepository[PredictionLog]):
         Initialize the prediction repository.
         """
         super().__init__("prediction_logs", PredictionLog)
+        self._image_repository: Optional[ImageRepository] = None
+
+    @property
+    def image_repository(self) -> ImageRepository:
+        """
+        The repository holding prediction image metadata, created on first use.
+        """
+        if self._image_repository is None:
+            self._image_repository = ImageRepository()
+        return self._image_repository
+
+    def iter_by_case_id(self, case_id: str, projection: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream predictions by case ID.
+
+        Args:
+            case_id: The case ID to search for.
+            projection: Optional projection limiting the fields returned.
 
-    def get_by_case_id(self, case_id: str) -> List[Dict[str, Any]]:
+        Yields:
+            The prediction documents.
+        """
+        return self.iter({"case_id": case_id}, projection=projection, batch_size=STREAM_BATCH_SIZE)
+
+    def get_by_case_id(self, case_id: str, projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
         """
         Get predictions by case ID.
 
         Args:
             case_id: The case ID to search for.
+            projection: Optional projection limiting the fields returned.
 
         Returns:
             A list of prediction documents.
         """
-        return self.read({"case_id": case_id})
+        return list(self.iter_by_case_id(case_id, projection=projection))
+
+    def get_case_summaries(self, case_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the section, status and timing of each prediction for a case.
+
+        Args:
+            case_id: The case ID to search for.
+
+        Returns:
+            A list of prediction summaries.
+        """
+        return self.get_by_case_id(case_id, projection=PREDICTION_SUMMARY_PROJECTION)
 
     def get_by_case_id_and_section(self, case_id: str, section: str) -> Optional[Dict[str, Any]]:
         """
@@ -47,28 +96,59 @@ class PredictionRepository(BaseRepository[PredictionLog]):
         """
         return self.read_one({"case_id": case_id, "section": section})
 
-    def get_successful_predictions(self) -> List[Dict[str, Any]]:
+    def iter_successful_predictions(self, projection: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all successful predictions.
+
+        Args:
+            projection: Optional projection limiting the fields returned.
+
+        Yields:
+            The successful prediction documents.
+        """
+        return self.iter({"status": "success"}, projection=projection, batch_size=STREAM_BATCH_SIZE)
+
+    def get_successful_predictions(self, projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
         """
         Get all successful predictions.
 
+        Args:
+            projection: Optional projection limiting the fields returned.
+
         Returns:
             A list of successful prediction documents.
         """
-        return self.read({"status": "success"})
+        return list(self.iter_successful_predictions(projection=projection))
+
+    def iter_failed_predictions(self, projection: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all failed predictions.
 
-    def get_failed_predictions(self) -> List[Dict[str, Any]]:
+        Args:
+            projection: Optional projection limiting the fields returned.
+
+        Yields:
+            The failed prediction documents.
+        """
+        return self.iter({"status": {"$ne": "success"}}, projection=projection, batch_size=STREAM_BATCH_SIZE)
+
+    def get_failed_predictions(self, projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
         """
         Get all failed predictions.
 
+        Args:
+            projection: Optional projection limiting the fields returned.
+
         Returns:
             A list of failed prediction documents.
         """
-        return self.read({"status": {"$ne": "success"}})
+        return list(self.iter_failed_predictions(projection=projection))
 
     def create_with_large_images(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new prediction document, handling large images by storing them in Azure Blob Storage.
-        Also handles cases where there are too many images by batching them.
+        Image metadata is kept in the prediction_images collection, one document per image,
+        so the prediction itself stays well under MongoDB's 16MB document limit.
 
         Args:
             data: The prediction data including potentially large base64 images.
@@ -77,150 +157,94 @@ class PredictionRepository(BaseRepository[PredictionLog]):
             A dictionary with the inserted ID or an error message.
         """
         try:
-            # Make a deep copy of the data to avoid modifying the original
-            processed_data = copy.deepcopy(data)
-
-            # Check if there are images to process
-            if "images" in processed_data and processed_data["images"]:
-                case_id = processed_data.get("case_id", "unknown")
-                section = processed_data.get("section", "unknown")
-
-                # Log the number of images to process
-                image_count = len(processed_data["images"])
-                logger.info(f"Processing {image_count} images for case {case_id}, section {section}")
-
-                # Process each image
-                processed_images = []
-                for i, img in enumerate(processed_data["images"]):
-                    # Skip if no base64_content
-                    if "base64_content" not in img:
-                        processed_images.append(img)
-                        continue
-
-                    # Get the description and base64 content
-                    description = img.get("description", "")
-                    base64_content = img["base64_content"]
-
-                    # Log progress for large image sets
-                    if image_count > 10 and i % 5 == 0:
-                        logger.info(f"Processing image {i+1}/{image_count} for {case_id}, section {section}")
-
-                    # Upload to Azure and get metadata
-                    image_metadata = upload_base64_image_to_azure(
-                        case_id=case_id,
-                        section=section,
-                        base64_content=base64_content,
-                        description=description
-                    )
-
-                    # If there was an error, log it but continue
-                    if "error" in image_metadata:
-                        logger.error(f"Error uploading image {i+1}/{image_count} for {case_id}, {section}: {image_metadata['error']}")
-                        # Add a placeholder without the base64 content
-                        processed_images.append({
-                            "description": description,
-                            "file_path": img.get("file_path", "unknown"),
-                            "section": section,
-                            "error": image_metadata["error"]
-                        })
-                    elif "skipped" in image_metadata:
-                        logger.warning(f"Skipped large image {i+1}/{image_count} for {case_id}, {section}: {image_metadata['skipped']}")
-                        processed_images.append(image_metadata)
-                    else:
-                        # Add the processed image metadata (without base64_content)
-                        processed_images.append(image_metadata)
-
-                # Replace the images array with processed images
-                processed_data["images"] = processed_images
-
-                # Check if we have too many images for a single document (MongoDB has a 16MB limit)
-                # If we have more than 50 images, we'll split them into batches
-                if len(processed_images) > 50:
-                    logger.warning(f"Large number of images ({len(processed_images)}) for {case_id}, {section}. Splitting into batches.")
-                    return self._create_with_batched_images(processed_data)
-
-            # Now create the document with processed data
-            return super().create(processed_data)
+            # Only top-level keys are rebound below, so a shallow copy leaves the original untouched
+            processed_data = dict(data)
+            images = processed_data.pop("images", None) or []
+            if not images:
+                return super().create(processed_data)
+
+            case_id = processed_data.get("case_id", "unknown")
+            section = processed_data.get("section", "unknown")
+
+            image_count = len(images)
+
+            # Images that already carry no base64 content (e.g. a re-save) are stored as they are
+            if any("base64_content" in img for img in images):
+                logger.info("Processing %d images for case %s, section %s", image_count, case_id, section)
+
+                # Upload images concurrently; map keeps the original order
+                processed_images = list(_UPLOAD_EXECUTOR.map(
+                    lambda item: self._process_image(item[0], item[1], image_count, case_id, section),
+                    enumerate(images)
+                ))
+            else:
+                processed_images = images
+
+            # Insert the prediction without its images, then the image metadata referencing it
+            processed_data["total_images"] = image_count
+            result = super().create(processed_data)
+            if "error" in result:
+                return result
+
+            image_result = self.image_repository.create_for_prediction(
+                result["inserted_id"], case_id, section, processed_images
+            )
+            if "error" in image_result:
+                logger.error("Error storing images for prediction %s: %s", result["inserted_id"], image_result["error"])
+                return {**result, "error": image_result["error"]}
+
+            return result
 
         except Exception as e:
-            logger.error(f"Error creating prediction with large images: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("Error creating prediction with large images: %s", e)
             return {"error": str(e)}
 
-    def _create_with_batched_images(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_image(self, i: int, img: Dict[str, Any], image_count: int, case_id: str, section: str) -> Dict[str, Any]:
         """
-        Create multiple prediction documents when there are too many images for a single document.
+        Upload a single base64 image to Azure and return the metadata to store.
 
         Args:
-            data: The prediction data with processed images.
+            i: The index of the image.
+            img: The image data, possibly with base64_content.
+            image_count: The total number of images being processed.
+            case_id: The case ID.
+            section: The report section.
 
         Returns:
-            A dictionary with the inserted ID of the main document or an error message.
+            The image metadata without base64 content.
         """
-        try:
-            # Make a copy of the data
-            main_data = copy.deepcopy(data)
-            case_id = main_data.get("case_id", "unknown")
-            section = main_data.get("section", "unknown")
-
-            # Get all images
-            all_images = main_data.get("images", [])
-            image_count = len(all_images)
-
-            # If we have a reasonable number of images, just create a single document
-            if image_count <= 50:
-                return super().create(main_data)
-
-            # Split images into batches of 50
-            batch_size = 50
-            image_batches = []
-            for i in range(0, image_count, batch_size):
-                image_batches.append(all_images[i:i+batch_size])
-
-            logger.info(f"Split {image_count} images into {len(image_batches)} batches for {case_id}, {section}")
-
-            # Keep the first batch in the main document
-            main_data["images"] = image_batches[0]
-            main_data["image_batch"] = 1
-            main_data["total_batches"] = len(image_batches)
-            main_data["total_images"] = image_count
-
-            # Create the main document
-            main_result = super().create(main_data)
-
-            if "error" in main_result:
-                logger.error(f"Error creating main batch document: {main_result['error']}")
-                return main_result
-
-            main_id = main_result["inserted_id"]
-            logger.info(f"Created main batch document with ID: {main_id}")
-
-            # Create additional documents for the remaining batches
-            for i, batch in enumerate(image_batches[1:], start=2):
-                batch_data = {
-                    "case_id": case_id,
-                    "section": section,
-                    "response": f"Batch {i} of {len(image_batches)} for {section}",
-                    "response_of_findings": "",
-                    "images": batch,
-                    "processing_time": main_data.get("processing_time", 0),
-                    "status": "success",
-                    "image_batch": i,
-                    "total_batches": len(image_batches),
-                    "main_batch_id": str(main_id),
-                    "total_images": image_count
-                }
-
-                batch_result = super().create(batch_data)
-                if "error" in batch_result:
-                    logger.error(f"Error creating batch {i} document: {batch_result['error']}")
-                    # Continue with other batches even if one fails
-
-            return main_result
-
-        except Exception as e:
-            logger.error(f"Error creating batched prediction documents: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return {"error": str(e)}
+        # Skip if no base64_content
+        if "base64_content" not in img:
+            return img
+
+        # Get the description and base64 content
+        description = img.get("description", "")
+        base64_content = img["base64_content"]
+
+        # Log progress for large image sets
+        if image_count > 10 and i % 5 == 0 and logger.isEnabledFor(logging.INFO):
+            logger.info("Processing image %d/%d for %s, section %s", i + 1, image_count, case_id, section)
+
+        # Upload to Azure and get metadata
+        image_metadata = upload_base64_image_to_azure(
+            case_id=case_id,
+            section=section,
+            base64_content=base64_content,
+            description=description
+        )
+
+        # If there was an error, log it but continue
+        if "error" in image_metadata:
+            logger.error("Error uploading image %d/%d for %s, %s: %s", i + 1, image_count, case_id, section, image_metadata["error"])
+            # Add a placeholder without the base64 content
+            return {
+                "description": description,
+                "file_path": img.get("file_path", "unknown"),
+                "section": section,
+                "error": image_metadata["error"]
+            }
+        if "skipped" in image_metadata:
+            logger.warning("Skipped large image %d/%d for %s, %s: %s", i + 1, image_count, case_id, section, image_metadata["skipped"])
+
+        # Add the processed image metadata (without base64_content)
+        return image_metadata
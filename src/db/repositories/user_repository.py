@@ -1,8 +1,10 @@
 """
 User repository for database operations.
 """
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
 
 from src.core.logging_config import get_logger
 from src.db.models.user import User
@@ -10,10 +12,21 @@ from src.db.repositories.base_repository import BaseRepository
 
 logger = get_logger(__name__)
 
+# Users found by username or email are served from memory for this many seconds
+USER_CACHE_TTL = 60
+USER_CACHE_MAX_SIZE = 10_000
+
 class UserRepository(BaseRepository[User]):
     """
     User repository for database operations.
+
+    Lookups by username and email go through a per-process cache shared by all
+    instances; any update or delete through the repository clears it.
     """
+
+    # (field, value) -> (expiry time, user document)
+    _user_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+    _user_cache_lock = threading.Lock()
     
     def __init__(self):
         """
@@ -31,7 +44,7 @@ class UserRepository(BaseRepository[User]):
         Returns:
             The user document or None if not found.
         """
-        return self.read_one({"username": username})
+        return self._cached_lookup("username", username)
     
     def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """
@@ -43,7 +56,91 @@ class UserRepository(BaseRepository[User]):
         Returns:
             The user document or None if not found.
         """
-        return self.read_one({"email": email})
+        return self._cached_lookup("email", email)
+    
+    def _cached_lookup(self, field: str, value: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a user by a unique field, using the cache when the entry is fresh.
+        
+        Args:
+            field: The field to search on.
+            value: The value to search for.
+            
+        Returns:
+            A copy of the user document or None if not found.
+        """
+        key = (field, value)
+        now = time.monotonic()
+        entry = UserRepository._user_cache.get(key)
+        if entry is not None and entry[0] > now:
+            return dict(entry[1])
+        
+        user = self.read_one({field: value})
+        if user is None:
+            return None
+        
+        with UserRepository._user_cache_lock:
+            cache = UserRepository._user_cache
+            if len(cache) >= USER_CACHE_MAX_SIZE:
+                # Drop expired entries first, then the oldest if still full
+                for stale_key in [k for k, (expiry, _) in cache.items() if expiry <= now]:
+                    del cache[stale_key]
+                if len(cache) >= USER_CACHE_MAX_SIZE:
+                    del cache[next(iter(cache))]
+            cache[key] = (now + USER_CACHE_TTL, user)
+        return dict(user)
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Drop every cached user.
+        """
+        with cls._user_cache_lock:
+            cls._user_cache.clear()
+    
+    def update(self, query: Dict[str, Any], update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update users and invalidate the lookup cache.
+        
+        Args:
+            query: The query to filter documents.
+            update_data: The fields to set, or an update operator document.
+            
+        Returns:
+            A dictionary with the number of modified documents or an error message.
+        """
+        result = super().update(query, update_data)
+        self.clear_cache()
+        return result
+    
+    def update_one_doc(self, query: Dict[str, Any], update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update one user and invalidate the lookup cache.
+        
+        Args:
+            query: The query to filter documents.
+            update_data: The fields to set, or an update operator document.
+            
+        Returns:
+            A dictionary with the number of modified documents or an error message.
+        """
+        result = super().update_one_doc(query, update_data)
+        self.clear_cache()
+        return result
+    
+    def delete(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Delete users and invalidate the lookup cache.
+        
+        Args:
+            query: The query to filter documents.
+            
+        Returns:
+            A dictionary with the number of deleted documents or an error message.
+        """
+        result = super().delete(query)
+        self.clear_cache()
+        return result
     
     def update_last_login(self, user_id: str) -> Dict[str, Any]:
         """
@@ -57,5 +154,5 @@ class UserRepository(BaseRepository[User]):
         """
         return self.update(
             {"_id": user_id},
-            {"last_login": datetime.now()}
+            {"last_login": datetime.now(timezone.utc)}
         )
@@ -1,11 +1,24 @@
 """
 Database session management.
 """
-from pymongo import MongoClient
+import threading
+
+from pymongo import ASCENDING, MongoClient
 from pymongo.database import Database
-from pymongo.errors import ConnectionFailure, ConfigurationError
+from pymongo.errors import ConnectionFailure, ConfigurationError, PyMongoError
 
-from src.core.config import MONGO_URI, DATABASE_NAME
+from src.core.config import (
+    MONGO_URI,
+    DATABASE_NAME,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_MAX_CONNECTING,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_COMPRESSORS,
+)
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -15,16 +28,21 @@ class DatabaseSession:
     Database session manager for MongoDB.
     """
     _instance = None
+    _lock = threading.Lock()
     
     def __new__(cls):
         """
         Singleton pattern to ensure only one database connection is created.
+        Uses double-checked locking so concurrent first calls share one client.
         """
         if cls._instance is None:
-            cls._instance = super(DatabaseSession, cls).__new__(cls)
-            cls._instance.client = None
-            cls._instance.db = None
-            cls._instance.connect()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(DatabaseSession, cls).__new__(cls)
+                    instance.client = None
+                    instance.db = None
+                    instance.connect()
+                    cls._instance = instance
         return cls._instance
     
     def connect(self):
@@ -37,11 +55,20 @@ class DatabaseSession:
         try:
             self.client = MongoClient(
                 MONGO_URI,
-                tls=True  # Ensure TLS/SSL is enabled
+                tls=True,  # Ensure TLS/SSL is enabled
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                maxConnecting=MONGO_MAX_CONNECTING,
+                maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                compressors=MONGO_COMPRESSORS
             )
             self.db = self.client[DATABASE_NAME]
             self.client.admin.command("ping")
             logger.info("MongoDB connection successful.")
+            self.ensure_indexes()
         except (ConnectionFailure, ConfigurationError) as e:
             logger.error(f"Error connecting to MongoDB: {e}")
             raise Exception(f"MongoDB connection error: {e}")
@@ -49,6 +76,33 @@ class DatabaseSession:
             logger.error(f"Unexpected error: {e}")
             raise Exception(f"Unexpected error during MongoDB initialization: {e}")
     
+    def ensure_indexes(self):
+        """
+        Create the indexes used by the prediction and user repository queries.
+        
+        create_index is idempotent, so this is safe to run on every startup.
+        Failures are logged rather than raised so the app can still serve requests.
+        """
+        try:
+            prediction_logs = self.db["prediction_logs"]
+            prediction_logs.create_index([("case_id", ASCENDING), ("section", ASCENDING)])
+            prediction_logs.create_index("status")
+
+            users = self.db["users"]
+            users.create_index("username", unique=True)
+            # Unique among non-empty emails only: users saved without one store "", which a
+            # sparse index would still include, so the second such user would collide
+            email_index = users.index_information().get("email_1")
+            if email_index is not None and "partialFilterExpression" not in email_index:
+                users.drop_index("email_1")
+            users.create_index(
+                "email", unique=True,
+                partialFilterExpression={"email": {"$type": "string", "$gt": ""}}
+            )
+            logger.info("MongoDB indexes ensured.")
+        except PyMongoError as e:
+            logger.error(f"Error creating MongoDB indexes: {e}")
+    
     def get_database(self) -> Database:
         """
         Get the database instance.
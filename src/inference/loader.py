@@ -3,7 +3,7 @@ Model loader for inference models.
 """
 import os
 import tempfile
-from typing import Dict, Any, List, Optional, Type
+from typing import Dict, Any, List, Optional, Tuple, Type
 
 from src.core.logging_config import get_logger
 from src.inference.exceptions import ModelNotFoundError, ModelLoadingError
@@ -12,6 +12,29 @@ from src.inference.models.gemini_model import GeminiModel
 
 logger = get_logger(__name__)
 
+def _model_key(model_type: str, model_name: str, kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Build the registry key for a model and the parameters it was created with.
+
+    Unhashable parameter values are left out of the key.
+
+    Args:
+        model_type: The type of model (e.g., "gemini").
+        model_name: The name of the model.
+        kwargs: Additional model parameters.
+
+    Returns:
+        A hashable key identifying the model configuration.
+    """
+    params = []
+    for name, value in kwargs.items():
+        try:
+            hash(value)
+        except TypeError:
+            continue
+        params.append((name, value))
+    return (model_type, model_name, frozenset(params))
+
 class ModelLoader:
     """
     Model loader for inference models.
@@ -21,7 +44,7 @@ class ModelLoader:
         """
         Initialize the model loader.
         """
-        self.models = {}
+        self.models: Dict[Tuple[Any, ...], BaseModel] = {}
         self.model_classes = {
             "gemini": GeminiModel
         }
@@ -42,11 +65,12 @@ class ModelLoader:
             ModelNotFoundError: If the model type is not found.
             ModelLoadingError: If the model fails to load.
         """
-        model_key = f"{model_type}_{model_name}"
+        model_key = _model_key(model_type, model_name, kwargs)
         
         # Return cached model if available
-        if model_key in self.models:
-            return self.models[model_key]
+        model = self.models.get(model_key)
+        if model is not None:
+            return model
         
         # Get model class
         if model_type not in self.model_classes:
@@ -61,12 +85,12 @@ class ModelLoader:
             self.models[model_key] = model
             return model
         except Exception as e:
-            logger.error(f"Failed to load model '{model_key}': {str(e)}")
-            raise ModelLoadingError(f"Failed to load model '{model_key}': {str(e)}")
+            logger.error(f"Failed to load model '{model_type}_{model_name}': {str(e)}")
+            raise ModelLoadingError(f"Failed to load model '{model_type}_{model_name}': {str(e)}")
     
     def unload_model(self, model_type: str, model_name: str) -> bool:
         """
-        Unload a model.
+        Unload a model, whatever parameters it was created with.
         
         Args:
             model_type: The type of model (e.g., "gemini").
@@ -75,18 +99,17 @@ class ModelLoader:
         Returns:
             True if the model was unloaded successfully, False otherwise.
         """
-        model_key = f"{model_type}_{model_name}"
+        success = True
         
-        if model_key in self.models:
+        for model_key in [key for key in self.models if key[:2] == (model_type, model_name)]:
             try:
                 self.models[model_key].unload()
                 del self.models[model_key]
-                return True
             except Exception as e:
-                logger.error(f"Failed to unload model '{model_key}': {str(e)}")
-                return False
+                logger.error(f"Failed to unload model '{model_type}_{model_name}': {str(e)}")
+                success = False
         
-        return True
+        return success
     
     def unload_all_models(self) -> bool:
         """
@@ -97,12 +120,15 @@ class ModelLoader:
         """
         success = True
         
-        for model_key, model in list(self.models.items()):
+        # Empty the registry first so unload() never sees a half-cleared dict
+        items = list(self.models.items())
+        self.models.clear()
+        
+        for model_key, model in items:
             try:
                 model.unload()
-                del self.models[model_key]
             except Exception as e:
-                logger.error(f"Failed to unload model '{model_key}': {str(e)}")
+                logger.error(f"Failed to unload model '{model_key[0]}_{model_key[1]}': {str(e)}")
                 success = False
         
         return success
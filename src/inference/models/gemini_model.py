@@ -1,8 +1,10 @@
 """
 Gemini model for text generation.
 """
+import asyncio
+import re
 import time
-from typing import Dict, Any, List, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 import base64
 
 import google.generativeai as genai
@@ -14,6 +16,12 @@ from src.inference.models.base_model import BaseModel
 
 logger = get_logger(__name__)
 
+# Matches the suggested delay in a 429 error, e.g. "retry_delay { seconds: 37 }"
+_RETRY_DELAY_RE = re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)")
+
+# Errors worth retrying after a backoff: HTTP 429, rate limiting or exhausted quota
+_RATE_LIMIT_RE = re.compile(r"429|rate limit|quota", re.IGNORECASE)
+
 def extract_retry_delay(error_message: str, default_delay: int = 5) -> int:
     """
     Extract the retry delay from a Gemini API rate limit error message (429).
@@ -32,13 +40,9 @@ def extract_retry_delay(error_message: str, default_delay: int = 5) -> int:
             return default_delay  # Use default for non-429 errors triggering backoff
 
         # Look for the retry_delay section in the error message
-        if "retry_delay" in error_message:
-            # Extract the seconds value using string manipulation
-            retry_delay_section = error_message.split("retry_delay {")[1].split("}")[0]
-            seconds_str = retry_delay_section.split("seconds:")[1].strip()
-
-            # Convert to integer, handling any trailing characters
-            seconds = int(''.join(filter(str.isdigit, seconds_str)))
+        match = _RETRY_DELAY_RE.search(error_message)
+        if match:
+            seconds = int(match.group(1))
 
             # Add a small buffer (e.g., 1-2 seconds or 10%) to the suggested retry time
             # This helps avoid hitting the limit immediately again.
@@ -59,6 +63,27 @@ class GeminiModel(BaseModel):
     Gemini model for text generation.
     """
 
+    # GenerativeModel instances shared by every GeminiModel, keyed by model name. A
+    # GenerativeModel binds no API key: requests use the key last passed to the
+    # process-global genai.configure, so keys are process-wide and not part of the cache key
+    _generative_models: Dict[str, genai.GenerativeModel] = {}
+
+    @classmethod
+    def _get_generative_model(cls, model_name: str) -> genai.GenerativeModel:
+        """
+        Get the shared GenerativeModel for a model name, creating it on first use.
+
+        Args:
+            model_name: The name of the Gemini model.
+
+        Returns:
+            The GenerativeModel instance.
+        """
+        model = cls._generative_models.get(model_name)
+        if model is None:
+            model = cls._generative_models.setdefault(model_name, genai.GenerativeModel(model_name))
+        return model
+
     def __init__(self, model_name: str = GEMINI_MODEL, **kwargs):
         """
         Initialize the Gemini model.
@@ -70,9 +95,14 @@ class GeminiModel(BaseModel):
         super().__init__(model_name, **kwargs)
         self.api_key = kwargs.get("api_key", GOOGLE_API_KEY)
         self.model = None
+        self._image_model = None
         self.temperature = kwargs.get("temperature", 0.2)
         self.max_output_tokens = kwargs.get("max_output_tokens", 8192)
         self.timeout = kwargs.get("timeout", 300)
+        self._generation_config = genai.GenerationConfig(
+            temperature=self.temperature,
+            max_output_tokens=self.max_output_tokens
+        )
 
     def load(self) -> bool:
         """
@@ -88,8 +118,9 @@ class GeminiModel(BaseModel):
             # Configure Gemini API
             genai.configure(api_key=self.api_key)
 
-            # Create the model
-            self.model = genai.GenerativeModel(self.model_name)
+            # Reuse the GenerativeModel objects shared across instances of the same model
+            self.model = self._get_generative_model(self.model_name)
+            self._image_model = self._get_generative_model(GEMINI_IMAGE_MODEL or "gemini-2.0-pro-vision")
 
             logger.info(f"Loaded Gemini model: {self.model_name}")
             return True
@@ -105,66 +136,270 @@ class GeminiModel(BaseModel):
             True if the model was unloaded successfully, False otherwise.
         """
         self.model = None
+        self._image_model = None
         return True
 
-    def predict(self, inputs: Union[str, List[Dict[str, str]]], max_retries: int = 3, base_retry_delay: int = 5) -> str:
+    def _with_retry(self, fn: Callable[[], Any], max_retries: int, base_retry_delay: int,
+                    error_prefix: str, exhausted_message: str) -> Any:
         """
-        Generate text with the Gemini model.
+        Call fn, sleeping and retrying with exponential backoff while the API reports rate limiting.
 
         Args:
-            inputs: The inputs to the model. Can be a string or a list of dictionaries with text.
+            fn: The call to make.
             max_retries: The maximum number of retries for rate-limited requests.
             base_retry_delay: The base delay in seconds for retries.
+            error_prefix: Prefix for the APIError raised on any other failure.
+            exhausted_message: Message for the APIRateLimitError raised when retries run out.
 
         Returns:
-            The generated text.
+            The result of fn.
 
         Raises:
-            ModelLoadingError: If the model is not loaded.
             APIRateLimitError: If the API rate limit is reached.
             APIError: If the API call fails.
         """
-        if not self.model:
-            self.load()
-
         retry_count = 0
         while retry_count <= max_retries:
             try:
-                response = self.model.generate_content(
-                    inputs,
-                    generation_config=genai.GenerationConfig(
-                        temperature=self.temperature,
-                        max_output_tokens=self.max_output_tokens
-                    ),
-                    request_options={"timeout": self.timeout}
-                )
+                return fn()
+            except Exception as e:
+                error_str = str(e)
+                if _RATE_LIMIT_RE.search(error_str):
+                    retry_delay = extract_retry_delay(error_str, default_delay=base_retry_delay * (2 ** retry_count))
+                    logger.warning(f"Rate limit in Gemini API. Sleeping {retry_delay}s.")
+                    time.sleep(retry_delay)
+                    retry_count += 1
+                else:
+                    logger.error(f"{error_prefix}: {error_str}")
+                    raise APIError(f"{error_prefix}: {error_str}")
 
-                if hasattr(response, "prompt_feedback") and response.prompt_feedback and response.prompt_feedback.block_reason:
-                    raise APIError(f"Content generation blocked ({response.prompt_feedback.block_reason})")
+        raise APIRateLimitError(exhausted_message)
 
-                if not hasattr(response, "text") or not response.text:
-                    finish_reason = response.candidates[0].finish_reason if response.candidates else "UNKNOWN"
-                    raise APIError(f"No text returned (Reason: {finish_reason}).")
+    async def _with_retry_async(self, fn: Callable[[], Awaitable[Any]], max_retries: int, base_retry_delay: int,
+                                error_prefix: str, exhausted_message: str) -> Any:
+        """
+        Async variant of _with_retry; backs off with asyncio.sleep so the event loop stays free.
 
-                return response.text
+        Args:
+            fn: Returns the awaitable to run on each attempt.
+            max_retries: The maximum number of retries for rate-limited requests.
+            base_retry_delay: The base delay in seconds for retries.
+            error_prefix: Prefix for the APIError raised on any other failure.
+            exhausted_message: Message for the APIRateLimitError raised when retries run out.
 
+        Returns:
+            The result of the awaited call.
+
+        Raises:
+            APIRateLimitError: If the API rate limit is reached.
+            APIError: If the API call fails.
+        """
+        retry_count = 0
+        while retry_count <= max_retries:
+            try:
+                return await fn()
             except Exception as e:
                 error_str = str(e)
-                if "429" in error_str or "rate limit" in error_str.lower() or "quota" in error_str.lower():
+                if _RATE_LIMIT_RE.search(error_str):
                     retry_delay = extract_retry_delay(error_str, default_delay=base_retry_delay * (2 ** retry_count))
                     logger.warning(f"Rate limit in Gemini API. Sleeping {retry_delay}s.")
-                    time.sleep(retry_delay)
+                    await asyncio.sleep(retry_delay)
                     retry_count += 1
                 else:
-                    logger.error(f"Gemini API error: {error_str}")
-                    raise APIError(f"Gemini API error: {error_str}")
+                    logger.error(f"{error_prefix}: {error_str}")
+                    raise APIError(f"{error_prefix}: {error_str}")
+
+        raise APIRateLimitError(exhausted_message)
+
+    def predict(self, inputs: Union[str, List[Dict[str, str]]], max_retries: int = 3, base_retry_delay: int = 5) -> str:
+        """
+        Generate text with the Gemini model.
+
+        Args:
+            inputs: The inputs to the model. Can be a string or a list of dictionaries with text.
+            max_retries: The maximum number of retries for rate-limited requests.
+            base_retry_delay: The base delay in seconds for retries.
+
+        Returns:
+            The generated text.
+
+        Raises:
+            ModelLoadingError: If the model is not loaded.
+            APIRateLimitError: If the API rate limit is reached.
+            APIError: If the API call fails.
+        """
+        if not self.model:
+            self.load()
+
+        def generate() -> str:
+            response = self.model.generate_content(
+                inputs,
+                generation_config=self._generation_config,
+                request_options={"timeout": self.timeout}
+            )
+            return self._response_text(response)
+
+        return self._with_retry(
+            generate, max_retries, base_retry_delay,
+            "Gemini API error", "Rate limit exceeded after maximum retries."
+        )
+
+    async def predict_async(self, inputs: Union[str, List[Dict[str, str]]], max_retries: int = 3,
+                            base_retry_delay: int = 5) -> str:
+        """
+        Async variant of predict; the request does not block the event loop, so
+        independent prompts can run concurrently with asyncio.gather.
+
+        Args:
+            inputs: The inputs to the model. Can be a string or a list of dictionaries with text.
+            max_retries: The maximum number of retries for rate-limited requests.
+            base_retry_delay: The base delay in seconds for retries.
+
+        Returns:
+            The generated text.
+
+        Raises:
+            ModelLoadingError: If the model is not loaded.
+            APIRateLimitError: If the API rate limit is reached.
+            APIError: If the API call fails.
+        """
+        if not self.model:
+            self.load()
+
+        async def generate() -> str:
+            response = await self.model.generate_content_async(
+                inputs,
+                generation_config=self._generation_config,
+                request_options={"timeout": self.timeout}
+            )
+            return self._response_text(response)
+
+        return await self._with_retry_async(
+            generate, max_retries, base_retry_delay,
+            "Gemini API error", "Rate limit exceeded after maximum retries."
+        )
+
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        """
+        Extract the generated text from a text response.
+
+        Args:
+            response: The Gemini response.
 
-        raise APIRateLimitError("Rate limit exceeded after maximum retries.")
+        Returns:
+            The generated text.
+
+        Raises:
+            APIError: If generation was blocked or returned no text.
+        """
+        if hasattr(response, "prompt_feedback") and response.prompt_feedback and response.prompt_feedback.block_reason:
+            raise APIError(f"Content generation blocked ({response.prompt_feedback.block_reason})")
+
+        if not hasattr(response, "text") or not response.text:
+            finish_reason = response.candidates[0].finish_reason if response.candidates else "UNKNOWN"
+            raise APIError(f"No text returned (Reason: {finish_reason}).")
+
+        return response.text
+
+    @staticmethod
+    def _image_description(response: Any) -> str:
+        """
+        Extract the description text from an image response.
+
+        Args:
+            response: The Gemini response.
+
+        Returns:
+            The generated text description of the image.
+
+        Raises:
+            APIError: If the description was blocked or is missing.
+        """
+        # Check for safety ratings/blocks
+        if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
+            if hasattr(response.prompt_feedback, 'safety_ratings'):
+                for rating in response.prompt_feedback.safety_ratings:
+                    if rating.blocked:
+                        raise APIError(f"Image description blocked: {rating.category}")
+
+        # Get the response text
+        if hasattr(response, "text"):
+            return response.text
+        elif hasattr(response, "parts"):
+            return "".join(part.text for part in response.parts if hasattr(part, "text"))
+        else:
+            raise APIError("No description generated.")
+
+    @staticmethod
+    def _decode_image(image_b64: str) -> bytes:
+        """
+        Decode a base64-encoded image.
+
+        Args:
+            image_b64: The base64-encoded image.
+
+        Returns:
+            The raw image bytes.
+
+        Raises:
+            APIError: If the image cannot be decoded.
+        """
+        try:
+            return base64.b64decode(image_b64)
+        except Exception as e:
+            raise APIError(f"Failed to decode base64 image: {e}")
+
+    def _image_contents(self, image_bytes: bytes, prompt: str) -> List[Any]:
+        """
+        Build the request contents for an image description, loading the model if needed.
+
+        Args:
+            image_bytes: The raw image bytes.
+            prompt: The text prompt to accompany the image.
+
+        Returns:
+            The contents to send to the image model.
+        """
+        # load() configures the API and creates the image-capable model once
+        if not self._image_model:
+            self.load()
+
+        return [{"mime_type": "image/jpeg", "data": image_bytes}, prompt]
+
+    def predict_with_image_bytes(self, image_bytes: bytes, prompt: str, max_retries: int = 3,
+                                 base_retry_delay: int = 5) -> str:
+        """
+        Generate text with the Gemini model using raw image bytes as input.
+
+        Args:
+            image_bytes: The raw image bytes.
+            prompt: The text prompt to accompany the image.
+            max_retries: The maximum number of retries for rate-limited requests.
+            base_retry_delay: The base delay in seconds for retries.
+
+        Returns:
+            The generated text description of the image.
+
+        Raises:
+            ModelLoadingError: If the model is not loaded.
+            APIRateLimitError: If the API rate limit is reached.
+            APIError: If the API call fails.
+        """
+        contents = self._image_contents(image_bytes, prompt)
+        return self._with_retry(
+            lambda: self._image_description(self._image_model.generate_content(contents)),
+            max_retries, base_retry_delay,
+            "Error generating image description",
+            "Rate limit exceeded after maximum retries for image processing."
+        )
 
     def predict_with_image(self, image_b64: str, prompt: str, max_retries: int = 3, base_retry_delay: int = 5) -> str:
         """
         Generate text with the Gemini model using an image as input.
 
+        Callers that already hold the raw bytes should use predict_with_image_bytes.
+
         Args:
             image_b64: The base64-encoded image.
             prompt: The text prompt to accompany the image.
@@ -179,54 +414,38 @@ class GeminiModel(BaseModel):
             APIRateLimitError: If the API rate limit is reached.
             APIError: If the API call fails.
         """
-        # Use the image-capable model
-        image_model_name = GEMINI_IMAGE_MODEL or "gemini-2.0-pro-vision"
+        return self.predict_with_image_bytes(self._decode_image(image_b64), prompt, max_retries, base_retry_delay)
 
-        # Configure the Gemini API
-        genai.configure(api_key=self.api_key)
+    async def predict_with_image_async(self, image_b64: str, prompt: str, max_retries: int = 3,
+                                       base_retry_delay: int = 5) -> str:
+        """
+        Async variant of predict_with_image.
 
-        retry_count = 0
-        while retry_count <= max_retries:
-            try:
-                # Decode the image from base64
-                try:
-                    image_bytes = base64.b64decode(image_b64)
-                except Exception as e:
-                    raise APIError(f"Failed to decode base64 image: {e}")
-
-                # Create the model
-                model = genai.GenerativeModel(image_model_name)
-
-                # Generate content with the image
-                response = model.generate_content([
-                    {"mime_type": "image/jpeg", "data": image_bytes},
-                    prompt
-                ])
-
-                # Check for safety ratings/blocks
-                if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
-                    if hasattr(response.prompt_feedback, 'safety_ratings'):
-                        for rating in response.prompt_feedback.safety_ratings:
-                            if rating.blocked:
-                                raise APIError(f"Image description blocked: {rating.category}")
-
-                # Get the response text
-                if hasattr(response, "text"):
-                    return response.text
-                elif hasattr(response, "parts"):
-                    return "".join(part.text for part in response.parts if hasattr(part, "text"))
-                else:
-                    raise APIError("No description generated.")
+        Callers describing many images can run these concurrently with asyncio.gather,
+        using a semaphore to cap the number of requests in flight.
 
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "rate limit" in error_str.lower() or "quota" in error_str.lower():
-                    retry_delay = extract_retry_delay(error_str, default_delay=base_retry_delay * (2 ** retry_count))
-                    logger.warning(f"Rate limit in Gemini API. Sleeping {retry_delay}s.")
-                    time.sleep(retry_delay)
-                    retry_count += 1
-                else:
-                    logger.error(f"Error describing image: {error_str}")
-                    raise APIError(f"Error generating image description: {error_str}")
+        Args:
+            image_b64: The base64-encoded image.
+            prompt: The text prompt to accompany the image.
+            max_retries: The maximum number of retries for rate-limited requests.
+            base_retry_delay: The base delay in seconds for retries.
+
+        Returns:
+            The generated text description of the image.
+
+        Raises:
+            ModelLoadingError: If the model is not loaded.
+            APIRateLimitError: If the API rate limit is reached.
+            APIError: If the API call fails.
+        """
+        contents = self._image_contents(self._decode_image(image_b64), prompt)
+
+        async def generate() -> str:
+            response = await self._image_model.generate_content_async(contents)
+            return self._image_description(response)
 
-        raise APIRateLimitError("Rate limit exceeded after maximum retries for image processing.")
+        return await self._with_retry_async(
+            generate, max_retries, base_retry_delay,
+            "Error generating image description",
+            "Rate limit exceeded after maximum retries for image processing."
+        )
@@ -1,15 +1,30 @@
 """
 Inference pipeline for the application.
 """
+import re
 import time
+import traceback
 from typing import Dict, Any, List, Optional
 
 from src.core.logging_config import get_logger
 from src.inference.exceptions import InferenceError
+from src.inference.postprocessing import extract_findings_and_background, parse_background_response
 from src.inference.service import InferenceService
 
 logger = get_logger(__name__)
 
+# Error strings the service returns in place of an analysis, and what each one means
+_ERROR_KINDS = {
+    "Error: Rate limit exceeded": "rate_limit",
+    "persistent API rate limits": "rate_limit",
+    "An unexpected error occurred during analysis": "internal",
+    "Error querying Gemini": "internal"
+}
+_ERROR_MARKER_RE = re.compile("|".join(map(re.escape, _ERROR_KINDS)))
+
+# The error strings start within this many characters of the response
+ERROR_MARKER_WINDOW = 512
+
 class InferencePipeline:
     """
     Inference pipeline for the application.
@@ -74,7 +89,9 @@ class InferencePipeline:
             )
 
             # Handle Gemini response/errors
-            if "Error: Rate limit exceeded" in response_text or "Error: Could not generate unified analysis due to persistent API rate limits" in response_text:
+            error_match = _ERROR_MARKER_RE.search(response_text, 0, ERROR_MARKER_WINDOW)
+            error_kind = _ERROR_KINDS[error_match.group()] if error_match else None
+            if error_kind == "rate_limit":
                 logger.error(f"Gemini processing failed for case {self.case_id} due to rate limits after retries.")
                 return {
                     "case_id": self.case_id,
@@ -85,7 +102,7 @@ class InferencePipeline:
                     "processing_time": time.time() - start_time,
                     "error": "Rate limit exceeded"
                 }
-            elif "An unexpected error occurred during analysis" in response_text or "Error querying Gemini" in response_text:
+            elif error_kind == "internal":
                 logger.error(f"Gemini processing failed for case {self.case_id} due to an unexpected error: {response_text}")
                 return {
                     "case_id": self.case_id,
@@ -106,8 +123,6 @@ class InferencePipeline:
                 logger.error(f"Failed to fetch or encode images for case {self.case_id}, section {section}: {img_err}")
 
             # Extract findings and background based on the section
-            from src.inference.postprocessing import extract_findings_and_background, parse_background_response
-
             # For Background Information section, use the new parsing function
             if section == "Background Information":
                 logger.info(f"Using parse_background_response for Background Information section")
@@ -136,7 +151,6 @@ class InferencePipeline:
 
         except Exception as e:
             logger.error(f"Error in inference pipeline for case {self.case_id}, section {section}: {str(e)}")
-            import traceback
             logger.error(traceback.format_exc())
 
             return {
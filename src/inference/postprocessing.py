@@ -1,27 +1,196 @@
 """
 Postprocessing utilities for inference.
 """
+import asyncio
 import base64
 import io
+import multiprocessing
 import os
+import re
 import tempfile
-from typing import Dict, Any, List, Optional
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
 
-import requests
+import aiofiles
+import aiohttp
 from PIL import Image
 
 from src.core.logging_config import get_logger
 from src.inference.exceptions import PostprocessingError
 
+# PDF renderers, imported once; rasterization falls back to a placeholder when both are missing
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    import pdf2image
+except ImportError:
+    pdf2image = None
+
+try:
+    # SIMD-accelerated base64 when available
+    from pybase64 import b64encode_as_string as _b64encode
+except ImportError:
+    def _b64encode(data) -> str:
+        return base64.b64encode(data).decode("ascii")
+
 logger = get_logger(__name__)
 
-async def convert_pdf_to_images(pdf_url: str, description: str) -> List[Dict[str, Any]]:
+# Size of the chunks streamed from a PDF download to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Connection pool for PDF downloads; idle connections are kept open so later
+# exhibits from the same storage account skip the TCP and TLS handshake
+HTTP_MAX_CONNECTIONS = 100
+HTTP_KEEPALIVE_TIMEOUT = 60
+
+# Resolution used when rasterizing PDF pages
+PDF_RENDER_DPI = 200
+
+# zlib level for rendered pages; level 1 encodes several times faster than the default 6
+# for a modest size increase
+PNG_COMPRESS_LEVEL = 1
+
+# Worker processes for CPU-bound PDF rasterization; spawned because the server is threaded
+_PDF_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                mp_context=multiprocessing.get_context("spawn"))
+
+# Shared HTTP session for PDF downloads and the event loop it belongs to
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared HTTP session, creating it on first use in the running event loop.
+
+    Returns:
+        The aiohttp client session.
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_MAX_CONNECTIONS,
+            limit_per_host=64,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300
+        )
+        _http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        _http_session_loop = loop
+    return _http_session
+
+async def close_http_session() -> None:
+    """
+    Close the shared HTTP session, if one was opened.
+    """
+    global _http_session, _http_session_loop
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    _http_session_loop = None
+
+def _rasterize_with_pymupdf(pdf_path: str, dpi: int) -> List[str]:
+    """
+    Render each page of a PDF to a base64-encoded PNG with PyMuPDF, in process.
+
+    Args:
+        pdf_path: The path of the PDF file.
+        dpi: The resolution to render at.
+
+    Returns:
+        The base64-encoded PNG of each page, in page order.
+    """
+    zoom = dpi / 72
+    matrix = fitz.Matrix(zoom, zoom)
+    with fitz.open(pdf_path) as doc:
+        return [
+            _b64encode(page.get_pixmap(matrix=matrix, alpha=False).tobytes("png"))
+            for page in doc
+        ]
+
+def _rasterize_with_pdf2image(pdf_path: str, dpi: int) -> List[str]:
+    """
+    Render each page of a PDF to a base64-encoded PNG with pdf2image.
+
+    Args:
+        pdf_path: The path of the PDF file.
+        dpi: The resolution to render at.
+
+    Returns:
+        The base64-encoded PNG of each page, in page order.
+    """
+    # Note: This requires poppler to be installed
+    encoded_pages = []
+    for img in pdf2image.convert_from_path(pdf_path, dpi=dpi):
+        # Save the image to a bytes buffer and encode it without copying the buffer
+        img_buffer = io.BytesIO()
+        img.save(img_buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL, optimize=False)
+        with img_buffer.getbuffer() as png_view:
+            encoded_pages.append(_b64encode(png_view))
+    return encoded_pages
+
+def _rasterize_pdf(pdf_path: str, dpi: int) -> List[str]:
+    """
+    Render each page of a PDF to a base64-encoded PNG.
+
+    Runs in a worker process, so it takes and returns only picklable values.
+    PyMuPDF renders in process; pdf2image (which shells out to Poppler) is
+    only used if PyMuPDF cannot handle the file.
+
+    Args:
+        pdf_path: The path of the PDF file.
+        dpi: The resolution to render at.
+
+    Returns:
+        The base64-encoded PNG of each page, in page order.
+    """
+    try:
+        return _rasterize_with_pymupdf(pdf_path, dpi)
+    except Exception as e:
+        logger.warning(f"PyMuPDF could not rasterize {pdf_path}: {e}. Falling back to pdf2image.")
+        return _rasterize_with_pdf2image(pdf_path, dpi)
+
+@contextmanager
+def _pdf_scratch_path(temp_root: Optional[str] = None) -> Iterator[str]:
+    """
+    Provide a temporary path for a downloaded PDF and remove it afterwards.
+
+    Args:
+        temp_root: A directory shared by the caller's request; when omitted, a
+            temporary directory is created for this PDF alone.
+
+    Yields:
+        The path to write the PDF to.
+    """
+    if temp_root is None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield os.path.join(temp_dir, "temp.pdf")
+        return
+
+    # A unique name keeps concurrent conversions sharing the root apart
+    pdf_path = os.path.join(temp_root, f"{uuid.uuid4().hex}.pdf")
+    try:
+        yield pdf_path
+    finally:
+        if os.path.exists(pdf_path):
+            os.remove(pdf_path)
+
+async def convert_pdf_to_images(pdf_url: str, description: str,
+                                temp_root: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Convert a PDF to a list of base64-encoded images, one per page.
 
     Args:
         pdf_url: The URL of the PDF file.
         description: A description of the PDF.
+        temp_root: Optional directory, owned by the caller, to download the PDF into.
 
     Returns:
         A list of dictionaries, each containing a base64-encoded image.
@@ -30,34 +199,24 @@ async def convert_pdf_to_images(pdf_url: str, description: str) -> List[Dict[str
     images = []
 
     try:
-        # Create a temporary directory to store the PDF
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Download the PDF
-            response = requests.get(pdf_url, stream=True, timeout=30)
-            response.raise_for_status()
-
-            # Save the PDF to a temporary file
-            pdf_path = os.path.join(temp_dir, "temp.pdf")
-            with open(pdf_path, "wb") as f:
-                f.write(response.content)
+        # Get a temporary path to store the PDF
+        with _pdf_scratch_path(temp_root) as pdf_path:
+            # Stream the PDF to a temporary file without blocking the event loop
+            session = _get_http_session()
+            async with session.get(pdf_url) as response:
+                response.raise_for_status()
+                async with aiofiles.open(pdf_path, "wb") as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
 
             try:
-                # Try to convert the PDF to images using pdf2image
-                # Note: This requires poppler to be installed
-                import pdf2image
-
-                pdf_images = pdf2image.convert_from_path(pdf_path, dpi=200)
+                # Rasterize the pages in a worker process so the event loop stays free
+                encoded_pages = await asyncio.get_running_loop().run_in_executor(
+                    _PDF_POOL, _rasterize_pdf, pdf_path, PDF_RENDER_DPI
+                )
 
                 # Process each page
-                for i, img in enumerate(pdf_images):
-                    # Save the image to a bytes buffer
-                    img_buffer = io.BytesIO()
-                    img.save(img_buffer, format="PNG")
-                    img_buffer.seek(0)
-
-                    # Encode the image to base64
-                    base64_encoded = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-
+                for i, base64_encoded in enumerate(encoded_pages):
                     # Create the data URI
                     base64_data_uri = f"data:image/png;base64,{base64_encoded}"
 
@@ -83,8 +242,8 @@ async def convert_pdf_to_images(pdf_url: str, description: str) -> List[Dict[str
 
                 logger.info(f"Successfully converted PDF to {len(images)} images: {description}")
             except Exception as pdf_err:
-                # If pdf2image fails (e.g., poppler not installed), create a placeholder image
-                logger.warning(f"Failed to convert PDF to images using pdf2image: {pdf_err}. Creating placeholder image.")
+                # If rasterization fails (e.g., poppler not installed for the fallback), create a placeholder image
+                logger.warning(f"Failed to convert PDF to images: {pdf_err}. Creating placeholder image.")
 
                 # Create a placeholder image with the PDF description
                 # Get the exhibit number (default to 1)
@@ -98,11 +257,14 @@ async def convert_pdf_to_images(pdf_url: str, description: str) -> List[Dict[str
                     # Add "Exhibit" prefix
                     image_description = f"Exhibit {exhibit_num}: {description} (PDF - view in browser)"
 
+                async with aiofiles.open(pdf_path, "rb") as f:
+                    pdf_bytes = await f.read()
+
                 placeholder_image = {
                     "description": image_description,
                     "file_path": "pdf_placeholder.png",
                     "section": "Exhibits",
-                    "base64_content": f"data:application/pdf;base64,{base64.b64encode(response.content).decode('utf-8')}",
+                    "base64_content": f"data:application/pdf;base64,{_b64encode(pdf_bytes)}",
                     "page_number": 1,
                     "is_pdf": True,
                     "pdf_url": pdf_url
@@ -117,6 +279,60 @@ async def convert_pdf_to_images(pdf_url: str, description: str) -> List[Dict[str
 
     return images
 
+# Header formats recognised by extract_findings_and_background, matched case-insensitively
+FINDINGS_HEADERS = (
+    "**1.4 Findings**",
+    "**1.4. Findings**",
+    "**Findings**"
+)
+
+BACKGROUND_HEADERS = (
+    "**2. Background Information**",
+    "**2.0 Background Information**",
+    "**Background Information**"
+)
+
+# One pass finds the earliest header of each kind; indices refer to the original text
+_FINDINGS_HEADER_RE = re.compile("|".join(map(re.escape, FINDINGS_HEADERS)), re.IGNORECASE)
+_BACKGROUND_HEADER_RE = re.compile("|".join(map(re.escape, BACKGROUND_HEADERS)), re.IGNORECASE)
+
+# Lowercased headers for the ASCII fast path
+_FINDINGS_HEADERS_LOWER = tuple(header.lower() for header in FINDINGS_HEADERS)
+_BACKGROUND_HEADERS_LOWER = tuple(header.lower() for header in BACKGROUND_HEADERS)
+
+def _find_header(response_text: str, lowered: Optional[str], headers: tuple,
+                 pattern: re.Pattern) -> tuple:
+    """
+    Find the earliest case-insensitive occurrence of any of the given headers.
+
+    For ASCII text, lowercasing keeps every index in place, so plain substring
+    searches on the lowered text replace the case-insensitive regex scan.
+
+    Args:
+        response_text: The text to search.
+        lowered: response_text.lower() when the text is ASCII, otherwise None.
+        headers: The lowercased headers, in the same order as the pattern's alternatives.
+        pattern: The compiled case-insensitive pattern for the headers.
+
+    Returns:
+        A tuple of (start index or -1, the header as written in the text or None).
+    """
+    if lowered is None:
+        match = pattern.search(response_text)
+        return (match.start(), match.group()) if match else (-1, None)
+
+    start = -1
+    length = 0
+    for header in headers:
+        # Only the part before the best match so far can hold an earlier header
+        index = lowered.find(header, 0, len(lowered) if start == -1 else start + len(header) - 1)
+        if index != -1 and (start == -1 or index < start):
+            start = index
+            length = len(header)
+    if start == -1:
+        return -1, None
+    return start, response_text[start:start + length]
+
 def extract_findings_and_background(response_text: str) -> tuple:
     """
     Extract findings and background information from a response text.
@@ -129,47 +345,25 @@ def extract_findings_and_background(response_text: str) -> tuple:
     Returns:
         A tuple of (findings_part, background_part).
     """
+    # Every header is bold markdown; without "**" there is nothing to split
+    if "**" not in response_text:
+        return "", response_text
+
     # Initialize with defaults
     findings_part = ""
     background_part = response_text
 
-    # Check for various header formats
-    findings_headers = [
-        "**1.4 Findings**",
-        "**Findings**",
-        "**1.4. Findings**",
-        "**1.4 FINDINGS**",
-        "**FINDINGS**"
-    ]
-
-    background_headers = [
-        "**2. Background Information**",
-        "**2.0 Background Information**",
-        "**Background Information**",
-        "**BACKGROUND INFORMATION**",
-        "**2. BACKGROUND INFORMATION**",
-        "**2.0 BACKGROUND INFORMATION**"
-    ]
+    lowered = response_text.lower() if response_text.isascii() else None
 
     # Find the earliest occurrence of any findings header
-    start_findings = -1
-    found_findings_header = None
-
-    for header in findings_headers:
-        pos = response_text.find(header)
-        if pos != -1 and (start_findings == -1 or pos < start_findings):
-            start_findings = pos
-            found_findings_header = header
+    start_findings, found_findings_header = _find_header(
+        response_text, lowered, _FINDINGS_HEADERS_LOWER, _FINDINGS_HEADER_RE
+    )
 
     # Find the earliest occurrence of any background header
-    start_background = -1
-    found_background_header = None
-
-    for header in background_headers:
-        pos = response_text.find(header)
-        if pos != -1 and (start_background == -1 or pos < start_background):
-            start_background = pos
-            found_background_header = header
+    start_background, found_background_header = _find_header(
+        response_text, lowered, _BACKGROUND_HEADERS_LOWER, _BACKGROUND_HEADER_RE
+    )
 
     # Extract findings and background based on what was found
     if start_findings != -1:
@@ -1,9 +1,12 @@
 """
 Preprocessing utilities for inference.
 """
+import asyncio
+import multiprocessing
 import os
 import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
@@ -14,8 +17,65 @@ from src.core.logging_config import get_logger
 from src.inference.exceptions import PreprocessingError
 from src.utils.file_helpers import save_uploaded_file, upload_to_azure
 
+# Optional document parsers, imported once; the functions that need them report when they are missing
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    import docx
+except ImportError:
+    docx = None
+
 logger = get_logger(__name__)
 
+# PDFs are split across worker processes once each worker would get at least this many pages
+PDF_PAGES_PER_WORKER = 32
+
+# Worker processes for text extraction from large PDFs; spawned because the server is threaded
+_PDF_TEXT_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                     mp_context=multiprocessing.get_context("spawn"))
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """
+    Hard-link a file to a second path, copying it when linking is not possible.
+
+    Args:
+        src: The existing file.
+        dst: The new path.
+    """
+    try:
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+    except (OSError, NotImplementedError):
+        shutil.copy2(src, dst)
+
+async def _upload_with_retry(blob_prefix: str, file_path: str, max_retries: int = 3,
+                             base_delay: float = 0.5) -> str:
+    """
+    Upload a file to Azure off the event loop, retrying with exponential backoff.
+
+    Args:
+        blob_prefix: The blob prefix, including the case ID and category.
+        file_path: The path of the file to upload.
+        max_retries: The number of retries after the first attempt.
+        base_delay: The delay in seconds before the first retry; doubled for each retry after.
+
+    Returns:
+        The Azure URL if successful, empty string otherwise.
+    """
+    for attempt in range(max_retries + 1):
+        azure_url = await asyncio.to_thread(upload_to_azure, blob_prefix, "", file_path)
+        if azure_url or not os.path.exists(file_path):
+            return azure_url
+        if attempt < max_retries:
+            delay = base_delay * (2 ** attempt)
+            logger.warning(f"Azure upload of {file_path} failed, retrying in {delay}s ({attempt + 1}/{max_retries})")
+            await asyncio.sleep(delay)
+    return ""
+
 async def process_file_upload(
     file: UploadFile,
     case_id: str,
@@ -66,12 +126,12 @@ async def process_file_upload(
         os.makedirs(case_dir_path, exist_ok=True)
         case_file_path = os.path.join(case_dir_path, unique_filename)
 
-        # Copy the file to the case directory structure
+        # Link the file into the case directory structure (same filesystem, so no data is copied)
         try:
-            shutil.copy2(file_path, case_file_path)
-            logger.info(f"Copied file to case directory: {case_file_path}")
+            _link_or_copy(file_path, case_file_path)
+            logger.info(f"Linked file into case directory: {case_file_path}")
         except Exception as e:
-            logger.error(f"Error copying file to case directory: {str(e)}")
+            logger.error(f"Error linking file into case directory: {str(e)}")
 
         # Create standardized path format and metadata
         rel_path = f"{case_id}/{category}/{unique_filename}"
@@ -89,18 +149,13 @@ async def process_file_upload(
             file_metadata["section"] = section
             logger.info(f"Setting file section: {section}")
 
-        # Upload to Azure - both from the file in the processing directory
+        # Upload to Azure from the processing directory, off the event loop; the case directory
+        # copy has the same name and would land on the same blob, so it is not uploaded again
         # Pass an empty string for file_category since the case_id parameter will now include the category
-        azure_url = upload_to_azure(f"{case_id}/{category}", "", file_path)
+        azure_url = await _upload_with_retry(f"{case_id}/{category}", file_path)
         if azure_url:
             file_metadata["azure_url"] = azure_url
 
-        # Also upload the file from the case directory structure
-        if os.path.exists(case_file_path):
-            case_azure_url = upload_to_azure(f"{case_id}/{category}", "", case_file_path)
-            if case_azure_url and not azure_url:
-                file_metadata["azure_url"] = case_azure_url
-
         return file_metadata
 
     except Exception as e:
@@ -156,12 +211,12 @@ async def process_exhibit_file(
         os.makedirs(case_dir_path, exist_ok=True)
         case_file_path = os.path.join(case_dir_path, unique_filename)
 
-        # Copy the file to the case directory structure
+        # Link the file into the case directory structure (same filesystem, so no data is copied)
         try:
-            shutil.copy2(file_path, case_file_path)
-            logger.info(f"Copied exhibit file to case directory: {case_file_path}")
+            _link_or_copy(file_path, case_file_path)
+            logger.info(f"Linked exhibit file into case directory: {case_file_path}")
         except Exception as e:
-            logger.error(f"Error copying exhibit file to case directory: {str(e)}")
+            logger.error(f"Error linking exhibit file into case directory: {str(e)}")
 
         # Create standardized path format and metadata
         rel_path = f"{case_id}/exhibits/{file_type}/{unique_filename}"
@@ -174,17 +229,11 @@ async def process_exhibit_file(
             "exhibit_number": file_idx+1
         }
 
-        # Upload to Azure
-        azure_url = upload_to_azure(f"{case_id}/exhibits/{file_type}", "", file_path)
+        # Upload to Azure once, retrying on failure; the case directory copy maps to the same blob
+        azure_url = await _upload_with_retry(f"{case_id}/exhibits/{file_type}", file_path)
         if azure_url:
             file_metadata["azure_url"] = azure_url
 
-        # Also upload the file from the case directory structure
-        if os.path.exists(case_file_path):
-            case_azure_url = upload_to_azure(f"{case_id}/exhibits/{file_type}", "", case_file_path)
-            if case_azure_url and not azure_url:
-                file_metadata["azure_url"] = case_azure_url
-
         return file_metadata
 
     except Exception as e:
@@ -193,6 +242,45 @@ async def process_exhibit_file(
         logger.error(traceback.format_exc())
         return {}
 
+def _extract_pages(doc: Any, pdf_path: str, start: int, end: int) -> str:
+    """
+    Extract the text of a range of pages from an open PDF.
+
+    Args:
+        doc: The open PyMuPDF document.
+        pdf_path: The path of the PDF, for log messages.
+        start: The index of the first page.
+        end: The index after the last page.
+
+    Returns:
+        The text of the pages, with a marker for any page that failed.
+    """
+    parts = []
+    for page_num in range(start, end):
+        try:
+            page_text = doc[page_num].get_text()
+            if page_text:
+                parts.append(page_text)
+        except Exception as page_e:
+            logger.warning(f"Error extracting text from page {page_num + 1} of {pdf_path}: {page_e}")
+            parts.append(f"\n[Error extracting page {page_num + 1}]\n")
+    return "".join(parts)
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> str:
+    """
+    Open a PDF and extract the text of a range of pages; runs in a worker process.
+
+    Args:
+        pdf_path: The path of the PDF.
+        start: The index of the first page.
+        end: The index after the last page.
+
+    Returns:
+        The text of the pages.
+    """
+    with fitz.open(pdf_path) as doc:
+        return _extract_pages(doc, pdf_path, start, end)
+
 def process_pdf_for_gemini(pdf_path: str) -> Optional[Dict[str, str]]:
     """
     Convert PDF to text for Gemini processing.
@@ -203,9 +291,7 @@ def process_pdf_for_gemini(pdf_path: str) -> Optional[Dict[str, str]]:
     Returns:
         A dictionary with the extracted text.
     """
-    try:
-        import fitz  # PyMuPDF
-    except ImportError:
+    if fitz is None:
         logger.error("PyMuPDF (fitz) is not installed. Cannot process PDF files. Run 'pip install PyMuPDF'")
         return None
 
@@ -215,16 +301,23 @@ def process_pdf_for_gemini(pdf_path: str) -> Optional[Dict[str, str]]:
 
     try:
         doc = fitz.open(pdf_path)
-        text_content = ""
-        for page_num, page in enumerate(doc):
-            try:
-                page_text = page.get_text()
-                if page_text:
-                    text_content += page_text
-            except Exception as page_e:
-                logger.warning(f"Error extracting text from page {page_num + 1} of {pdf_path}: {page_e}")
-                text_content += f"\n[Error extracting page {page_num + 1}]\n"
-        doc.close()
+        page_count = len(doc)
+        # Inside a worker process (e.g. the inference document pool) the CPUs are already
+        # busy, so the PDF is extracted in place rather than fanned out to a nested pool
+        workers = 1
+        if multiprocessing.parent_process() is None:
+            workers = min(os.cpu_count() or 1, page_count // PDF_PAGES_PER_WORKER)
+        if workers > 1:
+            # PyMuPDF documents cannot be shared between threads, so large PDFs are split
+            # into page ranges that worker processes open and extract independently
+            doc.close()
+            bounds = [page_count * i // workers for i in range(workers + 1)]
+            text_content = "".join(_PDF_TEXT_POOL.map(
+                _extract_page_range, [pdf_path] * workers, bounds[:-1], bounds[1:]
+            ))
+        else:
+            text_content = _extract_pages(doc, pdf_path, 0, page_count)
+            doc.close()
 
         processed_text = text_content.strip()
         if not processed_text:
@@ -249,9 +342,7 @@ def process_docx(docx_path: str) -> Optional[Dict[str, str]]:
     Returns:
         A dictionary with the extracted text.
     """
-    try:
-        import docx
-    except ImportError:
+    if docx is None:
         logger.error("python-docx is not installed. Cannot process DOCX files. Run 'pip install python-docx'")
         return None
 
@@ -261,8 +352,8 @@ def process_docx(docx_path: str) -> Optional[Dict[str, str]]:
 
     try:
         doc = docx.Document(docx_path)
-        full_text = [para.text for para in doc.paragraphs]
-        text_content = "\n\n".join(p for p in full_text if p.strip())
+        # Skip empty and whitespace-only paragraphs in the same pass as the join
+        text_content = "\n\n".join(t for t in (para.text for para in doc.paragraphs) if t and not t.isspace())
         processed_text = text_content.strip()
         if not processed_text:
             logger.warning(f"No text extracted from DOCX: {docx_path}")
@@ -290,10 +381,10 @@ def process_txt(txt_path: str) -> Optional[Dict[str, str]]:
         return None
 
     try:
-        with open(txt_path, 'r', encoding='utf-8', errors='ignore') as f:
-            text_content = f.read()
+        # Text mode keeps universal newline translation, so CRLF files reach Gemini as LF
+        with open(txt_path, 'r', encoding='utf-8', errors='ignore', newline=None) as f:
+            processed_text = f.read().strip()
 
-        processed_text = text_content.strip()
         if not processed_text:
             logger.warning(f"No text extracted from TXT: {txt_path}")
             return None
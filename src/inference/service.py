@@ -1,20 +1,28 @@
 """
 Inference service for the application.
 """
+import asyncio
 import base64
 import glob
+import json
+import logging
+import multiprocessing
 import os
 import shutil
 import tempfile
+import threading
 import time
-from pathlib import Path
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
+import aiofiles
 import requests
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob.aio import BlobServiceClient, ContainerClient
 
-from src.core.config import UPLOAD_DIR
+from src.core.config import UPLOAD_DIR, AZURE_CONNECTION_STRING, AZURE_CONTAINER_NAME
 from src.core.logging_config import get_logger
-from src.db.repositories.case_repository import CaseRepository
+from src.db.repositories.case_repository import CaseRepository, get_case_repository
 from src.inference.exceptions import InferenceError, APIRateLimitError, APIError
 from src.inference.loader import model_loader
 from src.inference.models.gemini_model import GeminiModel
@@ -24,6 +32,161 @@ from src.utils.file_helpers import upload_to_azure
 
 logger = get_logger(__name__)
 
+# Maximum number of case documents downloaded from Azure at the same time
+BLOB_DOWNLOAD_CONCURRENCY = 16
+
+# Parallel range requests the Azure SDK may use for a single large blob
+BLOB_RANGE_CONCURRENCY = 4
+
+# Maximum number of document batches sent to Gemini at the same time for one section
+GEMINI_BATCH_CONCURRENCY = 8
+
+# Gemini model used for batch analysis and synthesis unless a caller picks another
+ANALYSIS_MODEL = "gemini-2.5-flash-preview-04-17"
+
+# Worker processes for CPU-bound document text extraction; spawned rather than forked because
+# the server is threaded. Each worker extracts large PDFs in place instead of splitting them
+# across a nested pool, so at most cpu_count processes run
+_DOCUMENT_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                     mp_context=multiprocessing.get_context("spawn"))
+
+# Prompt that merges the per-batch analyses of a section into one
+_SYNTHESIS_TEMPLATE = """{failure_warning}You are provided with analyses generated from different text batches. Some batches may contain errors or no relevant information for the requested section. Your task is to synthesize the information from the *successful and relevant* batches.
+
+                Focus on the section: '{section}'
+
+                Special Handling for 'Background Information' section:
+                - If the requested `{section}` is 'Background Information', first meticulously scan all `Collected Batches` for any content explicitly labeled or clearly identifiable as 'Findings' (or similar terms like 'Key Observations', 'Conclusions' from the batch analysis related to the background).
+                - If such 'Findings' exist, synthesize them into a dedicated 'Findings' subsection. This 'Findings' subsection should be placed *immediately before* the 'Background Information' content in your final output.
+                - Then, proceed to synthesize the 'Background Information' content itself from all relevant batches.
+
+                Instructions for Synthesizing '{section}':
+                1.  **Comprehensive Synthesis:** Your primary goal is to create a coherent, consolidated report for the specified `{section}`. Ensure you carefully review and incorporate relevant information from *all* `Collected Batches` that are not explicit error messages and contain data for the `{section}`. Do not arbitrarily omit information from a successful batch.
+                2.  **Error Handling:** If some batches explicitly state an error (e.g., "ERROR: Could not process batch"), do not mention these errors or the failed batches in your final report. Only synthesize content from successfully processed batches.
+                3.  **De-duplication and Conflict Resolution:**
+                    *   **Omit Repetition:** Aggressively remove redundant information. If multiple batches state the same fact, include it only once.
+                    *   **Avoid Paraphrasing as Distinct Points:** Do not list slightly reworded versions of the same underlying fact or concept as separate bullet points. Strive to capture the core idea once. For example, if one batch says "The pathway was icy" and another says "Ice covered the walkway," these should be consolidated into a single point like "The pathway/walkway was icy."
+                    *   **Handle Contradictions:** If there's a direct contradiction you cannot resolve, briefly note the conflicting information (e.g., "Batch A reports X, while Batch B reports Y regarding [topic]."). Avoid this if possible by finding a commonality or more general statement.
+                4.  **Formatting and Cleanliness:**
+                    *   **No Markers/Metadata:** Do not include '--- ANALYSIS FROM BATCH...' markers, batch numbers, or any error messages themselves in the final output.
+                    *   **Formal Start:** Begin the final output directly with the synthesized content for `{section}`. Avoid introductory phrases like "Here is the analysis..." or other extraneous text.
+                    *   **Markdown Usage:** Use only the following Markdown:
+                        *   `**Subheading**` for subheadings (e.g., `**Findings**`, `**Background Information**`).
+                        *   `*` for bullet points.
+                        *   A single `\n` for a new line between distinct pieces of information or after a subheading.
+                        *   Do NOT use any other Markdown like font tags (`<font>`), bolding individual words within sentences unless grammatically essential, or HTML.
+                5.  **Content Relevance:**
+                    *   **No Empty Sections:** If, after reviewing all batches, no information is found for the requested `{section}`, output nothing or a pre-defined "No information available for this section." message (you'll need to decide how to handle this in your application logic if the LLM outputs nothing).
+                    *   **Concise Summaries for Reports:** If the input batches contain user-provided reports (e.g., weather reports, incident reports), generate a concise overall summary highlighting key findings or conditions pertinent to `{section}`. Do not provide a granular, step-by-step, or day-by-day breakdown unless specifically asked for by the nature of `{section}`.
+                6.  **Factually Distinct Bullet Points:** Each bullet point in your final output must represent a *semantically unique* piece of information, condition, or factor. If multiple aspects relate to a single core issue (e.g., various failures in snow/ice management), present them as distinct facets *only if they represent different types of actions, inactions, or observations*. For instance:
+                    *   *Good (distinct)*:
+                        *   Snow and ice were present on the sidewalk.
+                        *   The property owner failed to clear the snow and ice.
+                        *   No salt or sand had been applied to the icy sidewalk.
+                    *   *Bad (paraphrasing/too granular if not distinct actions/observations)*:
+                        *   The sidewalk had snow on it.
+                        *   Ice was observed under the snow.
+                        *   The concrete surface was slippery due to frozen precipitation.
+                    Critically evaluate if points can be combined into a more comprehensive statement without losing distinct factual elements.
+
+                Collected Batches:
+                {combined_text}
+
+            """
+
+# Instructions that combine several section prompts into one request on a document batch
+_MULTI_SECTION_TEMPLATE = """Using the documents above, write each of the following sections: {section_names}.
+Follow the instructions given for each section below.
+
+{section_instructions}
+
+Respond with only a JSON object that maps each section name, exactly as listed above, to the Markdown text of that section."""
+
+# Prompt document fields that are not prompt sections; case_type is still needed for matching
+PROMPT_PROJECTION = {"_id": 0, "description": 0, "prompt_id": 0, "id": 0}
+
+# Seconds a loaded prompt dictionary is reused before it is read from MongoDB again
+PROMPT_CACHE_TTL = 300
+
+# Loaded prompt dictionaries by case type, with the monotonic time they were loaded
+_PROMPT_CACHE: Dict[str, Tuple[float, Dict[str, str]]] = {}
+_PROMPT_CACHE_LOCK = threading.Lock()
+
+# Prompt document fields that are not sections
+_NON_SECTION_FIELDS = frozenset({"_id", "case_type", "description", "prompt_id", "id"})
+
+# Prompt documents fetched per round trip, enough for a prompt collection to arrive in one batch
+PROMPT_BATCH_SIZE = 500
+
+# Text extractor for each supported document extension; the order is the order of the batches
+_DOCUMENT_PROCESSORS = {
+    ".pdf": process_pdf_for_gemini,
+    ".docx": process_docx,
+    ".txt": process_txt
+}
+_DOCUMENT_ORDER = {extension: i for i, extension in enumerate(_DOCUMENT_PROCESSORS)}
+
+# Shared async Azure client for case document downloads and the event loop it belongs to;
+# reusing it keeps connections and credentials warm between requests
+_blob_service_client: Optional[BlobServiceClient] = None
+_blob_service_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_container_client() -> ContainerClient:
+    """
+    Get a client for the case document container, creating the shared Azure client
+    on first use in the running event loop.
+
+    Returns:
+        The async container client.
+    """
+    global _blob_service_client, _blob_service_client_loop
+    loop = asyncio.get_running_loop()
+    if _blob_service_client is None or _blob_service_client_loop is not loop:
+        _blob_service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
+        _blob_service_client_loop = loop
+    return _blob_service_client.get_container_client(AZURE_CONTAINER_NAME)
+
+async def close_blob_service_client() -> None:
+    """
+    Close the shared Azure client, if one was opened.
+    """
+    global _blob_service_client, _blob_service_client_loop
+    if _blob_service_client is not None:
+        await _blob_service_client.close()
+    _blob_service_client = None
+    _blob_service_client_loop = None
+
+# Set once the prompt collection has been described in the debug log
+_schema_logged = False
+_schema_logged_lock = threading.Lock()
+
+def _ensure_schema_logged(prompts_collection) -> None:
+    """
+    Describe the system prompt collection in the debug log, once per process.
+
+    Nothing is queried unless DEBUG logging is enabled.
+
+    Args:
+        prompts_collection: The system prompt collection.
+    """
+    global _schema_logged
+    if _schema_logged or not logger.isEnabledFor(logging.DEBUG):
+        return
+
+    with _schema_logged_lock:
+        if _schema_logged:
+            return
+        _schema_logged = True
+        try:
+            logger.debug(f"Loading prompts from collection: {prompts_collection.name} in database: {prompts_collection.database.name}")
+            logger.debug(f"Found {prompts_collection.count_documents({})} documents in system_prompts collection")
+            sample = prompts_collection.find_one({})
+            if sample:
+                logger.debug(f"Prompt document structure: {list(sample.keys())}")
+                logger.debug(f"Prompt document case_type: {sample.get('case_type', 'Not specified')}")
+        except Exception as e:
+            logger.debug(f"Could not describe the system prompt collection: {e}")
+
 # The generate_embeddings function has been removed as it's no longer needed with the Gemini approach
 
 class InferenceService:
@@ -31,21 +194,61 @@ class InferenceService:
     Inference service for the application.
     """
 
-    def __init__(self, case_id: str, case_type: str = "case_type_1"):
+    def __init__(self, case_id: str, case_type: str = "case_type_1",
+                 case_repo: Optional[CaseRepository] = None):
         """
         Initialize the inference service.
 
         Args:
             case_id: The case ID.
             case_type: The case type.
+            case_repo: The case repository; defaults to the process-wide one.
         """
         self.case_id = case_id
         self.case_type = case_type
         self.temp_dir = None
-        self.case_repo = CaseRepository()
+        self.case_repo = case_repo if case_repo is not None else get_case_repository()
+        self.model_name = ANALYSIS_MODEL
 
         # Load system prompts
-        self.system_prompts = self.load_system_prompts()
+        self.system_prompts = self._get_system_prompts()
+
+        # Resolved prompt lookups by section, valid for the prompt dictionary they were made from
+        self._prompt_index: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._prompt_index_source: Optional[Dict[str, str]] = None
+
+    def _get_system_prompts(self) -> Dict[str, str]:
+        """
+        Get the system prompts for this case type, loading them only when the cached copy has expired.
+
+        The returned dictionary is shared between instances and must not be modified.
+
+        Returns:
+            A dictionary of system prompts.
+        """
+        entry = _PROMPT_CACHE.get(self.case_type)
+        if entry is not None and time.monotonic() - entry[0] < PROMPT_CACHE_TTL:
+            return entry[1]
+
+        # One load per case type on a cold start; requests that arrive meanwhile wait for it
+        with _PROMPT_CACHE_LOCK:
+            entry = _PROMPT_CACHE.get(self.case_type)
+            if entry is not None and time.monotonic() - entry[0] < PROMPT_CACHE_TTL:
+                return entry[1]
+
+            prompts = self.load_system_prompts()
+            # An empty result means loading failed or there are no prompts yet; retry next time
+            if prompts:
+                _PROMPT_CACHE[self.case_type] = (time.monotonic(), prompts)
+            return prompts
+
+    @classmethod
+    def invalidate_prompts(cls) -> None:
+        """
+        Drop the cached system prompts so the next service instance reads them from MongoDB.
+        """
+        with _PROMPT_CACHE_LOCK:
+            _PROMPT_CACHE.clear()
 
     def load_system_prompts(self) -> Dict[str, str]:
         """
@@ -58,23 +261,12 @@ class InferenceService:
             # Try to load from database
             prompts_collection = self.case_repo.db["system_prompts"]
 
-            # Log the collection name and database to help with debugging
-            logger.info(f"Attempting to load prompts from collection: {prompts_collection.name} in database: {self.case_repo.db.name}")
+            _ensure_schema_logged(prompts_collection)
 
-            # Count documents to verify collection has data
-            count = prompts_collection.count_documents({})
-            logger.info(f"Found {count} documents in system_prompts collection")
-
-            # Try a direct query for a specific document to verify we can access the collection
-            test_doc = prompts_collection.find_one({})
-            if test_doc:
-                logger.info(f"Successfully retrieved a test document with keys: {list(test_doc.keys())}")
-            else:
-                logger.warning("Could not retrieve a test document from the collection")
-                return {}
-
-            # Get all prompts
-            prompts = list(prompts_collection.find())
+            # Get all prompts in one query, without the fields that never become prompts
+            prompts = list(
+                prompts_collection.find({}, projection=PROMPT_PROJECTION).batch_size(PROMPT_BATCH_SIZE)
+            )
             logger.info(f"Retrieved {len(prompts)} documents from system_prompts collection")
 
             if not prompts:
@@ -84,77 +276,71 @@ class InferenceService:
             # Format as a dictionary with section as key and prompt text as value
             result = {}
 
-            # Log the structure of the first prompt to help with debugging
-            if prompts and len(prompts) > 0:
-                logger.info(f"First prompt structure: {list(prompts[0].keys())}")
-                logger.info(f"First prompt case_type: {prompts[0].get('case_type', 'Not specified')}")
-
-            # Create a mapping of case types for fuzzy matching
-            case_type_mapping = {}
-            for prompt in prompts:
-                case_type = prompt.get("case_type", "")
-                if case_type:
-                    case_type_mapping[case_type.lower()] = case_type
-
-            logger.info(f"Available case types in MongoDB: {list(case_type_mapping.keys())}")
-
-            # Find the best match for the current case type
+            # Find the best match for the current case type in one pass over the prompts:
+            # an exact case-insensitive match wins, otherwise the first case type that contains
+            # or is contained in the current one. Later spellings of the same case type win.
             best_match = None
             if self.case_type:
                 current_case_type_lower = self.case_type.lower()
-                # Exact match
-                if current_case_type_lower in case_type_mapping:
-                    best_match = case_type_mapping[current_case_type_lower]
+                exact_match = partial_match = partial_match_lower = None
+                for prompt in prompts:
+                    case_type = prompt.get("case_type", "")
+                    if not case_type:
+                        continue
+                    case_type_lower = case_type.lower()
+                    if case_type_lower == current_case_type_lower:
+                        exact_match = case_type
+                    elif partial_match_lower is None and (case_type_lower in current_case_type_lower
+                                                          or current_case_type_lower in case_type_lower):
+                        partial_match_lower = case_type_lower
+                    if case_type_lower == partial_match_lower:
+                        partial_match = case_type
+
+                if exact_match:
+                    best_match = exact_match
                     logger.info(f"Found exact case type match: {best_match}")
-                # Partial match
-                else:
-                    for db_case_type_lower, original_case_type in case_type_mapping.items():
-                        # Check if the current case type contains the DB case type or vice versa
-                        if db_case_type_lower in current_case_type_lower or current_case_type_lower in db_case_type_lower:
-                            best_match = original_case_type
-                            logger.info(f"Found partial case type match: '{self.case_type}' matches with '{best_match}'")
-                            break
+                elif partial_match:
+                    best_match = partial_match
+                    logger.info(f"Found partial case type match: '{self.case_type}' matches with '{best_match}'")
+
+            debug = logger.isEnabledFor(logging.DEBUG)
+            case_suffix = f"_{self.case_type}"
 
             for prompt in prompts:
                 try:
                     # Get the case type from the document
                     case_type = prompt.get("case_type", "")
-                    logger.info(f"Processing prompt with case_type: {case_type}")
+                    is_best_match = bool(case_type and best_match and case_type == best_match)
+                    if debug:
+                        logger.debug(f"Processing prompt with case_type: {case_type}")
 
-                    # Process each field that could be a section
-                    for key, value in prompt.items():
-                        # Skip non-section fields
-                        if key in ["_id", "case_type", "description", "prompt_id", "id"]:
+                    # Every field that is not document metadata is a section prompt
+                    for section_key, value in prompt.items():
+                        if section_key in _NON_SECTION_FIELDS:
                             continue
 
-                        # Use the field name as the section key
-                        section_key = key
-
-                        # Log the section key to help with debugging
-                        logger.info(f"Found section key: {section_key} in prompt")
-
                         # If this prompt's case_type matches the best match for the current case_type, add a case-specific key
-                        if case_type and best_match and case_type == best_match:
-                            case_specific_key = f"{section_key}_{self.case_type}"
-                            result[case_specific_key] = value
-                            logger.info(f"Added case-specific prompt for '{case_specific_key}' (matched from '{best_match}')")
+                        if is_best_match:
+                            result[section_key + case_suffix] = value
 
                         # Always add the generic section key
                         # This ensures we have fallback prompts available
                         result[section_key] = value
-                        logger.info(f"Added generic prompt for '{section_key}'")
 
                         # Also add version with spaces instead of underscores
                         if "_" in section_key:
-                            space_key = section_key.replace("_", " ")
-                            result[space_key] = value
-                            logger.info(f"Added prompt with spaces for '{space_key}'")
+                            result[section_key.replace("_", " ")] = value
+
+                        if debug:
+                            logger.debug(f"Added prompts for section '{section_key}'"
+                                         + (f" and case-specific '{section_key}{case_suffix}'" if is_best_match else ""))
                 except Exception as prompt_error:
                     logger.error(f"Error processing prompt: {prompt_error}")
                     continue
 
             logger.info(f"Loaded {len(result)} system prompts from MongoDB")
-            logger.info(f"Available prompt keys: {list(result.keys())}")
+            if debug:
+                logger.debug(f"Available prompt keys: {list(result.keys())}")
             return result
 
         except Exception as e:
@@ -188,10 +374,14 @@ class InferenceService:
         logger.info(f"Found {len(doc_paths)} document paths for case {self.case_id}")
         return doc_paths
 
-    async def download_case_documents(self) -> str:
+    async def download_case_documents(self, queue: Optional[asyncio.Queue] = None) -> str:
         """
         Download documentation files from Azure into a temp directory for processing.
 
+        Args:
+            queue: If given, the local path of each document is put on it as soon as
+                that document has downloaded.
+
         Returns:
             The path to the temporary directory.
         """
@@ -216,67 +406,95 @@ class InferenceService:
             logger.warning(f"No document paths retrieved for case {self.case_id}. No files will be downloaded.")
             return self.temp_dir
 
-        # Get Azure connection from case repository
-        from azure.storage.blob import BlobServiceClient
-        from src.core.config import AZURE_CONNECTION_STRING, AZURE_CONTAINER_NAME
-
         try:
-            blob_service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
-            container_client = blob_service_client.get_container_client(AZURE_CONTAINER_NAME)
+            container_client = _get_container_client()
         except Exception as e:
             logger.error(f"Failed to get Azure container client for '{AZURE_CONTAINER_NAME}': {e}")
             return self.temp_dir
 
-        downloaded_files_count = 0
-        for doc_path in doc_paths:
-            if not doc_path or not isinstance(doc_path, str):
-                logger.warning(f"Skipping invalid document path: {doc_path}")
-                continue
+        # Blobs are independent, so they download concurrently over the client's connection pool
+        semaphore = asyncio.Semaphore(BLOB_DOWNLOAD_CONCURRENCY)
+        results = await asyncio.gather(
+            *(self._download_document(container_client, doc_path, semaphore, queue) for doc_path in doc_paths),
+            return_exceptions=True
+        )
+        downloaded_files_count = sum(1 for result in results if isinstance(result, str))
 
-            normalized_path = doc_path.replace("\\", "/").strip("/")
-            if not normalized_path:
-                logger.warning(f"Skipping empty normalized path derived from: {doc_path}")
-                continue
+        logger.info(f"Downloaded {downloaded_files_count} out of {len(doc_paths)} specified files for case {self.case_id}.")
+        return self.temp_dir
 
-            file_name = os.path.basename(normalized_path)
-            if not file_name:
-                logger.warning(f"Could not determine filename from path: {normalized_path}. Skipping.")
-                continue
+    async def _download_document(self, container_client, doc_path: str,
+                                 semaphore: asyncio.Semaphore,
+                                 queue: Optional[asyncio.Queue] = None) -> Optional[str]:
+        """
+        Download one case document from Azure into the temporary directory.
+
+        Args:
+            container_client: The async Azure container client.
+            doc_path: The blob path of the document.
+            semaphore: Limits how many downloads run at once.
+            queue: If given, the local path is put on it after a successful download.
+
+        Returns:
+            The local path if the document was downloaded and is not empty, None otherwise.
+        """
+        if not doc_path or not isinstance(doc_path, str):
+            logger.warning(f"Skipping invalid document path: {doc_path}")
+            return None
+
+        normalized_path = doc_path.replace("\\", "/").strip("/")
+        if not normalized_path:
+            logger.warning(f"Skipping empty normalized path derived from: {doc_path}")
+            return None
+
+        file_name = os.path.basename(normalized_path)
+        if not file_name:
+            logger.warning(f"Could not determine filename from path: {normalized_path}. Skipping.")
+            return None
 
-            local_file_path = os.path.join(self.temp_dir, file_name)
+        local_file_path = os.path.join(self.temp_dir, file_name)
 
+        async with semaphore:
             try:
                 blob_client = container_client.get_blob_client(blob=normalized_path)
 
-                if not blob_client.exists():
-                    logger.warning(f"Blob not found in Azure: container='{AZURE_CONTAINER_NAME}', blob='{normalized_path}'")
-                    continue
-
-                with open(local_file_path, "wb") as file:
-                    blob_data = blob_client.download_blob()
-                    blob_data.readinto(file)
+                # Chunks are written as they arrive; large blobs are fetched as parallel range requests
+                blob_data = await blob_client.download_blob(max_concurrency=BLOB_RANGE_CONCURRENCY)
+                async with aiofiles.open(local_file_path, "wb") as file:
+                    async for chunk in blob_data.chunks():
+                        await file.write(chunk)
 
                 if os.path.exists(local_file_path) and os.path.getsize(local_file_path) > 0:
                     logger.info(f"Successfully downloaded: {normalized_path} -> {local_file_path}")
-                    downloaded_files_count += 1
+                    downloaded = True
                 else:
                     logger.warning(f"Downloaded file is missing or empty: {local_file_path}")
+                    downloaded = False
                     if os.path.exists(local_file_path):
                         try:
                             os.remove(local_file_path)
                         except OSError:
                             pass
 
+            except ResourceNotFoundError:
+                # download_blob reports a missing blob itself, so no separate existence check is made
+                logger.warning(f"Blob not found in Azure: container='{container_client.container_name}', blob='{normalized_path}'")
+                return None
             except Exception as e:
                 logger.error(f"Error downloading Azure blob '{normalized_path}': {str(e)}")
+                downloaded = False
                 if os.path.exists(local_file_path):
                     try:
                         os.remove(local_file_path)
                     except OSError:
                         pass
 
-        logger.info(f"Downloaded {downloaded_files_count} out of {len(doc_paths)} specified files for case {self.case_id}.")
-        return self.temp_dir
+        if not downloaded:
+            return None
+        # Hand the file on to the extraction workers, which start on it while other downloads continue
+        if queue is not None:
+            queue.put_nowait(local_file_path)
+        return local_file_path
 
     def get_file_list(self, directory: str) -> tuple:
         """
@@ -293,10 +511,14 @@ class InferenceService:
             return [], [], []
 
         try:
-            p = Path(directory)
-            pdf_files = [str(f) for f in p.glob("*.pdf")]
-            docx_files = [str(f) for f in p.glob("*.docx")]
-            txt_files = [str(f) for f in p.glob("*.txt")]
+            # One directory scan sorts every file into its extension's list
+            files = {extension: [] for extension in _DOCUMENT_PROCESSORS}
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    matching = files.get(os.path.splitext(entry.name)[1])
+                    if matching is not None and entry.is_file():
+                        matching.append(entry.path)
+            pdf_files, docx_files, txt_files = files[".pdf"], files[".docx"], files[".txt"]
             logger.info(f"Found {len(pdf_files)} PDF, {len(docx_files)} DOCX, {len(txt_files)} TXT files in {directory}")
             return pdf_files, docx_files, txt_files
         except Exception as e:
@@ -313,34 +535,37 @@ class InferenceService:
         Returns:
             A list of batches, where each batch is a list of document contents.
         """
-        all_content = []
         temp_documents_dir = None
 
         try:
-            temp_documents_dir = await self.download_case_documents()
+            # Documents are extracted while the rest are still downloading: the download
+            # puts each finished file on the queue and the workers below take them off
+            queue = asyncio.Queue()
+            contents = {}
+            workers = [
+                asyncio.create_task(self._process_downloaded_documents(queue, contents))
+                for _ in range(os.cpu_count() or 1)
+            ]
+            try:
+                temp_documents_dir = await self.download_case_documents(queue)
+                for _ in workers:
+                    queue.put_nowait(None)
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+
             if not temp_documents_dir or not os.path.exists(temp_documents_dir):
                 logger.warning(f"Could not download or access docs directory for case {self.case_id}.")
                 return []
 
-            pdf_files, docx_files, txt_files = self.get_file_list(temp_documents_dir)
-            if not pdf_files and not docx_files and not txt_files:
+            if not contents:
                 logger.warning(f"No PDF, DOCX, or TXT found for case {self.case_id}")
                 return []
 
-            for pdf_file in pdf_files:
-                content = process_pdf_for_gemini(pdf_file)
-                if content:
-                    all_content.append(content)
-
-            for docx_file in docx_files:
-                content = process_docx(docx_file)
-                if content:
-                    all_content.append(content)
-
-            for txt_file in txt_files:
-                content = process_txt(txt_file)
-                if content:
-                    all_content.append(content)
+            # PDFs first, then DOCX, then TXT, as the batches were built before
+            ordered_paths = sorted(contents, key=lambda path: (_DOCUMENT_ORDER[os.path.splitext(path)[1]], path))
+            all_content = [contents[path] for path in ordered_paths if contents[path]]
 
             if not all_content:
                 logger.warning(f"No textual content extracted for case {self.case_id}.")
@@ -353,6 +578,32 @@ class InferenceService:
             logger.error(f"Error processing documents for case {self.case_id}: {e}", exc_info=True)
             raise
 
+    async def _process_downloaded_documents(self, queue: asyncio.Queue, contents: Dict[str, Any]) -> None:
+        """
+        Extract the text of downloaded documents from a queue until a None sentinel arrives.
+
+        Args:
+            queue: The local paths of downloaded documents, followed by None.
+            contents: Receives the extracted content, or None, for each document path.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            file_path = await queue.get()
+            if file_path is None:
+                return
+
+            processor = _DOCUMENT_PROCESSORS.get(os.path.splitext(file_path)[1])
+            # Blobs with the same file name share one local file, which is extracted once
+            if processor is None or file_path in contents:
+                continue
+
+            contents[file_path] = None
+            try:
+                contents[file_path] = await loop.run_in_executor(_DOCUMENT_POOL, processor, file_path)
+            except Exception as e:
+                # One unreadable document must not fail the case; its content stays None
+                logger.error(f"Error extracting text from {file_path}: {e}")
+
     async def create_unified_analysis(
         self,
         section: str,
@@ -373,95 +624,144 @@ class InferenceService:
         Returns:
             The unified analysis text.
         """
+        results = await self.create_unified_analysis_multi([section], batch_size, base_retry_delay, max_retries)
+        return results[section]
+
+    async def create_unified_analysis_multi(
+        self,
+        sections: List[str],
+        batch_size: int = 3,
+        base_retry_delay: int = 5,
+        max_retries: int = 3
+    ) -> Dict[str, str]:
+        """
+        Creates unified analyses for several sections from a single download and
+        processing pass over the case documents.
+
+        Args:
+            sections: The sections to analyze.
+            batch_size: The maximum number of documents per batch.
+            base_retry_delay: The base delay in seconds for retries.
+            max_retries: The maximum number of retries.
+
+        Returns:
+            A dictionary mapping each section to its unified analysis text.
+        """
         try:
             batches = await self.process_documents_in_batches(max_batch_size=batch_size)
             if not batches:
-                return "Error: No documents found or processed successfully for this case."
+                return {section: "Error: No documents found or processed successfully for this case."
+                        for section in sections}
+
+            # Each batch is queried once for all the sections
+            batch_responses = await self._query_batches(batches, sections, base_retry_delay, max_retries)
+
+            results = {}
+            for section in sections:
+                results[section] = await self._synthesize_section(
+                    [responses[section] for responses in batch_responses], section, base_retry_delay, max_retries
+                )
+            return results
+        finally:
+            self.cleanup()
 
-            batch_results = []
-            processing_failed = False
+    async def _query_batches(
+        self,
+        batches: List[List[Dict]],
+        sections: List[str],
+        base_retry_delay: int,
+        max_retries: int
+    ) -> List[Dict[str, str]]:
+        """
+        Queries every document batch for the given sections.
 
-            for i, batch in enumerate(batches):
-                logger.info(f"Processing batch {i + 1} of {len(batches)} for section '{section}' with case_type '{self.case_type}'")
-                response = await self.query_with_batch(batch, section, base_retry_delay, max_retries)
+        Args:
+            batches: The processed document batches.
+            sections: The sections to analyze.
+            base_retry_delay: The base delay in seconds for retries.
+            max_retries: The maximum number of retries.
 
-                if response.startswith("Error:"):
-                    logger.error(f"Batch {i + 1} failed: {response}")
-                    batch_results.append(f"[[ERROR PROCESSING BATCH {i + 1}: {response}]]")
-                    processing_failed = True
-                else:
-                    batch_results.append(response)
+        Returns:
+            For each batch, a dictionary mapping each section to the batch's analysis text.
+        """
+        # Batches are independent, so they are queried concurrently within the Gemini limit
+        semaphore = asyncio.Semaphore(GEMINI_BATCH_CONCURRENCY)
+
+        async def query(i: int, batch: List[Dict]) -> Dict[str, str]:
+            async with semaphore:
+                logger.info(f"Processing batch {i + 1} of {len(batches)} for sections {sections} with case_type '{self.case_type}'")
+                if len(sections) == 1:
+                    return {sections[0]: await self.query_with_batch(batch, sections[0], base_retry_delay, max_retries)}
+                return await self.query_sections_with_batch(batch, sections, base_retry_delay, max_retries)
+
+        responses = await asyncio.gather(*(query(i, batch) for i, batch in enumerate(batches)),
+                                         return_exceptions=True)
+
+        for i, response in enumerate(responses):
+            if isinstance(response, Exception):
+                logger.error(f"Gemini query error: {str(response)}")
+                responses[i] = dict.fromkeys(sections, f"Error: Gemini query failed: {str(response)}")
+        return responses
+
+    async def _synthesize_section(
+        self,
+        batch_responses: List[str],
+        section: str,
+        base_retry_delay: int,
+        max_retries: int
+    ) -> str:
+        """
+        Synthesizes the per-batch analyses of a section into one analysis.
+
+        Args:
+            batch_responses: The analysis text of each batch, in batch order.
+            section: The section being analyzed.
+            base_retry_delay: The base delay in seconds for retries.
+            max_retries: The maximum number of retries.
 
-            if len(batch_results) == 1 and not processing_failed:
-                return batch_results[0]
+        Returns:
+            The unified analysis text.
+        """
+        batch_results = []
+        processing_failed = False
+
+        for i, response in enumerate(batch_responses):
+            if response.startswith("Error:"):
+                logger.error(f"Batch {i + 1} failed: {response}")
+                batch_results.append(f"[[ERROR PROCESSING BATCH {i + 1}: {response}]]")
+                processing_failed = True
+            else:
+                batch_results.append(response)
 
-            combined_text = ""
-            for idx, result in enumerate(batch_results):
-                combined_text += f"--- ANALYSIS FROM BATCH {idx + 1} ---\n{result}\n--- END OF BATCH {idx + 1} ---\n\n"
+        if len(batch_results) == 1 and not processing_failed:
+            return batch_results[0]
 
-            # Get Gemini model
-            model = model_loader.get_model("gemini", "gemini-2.5-flash-preview-04-17")
-
-            failure_warning = ""
-            if processing_failed:
-                failure_warning = "IMPORTANT: Some batches encountered errors, so the final result may be incomplete.\n\n"
-
-            synthesis_prompt = f"""{failure_warning}You are provided with analyses generated from different text batches. Some batches may contain errors or no relevant information for the requested section. Your task is to synthesize the information from the *successful and relevant* batches.
-
-                    Focus on the section: '{section}'
-
-                    Special Handling for 'Background Information' section:
-                    - If the requested `{section}` is 'Background Information', first meticulously scan all `Collected Batches` for any content explicitly labeled or clearly identifiable as 'Findings' (or similar terms like 'Key Observations', 'Conclusions' from the batch analysis related to the background).
-                    - If such 'Findings' exist, synthesize them into a dedicated 'Findings' subsection. This 'Findings' subsection should be placed *immediately before* the 'Background Information' content in your final output.
-                    - Then, proceed to synthesize the 'Background Information' content itself from all relevant batches.
-
-                    Instructions for Synthesizing '{section}':
-                    1.  **Comprehensive Synthesis:** Your primary goal is to create a coherent, consolidated report for the specified `{section}`. Ensure you carefully review and incorporate relevant information from *all* `Collected Batches` that are not explicit error messages and contain data for the `{section}`. Do not arbitrarily omit information from a successful batch.
-                    2.  **Error Handling:** If some batches explicitly state an error (e.g., "ERROR: Could not process batch"), do not mention these errors or the failed batches in your final report. Only synthesize content from successfully processed batches.
-                    3.  **De-duplication and Conflict Resolution:**
-                        *   **Omit Repetition:** Aggressively remove redundant information. If multiple batches state the same fact, include it only once.
-                        *   **Avoid Paraphrasing as Distinct Points:** Do not list slightly reworded versions of the same underlying fact or concept as separate bullet points. Strive to capture the core idea once. For example, if one batch says "The pathway was icy" and another says "Ice covered the walkway," these should be consolidated into a single point like "The pathway/walkway was icy."
-                        *   **Handle Contradictions:** If there's a direct contradiction you cannot resolve, briefly note the conflicting information (e.g., "Batch A reports X, while Batch B reports Y regarding [topic]."). Avoid this if possible by finding a commonality or more general statement.
-                    4.  **Formatting and Cleanliness:**
-                        *   **No Markers/Metadata:** Do not include '--- ANALYSIS FROM BATCH...' markers, batch numbers, or any error messages themselves in the final output.
-                        *   **Formal Start:** Begin the final output directly with the synthesized content for `{section}`. Avoid introductory phrases like "Here is the analysis..." or other extraneous text.
-                        *   **Markdown Usage:** Use only the following Markdown:
-                            *   `**Subheading**` for subheadings (e.g., `**Findings**`, `**Background Information**`).
-                            *   `*` for bullet points.
-                            *   A single `\n` for a new line between distinct pieces of information or after a subheading.
-                            *   Do NOT use any other Markdown like font tags (`<font>`), bolding individual words within sentences unless grammatically essential, or HTML.
-                    5.  **Content Relevance:**
-                        *   **No Empty Sections:** If, after reviewing all batches, no information is found for the requested `{section}`, output nothing or a pre-defined "No information available for this section." message (you'll need to decide how to handle this in your application logic if the LLM outputs nothing).
-                        *   **Concise Summaries for Reports:** If the input batches contain user-provided reports (e.g., weather reports, incident reports), generate a concise overall summary highlighting key findings or conditions pertinent to `{section}`. Do not provide a granular, step-by-step, or day-by-day breakdown unless specifically asked for by the nature of `{section}`.
-                    6.  **Factually Distinct Bullet Points:** Each bullet point in your final output must represent a *semantically unique* piece of information, condition, or factor. If multiple aspects relate to a single core issue (e.g., various failures in snow/ice management), present them as distinct facets *only if they represent different types of actions, inactions, or observations*. For instance:
-                        *   *Good (distinct)*:
-                            *   Snow and ice were present on the sidewalk.
-                            *   The property owner failed to clear the snow and ice.
-                            *   No salt or sand had been applied to the icy sidewalk.
-                        *   *Bad (paraphrasing/too granular if not distinct actions/observations)*:
-                            *   The sidewalk had snow on it.
-                            *   Ice was observed under the snow.
-                            *   The concrete surface was slippery due to frozen precipitation.
-                        Critically evaluate if points can be combined into a more comprehensive statement without losing distinct factual elements.
-
-                    Collected Batches:
-                    {combined_text}
-
-                """
+        combined_text = "".join(
+            f"--- ANALYSIS FROM BATCH {idx + 1} ---\n{result}\n--- END OF BATCH {idx + 1} ---\n\n"
+            for idx, result in enumerate(batch_results)
+        )
 
-            try:
-                unified_response = model.predict(synthesis_prompt, max_retries=max_retries, base_retry_delay=base_retry_delay)
-                return unified_response
-            except APIRateLimitError:
-                return "Error: Could not create unified analysis due to persistent API rate limits."
-            except APIError as e:
-                return f"Error: {str(e)}"
-            except Exception as e:
-                logger.error(f"Final synthesis failed: {str(e)}")
-                return f"Error: An unexpected error occurred during analysis: {str(e)}"
+        # Get Gemini model
+        model = model_loader.get_model("gemini", self.model_name)
 
-        finally:
-            self.cleanup()
+        failure_warning = ""
+        if processing_failed:
+            failure_warning = "IMPORTANT: Some batches encountered errors, so the final result may be incomplete.\n\n"
+
+        synthesis_prompt = _SYNTHESIS_TEMPLATE.format(
+            failure_warning=failure_warning, section=section, combined_text=combined_text
+        )
+
+        try:
+            unified_response = await model.predict_async(synthesis_prompt, max_retries=max_retries, base_retry_delay=base_retry_delay)
+            return unified_response
+        except APIRateLimitError:
+            return "Error: Could not create unified analysis due to persistent API rate limits."
+        except APIError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            logger.error(f"Final synthesis failed: {str(e)}")
+            return f"Error: An unexpected error occurred during analysis: {str(e)}"
 
     async def query_with_batch(
         self,
@@ -485,6 +785,164 @@ class InferenceService:
         if not batch:
             return "Error: Empty batch provided for querying."
 
+        system_prompt_text, error = self._resolve_system_prompt(section)
+        if error:
+            return error
+
+        contents = self._build_contents(batch, system_prompt_text)
+
+        # Get Gemini model
+        model = model_loader.get_model("gemini", self.model_name)
+
+        try:
+            response = await model.predict_async(contents, max_retries=max_retries, base_retry_delay=base_retry_delay)
+            return response
+        except APIRateLimitError:
+            return "Error: Rate limit exceeded after maximum retries."
+        except APIError as e:
+            error_str = str(e)
+            if "Unable to determine the intended type of the `dict`" in error_str:
+                # Handle format error
+                logger.error(f"Format error in batch: {error_str}")
+                # Try to fix the batch format and retry
+                try:
+                    fixed_contents = []
+                    for item in contents:
+                        fixed_contents.append({"text": str(item) if not isinstance(item, dict) or 'text' not in item else item['text']})
+                    logger.info("Attempted to fix batch format, retrying...")
+                    response = await model.predict_async(fixed_contents, max_retries=max_retries, base_retry_delay=base_retry_delay)
+                    return response
+                except Exception as retry_e:
+                    return f"Error: Failed to fix format and retry: {str(retry_e)}"
+            return f"Error: {error_str}"
+        except Exception as e:
+            logger.error(f"Gemini query error: {str(e)}")
+            return f"Error: Gemini query failed: {str(e)}"
+
+    async def query_sections_with_batch(
+        self,
+        batch: List[Dict],
+        sections: List[str],
+        base_retry_delay: int,
+        max_retries: int
+    ) -> Dict[str, str]:
+        """
+        Processes a single document batch for several sections in one Gemini request.
+
+        The section prompts are combined into one request that asks for a JSON object
+        keyed by section. Sections missing from the reply, or whose reply cannot be
+        parsed, are queried on their own with query_with_batch.
+
+        Args:
+            batch: The batch of documents to process.
+            sections: The sections to analyze.
+            base_retry_delay: The base delay in seconds for retries.
+            max_retries: The maximum number of retries.
+
+        Returns:
+            A dictionary mapping each section to its analysis text.
+        """
+        if not batch:
+            return dict.fromkeys(sections, "Error: Empty batch provided for querying.")
+
+        section_prompts = {}
+        for section in sections:
+            system_prompt_text, _ = self._resolve_system_prompt(section)
+            if system_prompt_text:
+                section_prompts[section] = system_prompt_text
+
+        results = {}
+        if len(section_prompts) > 1:
+            instructions = "\n\n".join(
+                f"### Section: {section}\n{prompt_text}" for section, prompt_text in section_prompts.items()
+            )
+            contents = self._build_contents(batch, _MULTI_SECTION_TEMPLATE.format(
+                section_names=json.dumps(list(section_prompts)), section_instructions=instructions
+            ))
+
+            # Get Gemini model
+            model = model_loader.get_model("gemini", self.model_name)
+
+            try:
+                response = await model.predict_async(contents, max_retries=max_retries, base_retry_delay=base_retry_delay)
+                results = self._parse_section_response(response, section_prompts)
+                if len(results) < len(section_prompts):
+                    logger.warning(f"Combined query answered {len(results)} of {len(section_prompts)} sections; querying the rest separately")
+            except APIRateLimitError:
+                # Separate queries would hit the same limit
+                return dict.fromkeys(sections, "Error: Rate limit exceeded after maximum retries.")
+            except Exception as e:
+                logger.error(f"Combined section query failed, querying sections separately: {str(e)}")
+
+        for section in sections:
+            if section not in results:
+                results[section] = await self.query_with_batch(batch, section, base_retry_delay, max_retries)
+        return results
+
+    @staticmethod
+    def _parse_section_response(response_text: str, sections) -> Dict[str, str]:
+        """
+        Parse a combined section reply into the analysis text of each section.
+
+        Args:
+            response_text: The reply, a JSON object mapping section names to text,
+                optionally inside a Markdown code fence.
+            sections: The section names to pick out.
+
+        Returns:
+            A dictionary with the non-empty text of every section found in the reply.
+        """
+        text = response_text.strip()
+        if text.startswith("```"):
+            text = text.partition("\n")[2].rstrip()
+            if text.endswith("```"):
+                text = text[:-3]
+
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+
+        return {
+            section: data[section] for section in sections
+            if isinstance(data.get(section), str) and data[section].strip()
+        }
+
+    def _resolve_system_prompt(self, section: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Find the system prompt for a section, preferring a prompt specific to the case type.
+
+        Every batch of a section needs the same prompt, so each section is looked up
+        once and the result is reused until the prompt dictionary is replaced.
+
+        Args:
+            section: The section to find the prompt for.
+
+        Returns:
+            A tuple of (prompt text, None), or (None, error message) if there is no prompt.
+        """
+        if self._prompt_index_source is not self.system_prompts:
+            self._prompt_index = {}
+            self._prompt_index_source = self.system_prompts
+
+        resolved = self._prompt_index.get(section)
+        if resolved is None:
+            resolved = self._lookup_system_prompt(section)
+            self._prompt_index[section] = resolved
+        return resolved
+
+    def _lookup_system_prompt(self, section: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Search the prompt dictionary for a section's system prompt.
+
+        Args:
+            section: The section to find the prompt for.
+
+        Returns:
+            A tuple of (prompt text, None), or (None, error message) if there is no prompt.
+        """
         # Get system prompt for the section
         system_prompt_text = None
 
@@ -507,8 +965,7 @@ class InferenceService:
                 # Truncate the prompt text if it's too long for logging
                 prompt_preview = system_prompt_text[:100] + "..." if len(system_prompt_text) > 100 else system_prompt_text
                 logger.info(f"Using case-type specific prompt for '{case_specific_key}': '{prompt_preview}'")
-                # Print full prompt for testing
-                print(f"here is the full prompt used for section '{section}' with case_type '{self.case_type}': {system_prompt_text}")
+                logger.debug("Full prompt used for section '%s' with case_type '%s': %s", section, self.case_type, system_prompt_text)
 
         # STEP 2: If no case-specific prompt, try generic section prompt
         if not system_prompt_text:
@@ -519,8 +976,7 @@ class InferenceService:
                 # Truncate the prompt text if it's too long for logging
                 prompt_preview = system_prompt_text[:100] + "..." if len(system_prompt_text) > 100 else system_prompt_text
                 logger.info(f"Using generic prompt for section '{section_normalized}': '{prompt_preview}'")
-                # Print full prompt for testing
-                print(f"here is the full prompt used for section '{section_normalized}': {system_prompt_text}")
+                logger.debug("Full prompt used for section '%s': %s", section_normalized, system_prompt_text)
             else:
                 # Try with spaces
                 system_prompt_text = self.system_prompts.get(section_with_spaces)
@@ -529,85 +985,64 @@ class InferenceService:
                     # Truncate the prompt text if it's too long for logging
                     prompt_preview = system_prompt_text[:100] + "..." if len(system_prompt_text) > 100 else system_prompt_text
                     logger.info(f"Using generic prompt for section '{section_with_spaces}': '{prompt_preview}'")
-                    # Print full prompt for testing
-                    print(f"here is the full prompt used for section '{section_with_spaces}': {system_prompt_text}")
+                    logger.debug("Full prompt used for section '%s': %s", section_with_spaces, system_prompt_text)
 
         # STEP 3: If still no prompt found, try flexible matching
         if not system_prompt_text:
             # If no prompts at all, return error
             if not self.system_prompts:
                 logger.error(f"No system prompts found in MongoDB.")
-                return "Error: Not enough information is provided. No system prompts found in MongoDB."
+                return None, "Error: Not enough information is provided. No system prompts found in MongoDB."
 
             # Log available keys to help with debugging
             available_keys = list(self.system_prompts.keys())
             logger.error(f"No system prompt found for section '{section}'. Available keys: {available_keys}")
 
             # Try a more flexible matching approach
+            section_lower = section.lower()
+            section_normalized_lower = section_normalized.lower()
             for key in available_keys:
                 # Check if the key contains the section name or vice versa
-                if (section.lower() in key.lower() or
-                    key.lower() in section.lower() or
-                    section_normalized.lower() in key.lower() or
-                    key.lower() in section_normalized.lower()):
+                key_lower = key.lower()
+                if (section_lower in key_lower or
+                    key_lower in section_lower or
+                    section_normalized_lower in key_lower or
+                    key_lower in section_normalized_lower):
                     system_prompt_text = self.system_prompts.get(key)
                     # Truncate the prompt text if it's too long for logging
                     prompt_preview = system_prompt_text[:100] + "..." if len(system_prompt_text) > 100 else system_prompt_text
                     logger.info(f"Found matching prompt using flexible matching: '{key}' with content: '{prompt_preview}'")
-                    # Print full prompt for testing
-                    print(f"here is the full prompt used for flexible matching with key '{key}': {system_prompt_text}")
+                    logger.debug("Full prompt used for flexible matching with key '%s': %s", key, system_prompt_text)
                     break
 
             if not system_prompt_text:
                 logger.error(f"No system prompt found for section '{section}' after trying all matching methods.")
-                return f"Error: Not enough information is provided. No system prompt found for section '{section}'."
-
-        # Add system prompt to batch
-        system_prompt = {"text": system_prompt_text}
-        contents = batch + [system_prompt]
-
-        # Validate batch format for Gemini API
-        for i, item in enumerate(contents):
-            # Ensure each item has only the 'text' key
-            if not isinstance(item, dict) or 'text' not in item or len(item) != 1:
-                logger.warning(f"Invalid item format at index {i}: {item}")
-                # Fix the item format
-                if isinstance(item, dict) and 'text' in item:
-                    # Keep only the 'text' key
-                    contents[i] = {"text": item['text']}
-                    logger.info(f"Fixed item format at index {i}")
-                else:
-                    logger.error(f"Cannot fix item format at index {i}, removing from batch")
-                    # Remove the item if it can't be fixed
-                    contents.pop(i)
+                return None, f"Error: Not enough information is provided. No system prompt found for section '{section}'."
 
-        # Get Gemini model
-        model = model_loader.get_model("gemini", "gemini-2.5-flash-preview-04-17")
+        return system_prompt_text, None
 
-        try:
-            response = model.predict(contents, max_retries=max_retries, base_retry_delay=base_retry_delay)
-            return response
-        except APIRateLimitError:
-            return "Error: Rate limit exceeded after maximum retries."
-        except APIError as e:
-            error_str = str(e)
-            if "Unable to determine the intended type of the `dict`" in error_str:
-                # Handle format error
-                logger.error(f"Format error in batch: {error_str}")
-                # Try to fix the batch format and retry
-                try:
-                    fixed_contents = []
-                    for item in contents:
-                        fixed_contents.append({"text": str(item) if not isinstance(item, dict) or 'text' not in item else item['text']})
-                    logger.info("Attempted to fix batch format, retrying...")
-                    response = model.predict(fixed_contents, max_retries=max_retries, base_retry_delay=base_retry_delay)
-                    return response
-                except Exception as retry_e:
-                    return f"Error: Failed to fix format and retry: {str(retry_e)}"
-            return f"Error: {error_str}"
-        except Exception as e:
-            logger.error(f"Gemini query error: {str(e)}")
-            return f"Error: Gemini query failed: {str(e)}"
+    @staticmethod
+    def _build_contents(batch: List[Dict], system_prompt_text: str) -> List[Dict]:
+        """
+        Append a system prompt to a document batch, fixing items Gemini would reject.
+
+        Args:
+            batch: The batch of documents.
+            system_prompt_text: The system prompt to append.
+
+        Returns:
+            The contents to send to Gemini.
+        """
+        # Rebuild the batch plus the system prompt as text-only parts for the Gemini API;
+        # extra keys are dropped and items without text are left out
+        contents = []
+        for i, item in enumerate(batch + [{"text": system_prompt_text}]):
+            if isinstance(item, dict) and "text" in item:
+                contents.append({"text": item["text"]})
+            else:
+                logger.error(f"Cannot fix item format at index {i}, removing from batch")
+
+        return contents
 
     async def get_base64_images_for_section(self, section: str) -> List[Dict[str, Any]]:
         """
@@ -802,50 +1237,52 @@ class InferenceService:
 
             # Process exhibit PDFs
             exhibit_pdfs = exhibits.get("pdfs", [])
-            for pdf_meta in exhibit_pdfs:
-                azure_url = pdf_meta.get("azure_url")
-                description = pdf_meta.get("description", f"Exhibit {exhibit_count}")
-
-                if not azure_url:
-                    logger.warning(f"Skipping exhibit PDF (no azure_url): {description} in case '{self.case_id}'")
-                    continue
-
-                try:
-                    # Convert PDF to images
-                    pdf_images = await convert_pdf_to_images(azure_url, description)
-
-                    # Add exhibit number to each page
-                    for img in pdf_images:
-                        img["exhibit_number"] = exhibit_count
-
-                    # Add the exhibit name to the list (only once per PDF)
-                    if pdf_images:
-                        # Check if description already contains "Exhibit" to avoid duplication
-                        if "Exhibit" in description:
-                            # Use the description as is
-                            pdf_description = description
-                        else:
-                            # Add "Exhibit" prefix
-                            pdf_description = f"Exhibit {exhibit_count}: {description}"
-
-                        # Extract the base name without page numbers or other indicators
-                        base_name = pdf_description
-                        if " (" in base_name and ")" in base_name:
-                            base_name = base_name.split(" (")[0]
-
-                        # Only add if not already in the list
-                        if base_name not in exhibit_names:
-                            exhibit_names.append(base_name)
-
-                    # Add all pages to the result
-                    base64_images.extend(pdf_images)
-
-                    # Increment exhibit counter only once per PDF
-                    if pdf_images:
-                        exhibit_count += 1
+            # One scratch directory serves every PDF download of this request
+            with tempfile.TemporaryDirectory() as pdf_temp_root:
+                for pdf_meta in exhibit_pdfs:
+                    azure_url = pdf_meta.get("azure_url")
+                    description = pdf_meta.get("description", f"Exhibit {exhibit_count}")
+
+                    if not azure_url:
+                        logger.warning(f"Skipping exhibit PDF (no azure_url): {description} in case '{self.case_id}'")
+                        continue
 
-                except Exception as e:
-                    logger.error(f"Error processing exhibit PDF {description} from {azure_url}: {e}")
+                    try:
+                        # Convert PDF to images
+                        pdf_images = await convert_pdf_to_images(azure_url, description, temp_root=pdf_temp_root)
+
+                        # Add exhibit number to each page
+                        for img in pdf_images:
+                            img["exhibit_number"] = exhibit_count
+
+                        # Add the exhibit name to the list (only once per PDF)
+                        if pdf_images:
+                            # Check if description already contains "Exhibit" to avoid duplication
+                            if "Exhibit" in description:
+                                # Use the description as is
+                                pdf_description = description
+                            else:
+                                # Add "Exhibit" prefix
+                                pdf_description = f"Exhibit {exhibit_count}: {description}"
+
+                            # Extract the base name without page numbers or other indicators
+                            base_name = pdf_description
+                            if " (" in base_name and ")" in base_name:
+                                base_name = base_name.split(" (")[0]
+
+                            # Only add if not already in the list
+                            if base_name not in exhibit_names:
+                                exhibit_names.append(base_name)
+
+                        # Add all pages to the result
+                        base64_images.extend(pdf_images)
+
+                        # Increment exhibit counter only once per PDF
+                        if pdf_images:
+                            exhibit_count += 1
+
+                    except Exception as e:
+                        logger.error(f"Error processing exhibit PDF {description} from {azure_url}: {e}")
 
             # Sort by exhibit number
             base64_images.sort(key=lambda x: (x.get("exhibit_number", 999), x.get("page_number", 0)))
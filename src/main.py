@@ -113,6 +113,14 @@ async def shutdown_event():
     from src.inference.loader import model_loader
     model_loader.unload_all_models()
 
+    # Close the shared HTTP session used for PDF downloads
+    from src.inference.postprocessing import close_http_session
+    await close_http_session()
+
+    # Close the shared Azure client used for case document downloads
+    from src.inference.service import close_blob_service_client
+    await close_blob_service_client()
+
     logger.info("Application shutdown complete")
 
 # Mount the Socket.IO app
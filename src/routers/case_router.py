@@ -120,7 +120,7 @@ async def convert_pdf_to_images(pdf_url: str, description: str) -> List[dict]:
                 for i, img in enumerate(pdf_images):
                     # Save the image to a bytes buffer
                     img_buffer = io.BytesIO()
-                    img.save(img_buffer, format="PNG")
+                    img.save(img_buffer, format="PNG", compress_level=1, optimize=False)
                     img_buffer.seek(0)
 
                     # Encode the image to base64
@@ -5,10 +5,12 @@ import os
 import shutil
 import base64
 import tempfile
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import uuid
 
+import aiofiles
 from fastapi import UploadFile
 from azure.storage.blob import BlobServiceClient, BlobSasPermissions, generate_blob_sas
 from datetime import datetime, timedelta
@@ -18,10 +20,15 @@ from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Size of the chunks read from an upload and written to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 async def save_uploaded_file(file: UploadFile, file_path: str) -> bool:
     """
     Save an uploaded file to the specified path.
 
+    The upload is streamed to disk in chunks without blocking the event loop.
+
     Args:
         file: The uploaded file.
         file_path: The path to save the file to.
@@ -30,14 +37,17 @@ async def save_uploaded_file(file: UploadFile, file_path: str) -> bool:
         True if the file was saved successfully, False otherwise.
     """
     try:
-        content = await file.read()
-        if len(content) == 0:
+        size = 0
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
+                size += len(chunk)
+
+        if size == 0:
             logger.warning(f"File {file.filename} is empty")
+            os.remove(file_path)
             return False
 
-        with open(file_path, "wb") as f:
-            f.write(content)
-
         logger.info(f"Saved file to {file_path}")
 
         # Verify the file exists and has content
@@ -332,4 +342,21 @@ def upload_base64_image_to_azure(case_id: str, section: str, base64_content: str
             "section": section,
             "azure_url": "",
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+def discard_directory(path: str) -> None:
+    """
+    Rename a directory out of the way and delete it in the background.
+
+    The rename is atomic and returns immediately, so callers do not block on
+    unlinking files. The deletion runs on a daemon thread, which interpreter
+    exit does not wait for; when no thread can be started (e.g. __del__
+    during shutdown) the directory is deleted synchronously instead.
+    """
+    trash_path = f"{path}.trash.{uuid.uuid4().hex}"
+    os.rename(path, trash_path)
+    try:
+        threading.Thread(target=shutil.rmtree, args=(trash_path,), kwargs={"ignore_errors": True},
+                         name="temp-dir-janitor", daemon=True).start()
+    except RuntimeError:
+        shutil.rmtree(trash_path, ignore_errors=True)
@@ -0,0 +1,81 @@
+"""
+Tests for the Gemini case handler.
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.controller import gemini_case_handler
+from src.controller.gemini_case_handler import GeminiHandler
+
+@pytest.fixture
+def handler():
+    """
+    Fixture for a Gemini handler that skips the Gemini, MongoDB and Azure setup.
+    """
+    handler = GeminiHandler.__new__(GeminiHandler)
+    handler.case_id = "test_case_123"
+    handler.case_type = "case_type_1"
+    handler.model_name = "test-model"
+    handler.temp_dir = None
+    handler.system_prompts = {"Background Information": "Test prompt for background"}
+    return handler
+
+def test_query_with_batch_skips_short_batch(handler):
+    """
+    Test that a batch with less text than MIN_BATCH_CHARS is answered without calling Gemini.
+    """
+    batch = [{"text": "  short \n text  "}, {"text": ""}]
+
+    with patch.object(gemini_case_handler, "MIN_BATCH_CHARS", 200), \
+            patch("src.controller.gemini_case_handler.genai") as mock_genai:
+        response = handler.query_with_batch(batch, "Background Information", 0, 1)
+
+    assert response == "No substantive content in batch for Background Information."
+    mock_genai.GenerativeModel.assert_not_called()
+
+def test_query_with_batch_counts_only_non_whitespace(handler):
+    """
+    Test that a batch reaching MIN_BATCH_CHARS without whitespace is sent to Gemini.
+    """
+    batch = [{"text": "a b c"}, {"text": "d\ne"}]
+    mock_model = MagicMock()
+    mock_model.generate_content.return_value = MagicMock(prompt_feedback=None, text="Analysis")
+
+    with patch.object(gemini_case_handler, "MIN_BATCH_CHARS", 5), \
+            patch("src.controller.gemini_case_handler.genai") as mock_genai:
+        mock_genai.GenerativeModel.return_value = mock_model
+        response = handler.query_with_batch(batch, "Background Information", 0, 1)
+
+    assert response == "Analysis"
+    mock_model.generate_content.assert_called_once()
+
+def test_create_unified_analysis_deduplicates_batch_responses(handler):
+    """
+    Test that identical batch responses appear only once in the synthesis request.
+    """
+    mock_model = MagicMock()
+    mock_model.generate_content.return_value = MagicMock(prompt_feedback=None, text="Unified analysis")
+
+    with patch.object(GeminiHandler, "process_documents_in_batches", return_value=[["b1"], ["b2"], ["b3"]]), \
+            patch.object(GeminiHandler, "query_with_batch", side_effect=["Same answer", "Other answer", "Same answer"]), \
+            patch("src.controller.gemini_case_handler.genai") as mock_genai:
+        mock_genai.GenerativeModel.return_value = mock_model
+        result = handler.create_unified_analysis("Background Information")
+
+    assert result == "Unified analysis"
+    combined_text = mock_model.generate_content.call_args[0][0][1]["text"]
+    assert combined_text.count("Same answer") == 1
+    assert combined_text.count("Other answer") == 1
+    assert "--- ANALYSIS FROM BATCH 3 ---" not in combined_text
+
+def test_create_unified_analysis_single_unique_response_skips_synthesis(handler):
+    """
+    Test that batches that all return the same text are returned without a synthesis call.
+    """
+    with patch.object(GeminiHandler, "process_documents_in_batches", return_value=[["b1"], ["b2"]]), \
+            patch.object(GeminiHandler, "query_with_batch", return_value="Same answer"), \
+            patch("src.controller.gemini_case_handler.genai") as mock_genai:
+        result = handler.create_unified_analysis("Background Information")
+
+    assert result == "Same answer"
+    mock_genai.GenerativeModel.assert_not_called()
@@ -0,0 +1,34 @@
+"""
+Tests for the security utilities.
+"""
+from starlette.datastructures import Headers
+
+from src.core.security import get_api_key_from_header
+
+def test_get_api_key_from_header_exact_name():
+    """
+    Test finding the API key in a dict under the configured header name.
+    """
+    assert get_api_key_from_header({"X-API-Key": "secret"}) == "secret"
+
+def test_get_api_key_from_header_lowercase_dict():
+    """
+    Test finding the API key in a dict whose keys were lowercased, as ASGI servers send them.
+    """
+    assert get_api_key_from_header({"x-api-key": "secret"}) == "secret"
+
+def test_get_api_key_from_header_starlette_headers():
+    """
+    Test finding the API key in case-insensitive starlette headers.
+    """
+    headers = Headers(raw=[(b"x-api-key", b"secret")])
+
+    assert get_api_key_from_header(headers) == "secret"
+    assert get_api_key_from_header(headers, "X-Custom-Key") is None
+
+def test_get_api_key_from_header_missing():
+    """
+    Test that a missing header or a non-mapping yields None.
+    """
+    assert get_api_key_from_header({"Authorization": "Bearer token"}) is None
+    assert get_api_key_from_header(None) is None
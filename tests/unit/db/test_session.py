@@ -0,0 +1,39 @@
+"""
+Tests for the database session.
+"""
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from src.db.models.user import User
+from src.db.session import DatabaseSession
+
+@pytest.fixture
+def session(test_db):
+    """
+    Fixture for a database session bound to the test database, with its indexes created.
+    """
+    session = object.__new__(DatabaseSession)
+    session.client = None
+    session.db = test_db
+    session.ensure_indexes()
+    return session
+
+def test_users_without_email_do_not_collide(session):
+    """
+    Test that several users saved without an email pass the unique email index.
+    """
+    users = session.db["users"]
+    users.insert_one(User(username="alice").to_dict())
+    users.insert_one(User(username="bob").to_dict())
+
+    assert users.count_documents({"email": ""}) == 2
+
+def test_duplicate_email_rejected(session):
+    """
+    Test that two users with the same non-empty email are rejected.
+    """
+    users = session.db["users"]
+    users.insert_one(User(username="alice", email="shared@example.com").to_dict())
+
+    with pytest.raises(DuplicateKeyError):
+        users.insert_one(User(username="bob", email="shared@example.com").to_dict())
@@ -0,0 +1,69 @@
+"""
+Tests for the user repository.
+"""
+import pytest
+from unittest.mock import patch
+
+from src.db.repositories.base_repository import BaseRepository
+from src.db.repositories.user_repository import UserRepository
+
+@pytest.fixture
+def user_repo():
+    """
+    Fixture for a user repository with an empty lookup cache.
+    """
+    UserRepository.clear_cache()
+    yield UserRepository.__new__(UserRepository)
+    UserRepository.clear_cache()
+
+def test_get_by_username_is_cached(user_repo):
+    """
+    Test that a repeated lookup is served from the cache as a copy.
+    """
+    with patch.object(UserRepository, "read_one", return_value={"username": "alice"}) as mock_read:
+        first = user_repo.get_by_username("alice")
+        first["username"] = "changed"
+        second = user_repo.get_by_username("alice")
+
+    assert second == {"username": "alice"}
+    mock_read.assert_called_once_with({"username": "alice"})
+
+def test_missing_user_is_not_cached(user_repo):
+    """
+    Test that a lookup that finds nothing is retried.
+    """
+    with patch.object(UserRepository, "read_one", return_value=None) as mock_read:
+        assert user_repo.get_by_email("nobody@example.com") is None
+        assert user_repo.get_by_email("nobody@example.com") is None
+
+    assert mock_read.call_count == 2
+
+def test_cache_entry_expires(user_repo):
+    """
+    Test that an entry older than the TTL is read again.
+    """
+    with patch.object(UserRepository, "read_one", return_value={"username": "alice"}) as mock_read, \
+            patch("src.db.repositories.user_repository.time.monotonic", side_effect=[0, 10, 100, 100]), \
+            patch("src.db.repositories.user_repository.USER_CACHE_TTL", 60):
+        user_repo.get_by_username("alice")
+        user_repo.get_by_username("alice")
+        user_repo.get_by_username("alice")
+
+    assert mock_read.call_count == 2
+
+@pytest.mark.parametrize("method,args", [
+    ("update", ({"username": "alice"}, {"email": "new@example.com"})),
+    ("update_one_doc", ({"username": "alice"}, {"email": "new@example.com"})),
+    ("delete", ({"username": "alice"},)),
+])
+def test_writes_invalidate_cache(user_repo, method, args):
+    """
+    Test that updates and deletes through the repository clear the cache.
+    """
+    with patch.object(UserRepository, "read_one", return_value={"username": "alice"}) as mock_read, \
+            patch.object(BaseRepository, method, return_value={"modified_count": 1}):
+        user_repo.get_by_username("alice")
+        getattr(user_repo, method)(*args)
+        user_repo.get_by_username("alice")
+
+    assert mock_read.call_count == 2
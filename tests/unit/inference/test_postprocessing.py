@@ -2,10 +2,15 @@
 Tests for the postprocessing module.
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, AsyncMock, MagicMock, mock_open
 
-from src.inference.postprocessing import extract_findings_and_background, convert_pdf_to_images, parse_background_response
+from src.inference.postprocessing import (
+    extract_findings_and_background, convert_pdf_to_images, parse_background_response, _rasterize_pdf,
+    _find_header, _FINDINGS_HEADERS_LOWER, _FINDINGS_HEADER_RE, _BACKGROUND_HEADERS_LOWER, _BACKGROUND_HEADER_RE
+)
 
 def test_extract_findings_and_background_with_findings():
     """
@@ -131,11 +136,11 @@ def test_extract_findings_with_different_header_format():
 
 
 @pytest.mark.asyncio
-@patch("src.inference.postprocessing.requests.get")
+@patch("src.inference.postprocessing._get_http_session")
 @patch("src.inference.postprocessing.tempfile.TemporaryDirectory")
 @patch("pdf2image.convert_from_path")
 @patch("src.inference.postprocessing.os.path.exists")
-async def test_convert_pdf_to_images(mock_exists, mock_convert, mock_temp_dir, mock_requests_get):
+async def test_convert_pdf_to_images(mock_exists, mock_convert, mock_temp_dir, mock_get_session):
     """
     Test converting a PDF to images.
     """
@@ -145,11 +150,15 @@ async def test_convert_pdf_to_images(mock_exists, mock_convert, mock_temp_dir, m
     # Mock the temporary directory
     mock_temp_dir.return_value.__enter__.return_value = "/tmp/test"
 
-    # Mock the requests.get response
+    # Mock the streamed aiohttp response
+    async def iter_chunked(_size):
+        yield b"test pdf content"
+
     mock_response = MagicMock()
     mock_response.raise_for_status = MagicMock()
-    mock_response.content = b"test pdf content"
-    mock_requests_get.return_value = mock_response
+    mock_response.content.iter_chunked = iter_chunked
+    mock_get_session.return_value.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_get_session.return_value.get.return_value.__aexit__ = AsyncMock(return_value=False)
 
     # Mock convert_from_path to return a list of images
     mock_image1 = MagicMock()
@@ -160,8 +169,15 @@ async def test_convert_pdf_to_images(mock_exists, mock_convert, mock_temp_dir, m
     mock_image1.save = MagicMock()
     mock_image2.save = MagicMock()
 
-    # Mock open to avoid writing to disk
-    with patch("builtins.open", mock_open()) as mock_file:
+    # Mock aiofiles.open to avoid writing to disk
+    mock_file = MagicMock()
+    mock_file.write = AsyncMock()
+    # Rasterize in a thread so the mocked pdf2image is visible to the worker
+    with patch("src.inference.postprocessing.aiofiles.open") as mock_aio_open, \
+            patch("src.inference.postprocessing._PDF_POOL", ThreadPoolExecutor(max_workers=1)):
+        mock_aio_open.return_value.__aenter__ = AsyncMock(return_value=mock_file)
+        mock_aio_open.return_value.__aexit__ = AsyncMock(return_value=False)
+
         # Convert the PDF to images
         result = await convert_pdf_to_images("https://example.com/test.pdf", "Test PDF")
 
@@ -177,6 +193,31 @@ async def test_convert_pdf_to_images(mock_exists, mock_convert, mock_temp_dir, m
     mock_image1.save.assert_called_once()
     mock_image2.save.assert_called_once()
 
+    # Check that the download was streamed to the file
+    mock_file.write.assert_awaited_once_with(b"test pdf content")
+
+def test_rasterize_pdf_with_pymupdf(tmp_path):
+    """
+    Test rendering PDF pages to base64 PNGs with PyMuPDF.
+    """
+    import base64
+    import fitz
+
+    # Create a two-page PDF
+    pdf_path = str(tmp_path / "test.pdf")
+    with fitz.open() as doc:
+        doc.new_page()
+        doc.new_page()
+        doc.save(pdf_path)
+
+    # Rasterize the PDF without touching pdf2image
+    with patch("pdf2image.convert_from_path") as mock_convert:
+        result = _rasterize_pdf(pdf_path, 72)
+
+    # Check the result
+    assert len(result) == 2
+    assert all(base64.b64decode(page).startswith(b"\x89PNG") for page in result)
+    mock_convert.assert_not_called()
 
 def test_parse_background_response_with_marker():
     """
@@ -257,3 +298,40 @@ def test_parse_background_response_only_findings():
     # Check the results - should treat all as background since there's no marker
     assert findings == ""
     assert background == response
+
+@pytest.mark.parametrize("text", [
+    "No headers at all",
+    "Intro\n**1.4 Findings**\nA\n**2. Background Information**\nB",
+    "**FINDINGS**\nA\n**background information**\nB",
+    "**2.0 Background Information**\nB\n**1.4. Findings**\nA",
+    "**Findings** first, then **1.4 Findings** and **Background Information** twice **Background Information**",
+])
+def test_find_header_ascii_path_matches_regex(text):
+    """
+    Test that the substring search on lowered ASCII text finds the same header as the regex.
+    """
+    for headers, pattern in ((_FINDINGS_HEADERS_LOWER, _FINDINGS_HEADER_RE),
+                             (_BACKGROUND_HEADERS_LOWER, _BACKGROUND_HEADER_RE)):
+        assert _find_header(text, text.lower(), headers, pattern) == _find_header(text, None, headers, pattern)
+
+def test_find_header_returns_header_as_written():
+    """
+    Test that the earliest header is returned with the casing used in the text.
+    """
+    text = "Notes\n**Background information**\nB\n**2. Background Information**\nC"
+
+    start, header = _find_header(text, text.lower(), _BACKGROUND_HEADERS_LOWER, _BACKGROUND_HEADER_RE)
+
+    assert start == text.index("**Background information**")
+    assert header == "**Background information**"
+
+def test_extract_findings_and_background_non_ascii():
+    """
+    Test extracting findings and background from non-ASCII text, which uses the regex scan.
+    """
+    response = "**findings**\nThe caf\u00e9 floor was wet.\n**Background Information**\nSite visit on 3 \u2013 4 May."
+
+    findings, background = extract_findings_and_background(response)
+
+    assert findings == "**1.4 Findings**\nThe caf\u00e9 floor was wet."
+    assert background == "**Background Information**\nSite visit on 3 \u2013 4 May."
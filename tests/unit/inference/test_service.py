@@ -3,7 +3,7 @@ Tests for the inference service.
 """
 import os
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 from src.inference.service import InferenceService
 
@@ -37,3 +37,113 @@ def test_load_system_prompts(mock_load_prompts, mock_model_loader, inference_ser
     prompts = inference_service.load_system_prompts()
     assert "Background Information" in prompts
     assert "Exhibits" in prompts
+
+def test_parse_section_response():
+    """
+    Test parsing a combined section reply, with and without a code fence.
+    """
+    sections = ["Background Information", "1.4 Findings"]
+    reply = '{"Background Information": "Background text", "1.4 Findings": "Findings text"}'
+
+    assert InferenceService._parse_section_response(reply, sections) == {
+        "Background Information": "Background text",
+        "1.4 Findings": "Findings text"
+    }
+    assert InferenceService._parse_section_response(f"```json\n{reply}\n```", sections) == {
+        "Background Information": "Background text",
+        "1.4 Findings": "Findings text"
+    }
+
+def test_parse_section_response_skips_missing_and_invalid():
+    """
+    Test that empty sections, missing sections and unparseable replies are left out.
+    """
+    sections = ["Background Information", "1.4 Findings"]
+
+    reply = '{"Background Information": "Background text", "1.4 Findings": "  "}'
+    assert InferenceService._parse_section_response(reply, sections) == {
+        "Background Information": "Background text"
+    }
+    assert InferenceService._parse_section_response("Not JSON", sections) == {}
+    assert InferenceService._parse_section_response('["Background text"]', sections) == {}
+
+@pytest.mark.asyncio
+@patch("src.inference.service.model_loader")
+async def test_query_sections_with_batch_falls_back_for_missing_sections(mock_model_loader, inference_service):
+    """
+    Test that sections missing from the combined reply are queried on their own.
+    """
+    mock_model = MagicMock()
+    mock_model.predict_async = AsyncMock(return_value='{"Background Information": "Background text"}')
+    mock_model_loader.get_model.return_value = mock_model
+
+    with patch.object(inference_service, "_resolve_system_prompt", side_effect=lambda section: (f"Prompt for {section}", None)), \
+            patch.object(inference_service, "query_with_batch", AsyncMock(return_value="Findings text")) as mock_query:
+        results = await inference_service.query_sections_with_batch(
+            [{"text": "Document text"}], ["Background Information", "1.4 Findings"], 0, 1
+        )
+
+    assert results == {"Background Information": "Background text", "1.4 Findings": "Findings text"}
+    mock_model.predict_async.assert_awaited_once()
+    mock_query.assert_awaited_once_with([{"text": "Document text"}], "1.4 Findings", 0, 1)
+
+@pytest.fixture
+def empty_prompt_cache():
+    """
+    Fixture that empties the process-wide prompt cache around a test.
+    """
+    InferenceService.invalidate_prompts()
+    yield
+    InferenceService.invalidate_prompts()
+
+@patch("src.inference.service.InferenceService.load_system_prompts")
+def test_system_prompts_cached_per_case_type(mock_load_prompts, empty_prompt_cache):
+    """
+    Test that loaded prompts are shared by later services of the same case type.
+    """
+    mock_load_prompts.return_value = {"Background Information": "Test prompt for background"}
+
+    first = InferenceService("case_1", "case_type_1", case_repo=MagicMock())
+    second = InferenceService("case_2", "case_type_1", case_repo=MagicMock())
+    InferenceService("case_3", "case_type_2", case_repo=MagicMock())
+
+    assert second.system_prompts is first.system_prompts
+    assert mock_load_prompts.call_count == 2
+
+@patch("src.inference.service.InferenceService.load_system_prompts")
+def test_system_prompts_reloaded_after_invalidation_or_expiry(mock_load_prompts, empty_prompt_cache):
+    """
+    Test that prompts are read again after invalidate_prompts and once the TTL has passed.
+    """
+    mock_load_prompts.return_value = {"Background Information": "Test prompt for background"}
+
+    InferenceService("case_1", "case_type_1", case_repo=MagicMock())
+    InferenceService.invalidate_prompts()
+    InferenceService("case_1", "case_type_1", case_repo=MagicMock())
+    assert mock_load_prompts.call_count == 2
+
+    with patch("src.inference.service.PROMPT_CACHE_TTL", 0):
+        InferenceService("case_1", "case_type_1", case_repo=MagicMock())
+    assert mock_load_prompts.call_count == 3
+
+@patch("src.inference.service.InferenceService.load_system_prompts")
+def test_empty_system_prompts_not_cached(mock_load_prompts, empty_prompt_cache):
+    """
+    Test that an empty prompt dictionary is not cached, so the next service retries the load.
+    """
+    mock_load_prompts.return_value = {}
+
+    InferenceService("case_1", "case_type_1", case_repo=MagicMock())
+    InferenceService("case_1", "case_type_1", case_repo=MagicMock())
+
+    assert mock_load_prompts.call_count == 2
+
+def test_build_contents_drops_consecutive_invalid_items():
+    """
+    Test that every invalid item is dropped, including one right after another, and extra keys are removed.
+    """
+    batch = [{"text": "Doc 1", "source": "a.pdf"}, "not a dict", {"source": "b.pdf"}, {"text": "Doc 2"}]
+
+    contents = InferenceService._build_contents(batch, "System prompt")
+
+    assert contents == [{"text": "Doc 1"}, {"text": "Doc 2"}, {"text": "System prompt"}]
@@ -112,7 +112,7 @@ async def test_get_prediction_stats():
     """
     # Mock the prediction repository
     mock_prediction_repo = MagicMock()
-    mock_prediction_repo.get_successful_predictions.return_value = [
+    mock_prediction_repo.iter_successful_predictions.return_value = [
         {
             "_id": "pred_id_1",
             "case_id": "test_case_123",
@@ -130,7 +130,7 @@ async def test_get_prediction_stats():
             "created_at": "2023-01-01T12:35:00"
         }
     ]
-    mock_prediction_repo.get_failed_predictions.return_value = [
+    mock_prediction_repo.iter_failed_predictions.return_value = [
         {
             "_id": "pred_id_3",
             "case_id": "test_case_456",
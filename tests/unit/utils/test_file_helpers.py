@@ -3,13 +3,13 @@ Tests for the file helpers.
 """
 import os
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi import UploadFile
 
 from src.utils.file_helpers import save_uploaded_file
 
 @pytest.mark.asyncio
-@patch("builtins.open", new_callable=MagicMock)
+@patch("src.utils.file_helpers.aiofiles.open")
 async def test_save_uploaded_file(mock_open):
     """
     Test saving an uploaded file.
@@ -17,10 +17,16 @@ async def test_save_uploaded_file(mock_open):
     # Mock file content
     mock_content = b"test file content"
     
-    # Mock UploadFile
+    # Mock UploadFile; the second read signals the end of the upload
     mock_file = MagicMock(spec=UploadFile)
     mock_file.filename = "test.txt"
-    mock_file.read.return_value = mock_content
+    mock_file.read.side_effect = [mock_content, b""]
+    
+    # Mock the async file handle
+    mock_handle = MagicMock()
+    mock_handle.write = AsyncMock()
+    mock_open.return_value.__aenter__ = AsyncMock(return_value=mock_handle)
+    mock_open.return_value.__aexit__ = AsyncMock(return_value=False)
     
     # Mock file path
     file_path = "test/path/test.txt"
@@ -34,6 +40,6 @@ async def test_save_uploaded_file(mock_open):
         
         # Assertions
         assert result is True
-        mock_file.read.assert_called_once()
+        assert mock_file.read.call_count == 2
         mock_open.assert_called_once_with(file_path, "wb")
-        mock_open().__enter__().write.assert_called_once_with(mock_content)
+        mock_handle.write.assert_awaited_once_with(mock_content)